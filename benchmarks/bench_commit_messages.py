@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark commit message classification.
+
+Compares running every decision and tag pattern over each message (the
+original approach, with pattern strings going through the `re` cache)
+against GitExtractor's prefiltered MessageMatcher.
+
+Usage:
+    python benchmarks/bench_commit_messages.py [messages]
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+import time
+
+from lattice_context.extractors.git_extractor import GitExtractor, MessageMatcher
+
+TEMPLATES = [
+    "Added column {col} to {model} for {reason}",
+    "Drop field {col} from {model}, no longer used",
+    "Create {model} model for {reason}",
+    "Update join logic in {model} so {reason}",
+    "Renamed {col} to {col}_id across marts",
+    "Fixed {model} duplicate rows JIRA-{n}",
+    "Bump dependencies and tidy CI config (#{n})",
+    "Refactor macros for readability",
+    "docs: describe {model} grain",
+    "feat: {reason} in {model}\n\nLonger explanation of the change that spans\nseveral lines and mentions test coverage.",
+    "Merge branch 'feature/{col}'",
+    "Tweak formatting in {model}",
+]
+WORDS = ["orders", "customers", "revenue", "sessions", "payments", "refunds"]
+REASONS = ["finance reporting", "promotions", "cancelled orders are excluded", "BREAKING change to grain"]
+
+
+def make_messages(count: int) -> list[str]:
+    """Build synthetic commit messages."""
+    rng = random.Random(0)
+    return [
+        rng.choice(TEMPLATES).format(
+            col=f"{rng.choice(WORDS)}_{rng.choice(['amount', 'at', 'key'])}",
+            model=f"{rng.choice(['fct', 'dim', 'stg'])}_{rng.choice(WORDS)}",
+            reason=rng.choice(REASONS),
+            n=rng.randint(1, 9999),
+        )
+        for _ in range(count)
+    ]
+
+
+def classify_per_pattern(message: str) -> tuple[list, list[str]]:
+    """The original loop: every pattern, every message."""
+    matches = []
+    for pattern, change_type, entity_type in GitExtractor.PATTERNS:
+        for match in re.finditer(pattern, message, re.IGNORECASE):
+            lines = message.split("\n")
+            summary = lines[0]
+            matches.append((match.group(1), change_type, entity_type, summary))
+
+    tags = [
+        tag for pattern, _, tag in GitExtractor.TAG_PATTERNS
+        if re.search(pattern, message, re.IGNORECASE)
+    ]
+    return matches, tags
+
+
+def classify_prefiltered(matcher: MessageMatcher, message: str) -> tuple[list, list[str]]:
+    """Prefilter on literals, then run only the candidate patterns."""
+    patterns, tags = matcher.scan(message)
+    matches = []
+    summary = None
+    for pattern, change_type, entity_type in patterns:
+        for match in pattern.finditer(message):
+            if summary is None:
+                summary = message.split("\n")[0]
+            matches.append((match.group(1), change_type, entity_type, summary))
+    return matches, tags
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    messages = make_messages(count)
+    matcher = MessageMatcher(GitExtractor.PATTERNS, GitExtractor.PATTERN_KEYWORDS, GitExtractor.TAG_PATTERNS)
+
+    start = time.perf_counter()
+    expected = [classify_per_pattern(m) for m in messages]
+    per_pattern = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [classify_prefiltered(matcher, m) for m in messages]
+    prefiltered = time.perf_counter() - start
+
+    assert results == expected
+    print(f"{'per-pattern':<12} {count:>8} messages  {per_pattern:8.3f}s")
+    print(f"{'prefiltered':<12} {count:>8} messages  {prefiltered:8.3f}s")
+    print(f"\nSpeed-up: {per_pattern / prefiltered:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Load test for Database shared across request threads.
+
+Simulates server request handlers: each request searches decisions, then
+fetches decisions and corrections for an entity. Runs with increasing
+numbers of threads against
+
+- shared: one connection, with every call serialized by a lock (the only
+  safe way to share a non-pooled Database between threads), and
+- pooled: Database(pooled=True), one read connection per thread.
+
+Both run while a background writer keeps re-indexing batches of decisions,
+as happens when `lattice index` runs next to a server.
+
+Pooled readers can only overlap on more than one core. On a single vCPU
+both modes are bound by the same core and stay level (64-96 req/s shared
+vs 64-88 pooled from 1 to 16 threads), so that run says nothing about
+scaling. Numbers from a multi-core host have not been recorded yet.
+
+Usage:
+    python benchmarks/bench_concurrent_reads.py [rows] [seconds]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lattice_context.storage.database import Database
+
+sys.path.insert(0, str(Path(__file__).parent))
+from bench_db_writes import make_decisions  # noqa: E402
+
+
+class LockedDatabase:
+    """Serialize every call on a single shared connection."""
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self.db, name)
+
+        def call(*args, **kwargs):
+            with self.lock:
+                return method(*args, **kwargs)
+
+        return call
+
+
+def handle_request(db, n: int) -> None:
+    """One simulated context request."""
+    entity = f"fct_orders_{n % 500}"
+    db.search_decisions(f"order {n % 1000}", limit=20)
+    db.get_decisions_for_entity(entity, limit=10)
+    db.get_corrections(entity)
+
+
+def run(db, threads: int, seconds: float, decisions) -> float:
+    """Return requests per second handled by ``threads`` workers."""
+    stop = threading.Event()
+    count = [0] * threads
+
+    def worker(slot: int) -> None:
+        n = slot
+        while not stop.is_set():
+            handle_request(db, n)
+            count[slot] += 1
+            n += threads
+
+    def writer() -> None:
+        while not stop.is_set():
+            db.add_decisions(decisions)
+            time.sleep(0.1)
+
+    background = threading.Thread(target=writer)
+    background.start()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for slot in range(threads):
+            executor.submit(worker, slot)
+        time.sleep(seconds)
+        stop.set()
+    background.join()
+    return sum(count) / seconds
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    decisions = make_decisions(rows)
+    rewrites = decisions[:100]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "bench.db"
+        db = Database(path)
+        db.initialize()
+        db.add_decisions(decisions)
+        db.close()
+
+        print(f"{os.cpu_count()} CPUs, {rows} rows, {seconds:g}s per run\n")
+        print(f"{'threads':>8} {'shared req/s':>14} {'pooled req/s':>14}")
+        for threads in (1, 2, 4, 8, 16):
+            shared = Database(path, pooled=True)
+            # Route everything through the writer connection under one lock
+            shared._reader = shared.connect
+            shared_rate = run(LockedDatabase(shared), threads, seconds, rewrites)
+            shared.close()
+
+            pooled = Database(path, pooled=True)
+            pooled_rate = run(pooled, threads, seconds, rewrites)
+            pooled.close()
+
+            print(f"{threads:>8} {shared_rate:>14,.0f} {pooled_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Benchmark decision read throughput.
+
+Runs one plain ``SELECT`` of the newest decisions and times hydrating its
+rows three ways: full Pydantic validation (the original path),
+``model_construct``, and the trusted constructor the Database getters use.
+``list_decisions`` itself is timed too; it adds only the query building
+and page cursor of ``query_decisions``.
+
+Usage:
+    python benchmarks/bench_db_reads.py [rows]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_db_writes import make_decisions
+
+from lattice_context.core.types import (
+    ChangeType,
+    DataTool,
+    Decision,
+    DecisionSource,
+    EntityType,
+)
+from lattice_context.storage.database import Database, _decision_from_row
+
+QUERY = "SELECT * FROM decisions ORDER BY timestamp DESC, id DESC LIMIT ?"
+
+
+def validated(rows: list) -> list[Decision]:
+    """The original hydration: validate every row into a Decision."""
+    return [
+        Decision(
+            id=row["id"],
+            entity=row["entity"],
+            entity_type=EntityType(row["entity_type"]),
+            change_type=ChangeType(row["change_type"]),
+            why=row["why"],
+            context=row["context"] or "",
+            source=DecisionSource(row["source"]),
+            source_ref=row["source_ref"],
+            author=row["author"],
+            timestamp=datetime.fromisoformat(row["timestamp"]),
+            confidence=row["confidence"],
+            tags=row["tags"].split(",") if row["tags"] else [],
+            tool=DataTool(row["tool"]),
+        )
+        for row in rows
+    ]
+
+
+def model_constructed(rows: list) -> list[Decision]:
+    """Skip validation with Pydantic's own model_construct."""
+    return [
+        Decision.model_construct(
+            id=row["id"],
+            entity=row["entity"],
+            entity_type=EntityType(row["entity_type"]),
+            change_type=ChangeType(row["change_type"]),
+            why=row["why"],
+            context=row["context"] or "",
+            source=DecisionSource(row["source"]),
+            source_ref=row["source_ref"],
+            author=row["author"],
+            timestamp=datetime.fromisoformat(row["timestamp"]),
+            confidence=row["confidence"],
+            tags=row["tags"].split(",") if row["tags"] else [],
+            tool=DataTool(row["tool"]),
+        )
+        for row in rows
+    ]
+
+
+def trusted(rows: list) -> list[Decision]:
+    """The Database getters' hydration."""
+    return [_decision_from_row(row) for row in rows]
+
+
+def best_of(runs: int, func, *args) -> tuple[float, list]:
+    """Return the fastest of several runs, and the last result."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    runs = 9
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = Database(Path(temp_dir) / "bench.db")
+        db.initialize()
+        db.add_decisions(make_decisions(count))
+
+        conn = db.connect()
+        fetch, rows = best_of(runs, lambda: conn.execute(QUERY, (count,)).fetchall())
+        timings = {
+            "validated": best_of(runs, validated, rows),
+            "constructed": best_of(runs, model_constructed, rows),
+            "trusted": best_of(runs, trusted, rows),
+        }
+        listed, results = best_of(runs, db.list_decisions, count)
+        db.close()
+
+    expected = [d.model_dump() for d in timings["validated"][1]]
+    assert all([d.model_dump() for d in result] == expected for _, result in timings.values())
+    assert [d.model_dump() for d in results] == expected
+
+    print(f"{'fetch only':<16} {count:>8} rows  {fetch * 1000:8.1f}ms")
+    for label, (elapsed, _) in timings.items():
+        print(f"{label:<16} {count:>8} rows  {elapsed * 1000:8.1f}ms  (hydrating)")
+    print(f"{'list_decisions':<16} {count:>8} rows  {listed * 1000:8.1f}ms  (fetch and hydrate)")
+
+    base = timings["validated"][0]
+    print(f"\nHydration speed-up over validated: {base / timings['constructed'][0]:.1f}x model_construct, "
+          f"{base / timings['trusted'][0]:.1f}x trusted")
+    print(f"list_decisions against fetch + validated: {(fetch + base) / listed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
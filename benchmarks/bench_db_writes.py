@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark decision write throughput.
+
+Compares the per-row write path (one commit and FTS insert per decision)
+against the batched path used by `lattice index`.
+
+Usage:
+    python benchmarks/bench_db_writes.py [rows]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from lattice_context.core.types import (
+    ChangeType,
+    DataTool,
+    Decision,
+    DecisionSource,
+    EntityType,
+)
+from lattice_context.storage.database import Database
+
+
+def make_decisions(count: int) -> list[Decision]:
+    """Build synthetic decisions."""
+    now = datetime.now()
+    return [
+        Decision(
+            id=f"dec_{i:012d}",
+            entity=f"fct_orders_{i % 500}",
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.MODIFIED,
+            why=f"Changed join logic for order {i} to exclude test accounts",
+            context=f"Commit: {i:07x}",
+            source=DecisionSource.GIT_COMMIT,
+            source_ref=f"{i:040x}",
+            author="dev@example.com",
+            timestamp=now,
+            confidence=0.7,
+            tags=["refactor"],
+            tool=DataTool.DBT,
+        )
+        for i in range(count)
+    ]
+
+
+def bench(label: str, decisions: list[Decision], batched: bool) -> float:
+    """Write decisions into a fresh database and return rows per second."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = Database(Path(temp_dir) / "bench.db")
+        db.initialize()
+
+        start = time.perf_counter()
+        if batched:
+            db.add_decisions(decisions)
+        else:
+            for decision in decisions:
+                db.add_decision(decision)
+        elapsed = time.perf_counter() - start
+
+        assert db.count_decisions() == len(decisions)
+        db.close()
+
+    rate = len(decisions) / elapsed
+    print(f"{label:<12} {len(decisions):>8} rows  {elapsed:8.3f}s  {rate:>12,.0f} rows/s")
+    return rate
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    decisions = make_decisions(count)
+
+    per_row = bench("per-row", decisions, batched=False)
+    batched = bench("batched", decisions, batched=True)
+
+    print(f"\nSpeed-up: {batched / per_row:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Benchmark dbt manifest extraction.
+
+Builds a synthetic manifest (10k models, 200k columns by default) and times
+the original extraction against the fused DbtExtractor.scan(). The baseline
+is the three-pass code scan() replaced, copied below: entities, conventions
+and YAML descriptions each walk the manifest, plus a pass hashing every node
+for incremental indexing. It is timed in memory and with the manifest loaded
+from disk, against scan() reading the file both whole and streaming.
+
+Usage:
+    python benchmarks/bench_dbt_extraction.py [models] [columns_per_model]
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from lattice_context.core.types import (
+    ChangeType,
+    Convention,
+    ConventionType,
+    DataTool,
+    Decision,
+    DecisionSource,
+    EntityType,
+)
+from lattice_context.extractors.dbt_extractor import DbtExtractor
+
+PREFIXES = ["stg_", "int_", "dim_", "fct_", "rpt_"]
+SUFFIXES = ["_id", "_key", "_at", "_date", "_amount", "_count", "_flag", "_name"]
+
+
+def make_manifest(models: int, columns_per_model: int) -> dict[str, Any]:
+    """Build a synthetic manifest."""
+    nodes = {}
+    for i in range(models):
+        name = f"{PREFIXES[i % len(PREFIXES)]}entity_{i}"
+        nodes[f"model.bench.{name}"] = {
+            "resource_type": "model",
+            "name": name,
+            "schema": "analytics",
+            "database": "prod",
+            "original_file_path": f"models/{name}.sql",
+            "description": f"Model {i} documenting how entity {i} is built and why" if i % 2 else "",
+            "columns": {
+                f"field_{j}{SUFFIXES[j % len(SUFFIXES)]}": {
+                    "description": f"Column {j} of model {i}",
+                    "data_type": "varchar",
+                }
+                for j in range(columns_per_model)
+            },
+        }
+    return {"metadata": {}, "nodes": nodes}
+
+
+def baseline_entities(manifest: dict[str, Any]) -> list[dict[str, Any]]:
+    """Original entity pass: one dict per model and column."""
+    entities = []
+    for node_id, node in manifest.get("nodes", {}).items():
+        if node.get("resource_type") == "model":
+            entity_id = hashlib.sha256(node_id.encode()).hexdigest()[:12]
+            entities.append({
+                "id": f"ent_{entity_id}",
+                "name": node.get("name"),
+                "type": EntityType.MODEL.value,
+                "tool": DataTool.DBT.value,
+                "path": node.get("original_file_path"),
+                "metadata": json.dumps({
+                    "schema": node.get("schema"),
+                    "database": node.get("database"),
+                    "description": node.get("description", ""),
+                }),
+                "created_at": datetime.now(),
+                "updated_at": datetime.now(),
+            })
+            for col_name, col_data in node.get("columns", {}).items():
+                col_id = hashlib.sha256(f"{node_id}:{col_name}".encode()).hexdigest()[:12]
+                entities.append({
+                    "id": f"ent_{col_id}",
+                    "name": col_name,
+                    "type": EntityType.COLUMN.value,
+                    "tool": DataTool.DBT.value,
+                    "path": node.get("original_file_path"),
+                    "metadata": json.dumps({
+                        "model": node.get("name"),
+                        "description": col_data.get("description", ""),
+                        "data_type": col_data.get("data_type", ""),
+                    }),
+                    "created_at": datetime.now(),
+                    "updated_at": datetime.now(),
+                })
+    return entities
+
+
+def baseline_affixes(
+    names: list[str], affixes: list[str], convention_type: ConventionType, entity_type: EntityType
+) -> list[Convention]:
+    """Original convention detection: every name against each listed affix."""
+    counts: dict[str, list[str]] = {}
+    for name in names:
+        for affix in affixes:
+            if name.endswith(affix) if convention_type == ConventionType.SUFFIX else name.startswith(affix):
+                counts.setdefault(affix, []).append(name)
+    return [
+        Convention(
+            id=f"conv_{hashlib.sha256(f'{affix}:{entity_type.value}'.encode()).hexdigest()[:12]}",
+            type=convention_type,
+            pattern=affix,
+            applies_to=[entity_type],
+            examples=examples[:5],
+            frequency=len(examples),
+            confidence=min(0.95, 0.7 + (len(examples) * 0.05)),
+            detected_at=datetime.now(),
+            tool=DataTool.DBT,
+        )
+        for affix, examples in counts.items()
+        if len(examples) >= 3
+    ]
+
+
+def baseline_conventions(manifest: dict[str, Any]) -> list[Convention]:
+    """Original convention pass: collect names, then match the fixed lists."""
+    model_names: list[str] = []
+    column_names: list[str] = []
+    for node in manifest.get("nodes", {}).values():
+        if node.get("resource_type") == "model":
+            model_names.append(node.get("name"))
+            column_names.extend(node.get("columns", {}).keys())
+    return [
+        *baseline_affixes(
+            model_names, ["dim_", "fct_", "stg_", "int_", "rpt_"],
+            ConventionType.PREFIX, EntityType.MODEL,
+        ),
+        *baseline_affixes(
+            column_names, ["_id", "_key", "_at", "_date", "_amount", "_count", "_flag"],
+            ConventionType.SUFFIX, EntityType.COLUMN,
+        ),
+    ]
+
+
+def baseline_yaml_descriptions(manifest: dict[str, Any]) -> list[Decision]:
+    """Original YAML pass: substantial model descriptions as decisions."""
+    decisions = []
+    for node_id, node in manifest.get("nodes", {}).items():
+        if node.get("resource_type") != "model":
+            continue
+        description = node.get("description", "").strip()
+        if description and len(description) > 20:
+            decisions.append(Decision(
+                id=DbtExtractor.yaml_decision_id(node_id),
+                entity=node.get("name"),
+                entity_type=EntityType.MODEL,
+                change_type=ChangeType.CREATED,
+                why=description,
+                context="From dbt model documentation",
+                source=DecisionSource.YAML_DESCRIPTION,
+                source_ref=node.get("original_file_path", ""),
+                author="unknown",
+                timestamp=datetime.now(),
+                confidence=0.8,
+                tags=["documentation"],
+                tool=DataTool.DBT,
+            ))
+    return decisions
+
+
+def baseline_node_hashes(manifest: dict[str, Any]) -> dict[str, tuple[str, str]]:
+    """Original per-node hashes: each whole node serialized with sorted keys."""
+    hashes = {}
+    for node_id, node in manifest.get("nodes", {}).items():
+        if node.get("resource_type") == "model":
+            content = json.dumps(node, sort_keys=True, default=str)
+            hashes[node_id] = (node.get("name"), hashlib.sha256(content.encode()).hexdigest())
+    return hashes
+
+
+def baseline(manifest: dict[str, Any]) -> None:
+    """The original extraction: one pass per output over the loaded manifest."""
+    baseline_entities(manifest)
+    baseline_conventions(manifest)
+    baseline_yaml_descriptions(manifest)
+    baseline_node_hashes(manifest)
+
+
+def timed(label: str, fn: Any) -> float:
+    """Run fn once and print the elapsed time."""
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s")
+    return elapsed
+
+
+def load(path: Path) -> dict[str, Any]:
+    """Read the whole manifest, as the original extraction did."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def scan_file(path: Path, streaming: bool) -> None:
+    """Load (unless streaming) and scan a manifest file."""
+    extractor = DbtExtractor(path, streaming=streaming)
+    extractor.load_manifest()
+    extractor.scan()
+
+
+def main() -> None:
+    models = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    manifest = make_manifest(models, columns)
+    print(f"{models:,} models, {models * columns:,} columns\n")
+
+    extractor = DbtExtractor(Path("manifest.json"))
+    extractor.manifest = manifest
+    print("in memory")
+    original = timed("  original passes", lambda: baseline(manifest))
+    fused = timed("  fused scan()", extractor.scan)
+    print(f"  speed-up: {original / fused:.2f}x\n")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest_path = Path(temp_dir) / "manifest.json"
+        manifest_path.write_text(json.dumps(manifest))
+        print("from disk")
+        original = timed("  load + original passes", lambda: baseline(load(manifest_path)))
+        loaded = timed("  load + scan()", lambda: scan_file(manifest_path, streaming=False))
+        streamed = timed("  streaming scan()", lambda: scan_file(manifest_path, streaming=True))
+        print(f"  speed-up: {original / loaded:.2f}x loaded, {original / streamed:.2f}x streaming\n")
+
+
+if __name__ == "__main__":
+    main()
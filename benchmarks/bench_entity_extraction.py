@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark entity extraction from task descriptions.
+
+Compares the original extraction (dbt naming regexes plus five suffix
+guesses per long word, every guess becoming a lookup) against the
+EntityMatcher automaton built from indexed entity names.
+
+Usage:
+    python benchmarks/bench_entity_extraction.py [tasks] [models]
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import sys
+import time
+
+from lattice_context.mcp.entities import EntityMatcher
+from lattice_context.mcp.retrieval import ContextRetriever
+
+WORDS = ["orders", "customers", "revenue", "sessions", "payments", "refunds", "invoices", "shipments"]
+PREFIXES = ["fct", "dim", "stg", "int"]
+COLUMNS = ["id", "key", "at", "amount", "date", "status"]
+TEMPLATES = [
+    "Add a {word} column to {model}",
+    "Why does {model} exclude cancelled {word}?",
+    "Fix {word} rounding in {model} and {other}",
+    "Refactor the join between {model} and {other} on {column}",
+    "What is the grain of `{model}`?",
+]
+
+
+def make_names(models: int) -> list[str]:
+    """Build synthetic model names and the distinct column names they share."""
+    names = []
+    for i in range(models):
+        model = f"{PREFIXES[i % len(PREFIXES)]}_{WORDS[i % len(WORDS)]}_{i}"
+        names.append(model)
+        names.extend(f"{WORDS[(i + j) % len(WORDS)]}_{column}" for j, column in enumerate(COLUMNS))
+    return list(dict.fromkeys(names))
+
+
+def make_tasks(count: int, names: list[str]) -> list[str]:
+    """Build synthetic task descriptions."""
+    rng = random.Random(0)
+    models = [n for n in names if n.split("_")[0] in PREFIXES]
+    return [
+        rng.choice(TEMPLATES).format(
+            word=rng.choice(WORDS),
+            model=rng.choice(models),
+            other=rng.choice(models),
+            column=rng.choice(names),
+        )
+        for _ in range(count)
+    ]
+
+
+def extract_by_guessing(task: str, known: dict[str, str]) -> list[str]:
+    """The original extraction: regexes, then one lookup per suffix guess."""
+    candidates = re.findall(r'["`\'](\w+)["`\']', task)
+    for prefix in PREFIXES:
+        candidates.extend(re.findall(rf"\b({prefix}_\w+)\b", task, re.IGNORECASE))
+    for word in re.findall(r"\b([a-z_]+)\b", task.lower()):
+        if "_" in word and len(word) > 3:
+            candidates.append(word)
+        elif len(word) > 4:
+            candidates.extend(f"{word}{suffix}" for suffix in ContextRetriever.ENTITY_SUFFIXES)
+    # Each candidate was its own decision query; count them as lookups here
+    return list(dict.fromkeys(known[c.lower()] for c in candidates if c.lower() in known))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    models = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    names = make_names(models)
+    tasks = make_tasks(count, names)
+    known = {name.lower(): name for name in names}
+
+    start = time.perf_counter()
+    guessed = [extract_by_guessing(t, known) for t in tasks]
+    guessing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = EntityMatcher(names, ContextRetriever.ENTITY_SUFFIXES)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = [matcher.find(t) for t in tasks]
+    matching = time.perf_counter() - start
+
+    lookups = sum(
+        len(re.findall(r"\b([a-z_]+)\b", t.lower())) * len(ContextRetriever.ENTITY_SUFFIXES)
+        for t in tasks
+    )
+    print(f"{'guessing':<10} {count:>8} tasks  {guessing:8.3f}s  (~{lookups / count:.0f} candidates per task)")
+    print(f"{'matcher':<10} {count:>8} tasks  {matching:8.3f}s  (built in {build:.3f}s from {len(names)} names)")
+    print(f"Entities found: {sum(map(len, guessed))} guessing, {sum(map(len, matched))} matcher")
+    print(f"\nSpeed-up: {guessing / matching:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Benchmark git history extraction.
+
+Compares the GitPython backend (one Commit object per commit, attributes and
+diffs loaded through the object database) against the streamed `git log`
+backend on an existing repository.
+
+Usage:
+    python benchmarks/bench_git_extraction.py <repo> [limit]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+from lattice_context.extractors.git_extractor import GitExtractor
+
+
+def bench(label: str, repo: Path, limit: int, backend: str) -> tuple[float, list]:
+    """Extract decisions with one backend and return (seconds, decisions)."""
+    extractor = GitExtractor(repo, limit=limit, backend=backend)
+    start = time.perf_counter()
+    decisions = extractor.extract_decisions(branch="HEAD")
+    elapsed = time.perf_counter() - start
+    extractor.repo.close()
+
+    print(f"{label:<12} {len(decisions):>8} decisions  {elapsed:8.3f}s")
+    return elapsed, decisions
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    repo = Path(sys.argv[1])
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    slow, expected = bench("gitpython", repo, limit, "gitpython")
+    fast, decisions = bench("git log", repo, limit, "log")
+
+    assert [d.model_dump() for d in decisions] == [d.model_dump() for d in expected]
+    print(f"\nSpeed-up: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
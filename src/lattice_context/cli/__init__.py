@@ -31,10 +31,11 @@ def index(
     incremental: Annotated[bool, typer.Option("--incremental", help="Incremental index")] = False,
     tool: Annotated[Optional[str], typer.Option("--tool", help="Index specific tool")] = None,
     verbose: Annotated[bool, typer.Option("--verbose", "-v", help="Verbose output")] = False,
+    rebuild_fts: Annotated[bool, typer.Option("--rebuild-fts", help="Rebuild and optimize the search index")] = False,
 ) -> None:
     """Index a project to extract decisions and conventions."""
     from lattice_context.cli.index_cmd import index_project
-    index_project(path, incremental, tool, verbose)
+    index_project(path, incremental, tool, verbose, rebuild_fts)
 
 
 @app.command()
@@ -83,6 +84,15 @@ def status(
     show_status(path)
 
 
+@app.command()
+def check(
+    path: Annotated[Path, typer.Argument(help="Project path")] = Path("."),
+) -> None:
+    """Check the search index against the stored decisions."""
+    from lattice_context.cli.status_cmd import check_index
+    check_index(path)
+
+
 @app.command()
 def upgrade() -> None:
     """Show upgrade information."""
@@ -103,12 +113,13 @@ def list_cmd(
     path: Annotated[Path, typer.Option("--path", help="Project path")] = Path("."),
     limit: Annotated[int, typer.Option("--limit", help="Max items to show")] = 20,
     entity: Annotated[Optional[str], typer.Option("--entity", help="Filter by entity")] = None,
+    cursor: Annotated[Optional[str], typer.Option("--cursor", help="Page cursor from a previous listing")] = None,
 ) -> None:
     """List indexed content."""
     from lattice_context.cli.list_cmd import list_decisions, list_conventions, list_corrections
 
     if what == "decisions":
-        list_decisions(path, limit, entity)
+        list_decisions(path, limit, entity, cursor)
     elif what == "conventions":
         list_conventions(path)
     elif what == "corrections":
@@ -11,9 +11,11 @@ from pathlib import Path
 from rich.console import Console
 from rich.markdown import Markdown
 
+from lattice_context.core.config import LatticeConfig, RetrievalConfig
 from lattice_context.core.errors import ProjectNotInitializedError
 from lattice_context.mcp.retrieval import ContextRetriever
 from lattice_context.storage.database import Database
+from lattice_context.storage.vectors import VectorIndex
 
 console = Console()
 
@@ -32,8 +34,15 @@ def get_context(
         if not lattice_dir.exists():
             raise ProjectNotInitializedError(path)
 
-        db = Database(lattice_dir / "index.db")
-        retriever = ContextRetriever(db)
+        # Pooled, so the retriever's tier queries run concurrently
+        db = Database(lattice_dir / "index.db", pooled=True)
+        try:
+            retrieval = LatticeConfig.load(path).retrieval
+        except Exception:
+            # Missing or invalid config - use the defaults
+            retrieval = RetrievalConfig()
+        vectors = VectorIndex.open(lattice_dir) if retrieval.semantic_search else None
+        retriever = ContextRetriever(db, retrieval.token_budgets, vectors=vectors)
 
         # Get context
         response = asyncio.run(retriever.get_context(query))
@@ -101,5 +110,7 @@ def _format_json(response: dict) -> str:
         "related_decisions": [d.model_dump() for d in response.get("related_decisions", [])],
         "corrections": [c.model_dump() for c in response.get("corrections", [])],
         "conventions": [c.model_dump() for c in response.get("conventions", [])],
+        "total_tokens": response.get("total_tokens", 0),
+        "metadata": response.get("metadata", {}),
     }
     return json.dumps(output, indent=2, default=str)
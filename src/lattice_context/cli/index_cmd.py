@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional
 
 import time
 from datetime import datetime
@@ -15,15 +15,23 @@ from lattice_context.core.config import LatticeConfig
 from lattice_context.core.errors import ManifestNotFoundError, ProjectNotInitializedError
 from lattice_context.core.licensing import check_decision_limit, get_current_tier
 from lattice_context.core.logging import configure_logging, get_logger
+from lattice_context.core.types import Convention, ConventionType, DataTool, Decision
 from lattice_context.extractors.dbt_extractor import DbtExtractor
 from lattice_context.extractors.git_extractor import GitExtractor
 from lattice_context.storage.database import Database
+from lattice_context.storage.vectors import VectorIndex, decision_text
 
 console = Console()
 logger = get_logger(__name__)
 
 
-def index_project(path: Path, incremental: bool = False, tool: Optional[str] = None, verbose: bool = False) -> None:
+def index_project(
+    path: Path,
+    incremental: bool = False,
+    tool: Optional[str] = None,
+    verbose: bool = False,
+    rebuild_fts: bool = False,
+) -> None:
     """Index a project to extract decisions and conventions."""
     # Configure logging
     configure_logging(verbose)
@@ -39,9 +47,18 @@ def index_project(path: Path, incremental: bool = False, tool: Optional[str] = N
         # Load config
         config = LatticeConfig.load(path)
         db = Database(lattice_dir / "index.db")
+        # Idempotent - brings indexes created by older versions up to date
+        db.initialize()
 
         start_time = time.time()
 
+        entities: list[dict[str, Any]] = []
+        conventions: list[Convention] = []
+        yaml_decisions: list[Decision] = []
+        git_decisions: list[Decision] = []
+        # Ids of decisions deleted this run, so derived indexes update only what changed
+        deleted_decision_ids: list[str] = []
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -49,7 +66,7 @@ def index_project(path: Path, incremental: bool = False, tool: Optional[str] = N
             console=console,
         ) as progress:
 
-            # Phase 1: Parse manifest
+            # Phase 1: Parse manifest and extract entities, conventions and descriptions
             task1 = progress.add_task("[cyan]Parsing dbt manifest...", total=1)
 
             dbt_config = config.tools.get("dbt", {})
@@ -58,79 +75,147 @@ def index_project(path: Path, incremental: bool = False, tool: Optional[str] = N
             if not manifest_path.exists():
                 raise ManifestNotFoundError([manifest_path])
 
-            extractor = DbtExtractor(manifest_path)
-            extractor.load_manifest()
-            logger.info("manifest_parsed", path=str(manifest_path))
-            progress.update(task1, completed=1)
-
-            # Phase 2: Extract entities
-            task2 = progress.add_task("[cyan]Extracting entities...", total=1)
-            entities = extractor.extract_entities()
-            logger.info("entities_extracted", count=len(entities))
-
-            if verbose:
-                console.print(f"  Found {len(entities)} entities")
-
-            progress.update(task2, completed=1)
-
-            # Phase 3: Detect conventions
-            task3 = progress.add_task("[cyan]Detecting conventions...", total=1)
-            conventions = extractor.detect_conventions()
-            logger.info("conventions_detected", count=len(conventions))
-
-            if verbose:
-                console.print(f"  Detected {len(conventions)} conventions")
-
-            for convention in conventions:
-                db.add_convention(convention)
-
-            progress.update(task3, completed=1)
-
-            # Phase 4: Extract from YAML descriptions
-            task4 = progress.add_task("[cyan]Extracting YAML descriptions...", total=1)
-            yaml_decisions = extractor.extract_yaml_descriptions()
-            logger.info("yaml_decisions_extracted", count=len(yaml_decisions))
-
-            if verbose:
-                console.print(f"  Extracted {len(yaml_decisions)} descriptions")
-
-            for decision in yaml_decisions:
-                db.add_decision(decision)
-
-            progress.update(task4, completed=1)
-
-            # Phase 5: Git history (if enabled)
-            git_decisions = []
+            manifest_hash = DbtExtractor.hash_file(manifest_path)
+            manifest_changed = not incremental or db.get_metadata("manifest_hash") != manifest_hash
+
+            if not manifest_changed:
+                logger.info("manifest_unchanged", path=str(manifest_path))
+                if verbose:
+                    console.print("  Manifest unchanged since last index")
+                progress.update(task1, completed=1)
+            else:
+                extractor = DbtExtractor(
+                    manifest_path,
+                    streaming=dbt_config.get("stream_manifest", False),
+                    conventions=config.conventions,
+                )
+                extractor.load_manifest()
+
+                # Single pass over the models; only new or changed nodes are
+                # extracted when running incrementally
+                previous_nodes = db.get_manifest_nodes()
+                scan = extractor.scan(
+                    previous_hashes={
+                        node_id: node_hash for node_id, (_, node_hash) in previous_nodes.items()
+                    } if incremental else None
+                )
+                removed_nodes = set(previous_nodes) - set(scan.node_hashes)
+                entities = scan.entities
+                conventions = scan.conventions
+                yaml_decisions = scan.yaml_decisions
+
+                logger.info(
+                    "manifest_parsed",
+                    path=str(manifest_path),
+                    changed=len(scan.changed_nodes),
+                    removed=len(removed_nodes),
+                )
+                logger.info("entities_extracted", count=len(entities))
+                logger.info("conventions_detected", count=len(conventions))
+                logger.info("yaml_decisions_extracted", count=len(yaml_decisions))
+
+                if verbose:
+                    console.print(f"  Found {len(entities)} entities")
+                    console.print(f"  Detected {len(conventions)} conventions")
+                    console.print(f"  Extracted {len(yaml_decisions)} descriptions")
+
+                progress.update(task1, completed=1)
+
+                # Phase 2: Store manifest results
+                task2 = progress.add_task("[cyan]Storing entities and conventions...", total=1)
+
+                # Replace entities of removed and changed models (columns may have
+                # been dropped), by node id: versions of a model share its name
+                db.delete_node_entities(removed_nodes | scan.changed_nodes)
+                db.add_entities(entities)
+
+                # Conventions are mined from every model on each scan; drop
+                # the affixes that no longer qualify
+                db.replace_conventions(
+                    conventions, DataTool.DBT, [ConventionType.PREFIX, ConventionType.SUFFIX]
+                )
+
+                # Drop descriptions of removed nodes and of changed nodes whose
+                # description may no longer qualify, then write the fresh ones
+                deleted_decision_ids = [
+                    DbtExtractor.yaml_decision_id(node_id)
+                    for node_id in removed_nodes | scan.changed_nodes
+                ]
+                db.delete_decisions(deleted_decision_ids)
+                db.add_decisions(yaml_decisions)
+                db.set_manifest_nodes(
+                    {node_id: scan.node_hashes[node_id] for node_id in scan.changed_nodes},
+                    removed=removed_nodes,
+                )
+                db.set_metadata("manifest_hash", manifest_hash)
+
+                progress.update(task2, completed=1)
+
+            # Phase 3: Git history (if enabled)
             if config.extraction.git.enabled:
-                task5 = progress.add_task("[cyan]Analyzing git history...", total=1)
+                task3 = progress.add_task("[cyan]Analyzing git history...", total=1)
 
                 try:
                     git_extractor = GitExtractor(
                         path,
-                        limit=config.extraction.git.depth
+                        limit=config.extraction.git.depth,
+                        workers=config.extraction.git.workers,
+                        backend=config.extraction.git.backend,
                     )
+                    branch = config.extraction.git.branch
+                    head_sha = git_extractor.head_sha(branch)
                     git_decisions = git_extractor.extract_decisions(
-                        branch=config.extraction.git.branch
+                        branch=branch,
+                        since=db.get_metadata("last_commit_sha") if incremental else None,
+                        cache=db,
                     )
                     logger.info("git_decisions_extracted", count=len(git_decisions))
 
                     if verbose:
                         console.print(f"  Extracted {len(git_decisions)} decisions from git")
 
-                    for decision in git_decisions:
-                        db.add_decision(decision)
+                    db.add_decisions(git_decisions)
+                    if head_sha:
+                        db.set_metadata("last_commit_sha", head_sha)
 
                 except Exception as e:
                     logger.warning("git_extraction_failed", error=str(e))
                     if verbose:
                         console.print(f"  [yellow]Git extraction skipped: {e}[/yellow]")
 
-                progress.update(task5, completed=1)
-
-            # Phase 6: Store results
-            task6 = progress.add_task("[cyan]Storing results...", total=1)
+                progress.update(task3, completed=1)
+
+            # Phase 4: Store results
+            task4 = progress.add_task("[cyan]Storing results...", total=1)
+            written_decisions = yaml_decisions + git_decisions
+            # The graph links entities that have decisions, so it only changes
+            # when decisions are written or deleted
+            if written_decisions or deleted_decision_ids:
+                edges = db.rebuild_entity_graph()
+                logger.info("entity_graph_built", edges=edges)
+            if rebuild_fts:
+                db.rebuild_fts()
+                logger.info("fts_rebuilt")
+            vectors = VectorIndex.open(lattice_dir) if config.retrieval.semantic_search else None
+            # Skipped when this run changed no decisions and the index exists
+            if vectors is not None and (
+                written_decisions or deleted_decision_ids or not vectors.meta_path.exists()
+            ):
+                # Only decisions written or deleted this run can have changed
+                embedded, removed = vectors.update(
+                    {d.id: decision_text(d) for d in written_decisions},
+                    removed=deleted_decision_ids,
+                )
+                if len(vectors) != db.count_decisions():
+                    # New, or built by another embedder: embed the rest too
+                    rest_embedded, rest_removed = vectors.sync({
+                        d.id: decision_text(d) for d in db.list_decisions(limit=db.count_decisions())
+                    })
+                    embedded += rest_embedded
+                    removed += rest_removed
+                logger.info("vector_index_synced", embedded=embedded, removed=removed)
             db.set_last_indexed_at(datetime.now())
-            progress.update(task6, completed=1)
+            progress.update(task4, completed=1)
 
         elapsed = time.time() - start_time
 
@@ -153,15 +238,16 @@ def index_project(path: Path, incremental: bool = False, tool: Optional[str] = N
         console.print(f"  Decisions:   {total_decisions}")
         console.print()
 
-        # Check tier limits
+        # Check tier limits against everything stored, not just this run
+        stored_decisions = db.count_decisions()
         tier = get_current_tier()
-        violation = check_decision_limit(tier, total_decisions)
+        violation = check_decision_limit(tier, stored_decisions)
         if violation:
             console.print(f"[yellow]⚠ {violation.message}[/yellow]")
             console.print("[dim]Run 'lattice upgrade' for more info[/dim]")
             console.print()
 
-        if total_decisions == 0:
+        if stored_decisions == 0:
             console.print("[yellow]⚠ No decisions extracted. Consider:[/yellow]")
             console.print("  • Adding descriptions to your dbt models")
             console.print("  • Using more descriptive commit messages")
@@ -19,8 +19,9 @@ def list_decisions(
     path: Path = Path("."),
     limit: int = 20,
     entity: Optional[str] = None,
+    cursor: Optional[str] = None,
 ) -> None:
-    """List indexed decisions with team activity."""
+    """List indexed decisions with team activity, one page at a time."""
     try:
         lattice_dir = path / ".lattice"
 
@@ -29,11 +30,7 @@ def list_decisions(
 
         db = Database(lattice_dir / "index.db")
         conn = db.connect()
-        decisions = db.list_decisions(limit=limit if not entity else 1000)
-
-        # Filter by entity if specified
-        if entity:
-            decisions = [d for d in decisions if entity.lower() in d.entity.lower()]
+        decisions, next_cursor = db.query_decisions(entity=entity, cursor=cursor, limit=limit)
 
         if not decisions:
             console.print("[yellow]No decisions found.[/yellow]")
@@ -42,7 +39,7 @@ def list_decisions(
             return
 
         # Get team activity for all decisions
-        decision_ids = [d.id for d in decisions[:limit]]
+        decision_ids = [d.id for d in decisions]
         team_activity = {}
 
         for dec_id in decision_ids:
@@ -61,13 +58,13 @@ def list_decisions(
             }
 
         # Create table with team activity columns
-        table = Table(title=f"Indexed Decisions ({len(decisions)} found)", show_lines=True)
+        table = Table(title=f"Indexed Decisions ({len(decisions)} shown)", show_lines=True)
         table.add_column("Entity", style="cyan", no_wrap=True)
         table.add_column("Why", style="white", max_width=50)
         table.add_column("Team", style="yellow", justify="center")  # New: team activity
         table.add_column("ID", style="dim", no_wrap=True)
 
-        for decision in decisions[:limit]:
+        for decision in decisions:
             activity = team_activity[decision.id]
 
             # Format team activity indicator
@@ -108,8 +105,8 @@ def list_decisions(
             console.print("  lattice team comment <id> \"...\" - Discuss decisions")
             console.print("  lattice team verify <id>      - Verify it's still valid")
 
-        if len(decisions) > limit:
-            console.print(f"\n[dim]Showing {limit} of {len(decisions)} decisions. Use --limit to see more.[/dim]")
+        if next_cursor:
+            console.print(f"\n[dim]More decisions available. Next page: --cursor {next_cursor}[/dim]")
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
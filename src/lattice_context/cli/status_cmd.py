@@ -3,6 +3,7 @@
 from datetime import datetime
 from pathlib import Path
 
+import typer
 from rich.console import Console
 from rich.table import Table
 
@@ -64,3 +65,28 @@ def show_status(path: Path) -> None:
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
+
+
+def check_index(path: Path) -> None:
+    """Check the search index against the stored decisions. Exits with 1 if it is out of sync."""
+    try:
+        lattice_dir = path / ".lattice"
+
+        if not lattice_dir.exists():
+            raise ProjectNotInitializedError(path)
+
+        db = Database(lattice_dir / "index.db")
+        in_sync = db.check_fts()
+        decisions = db.count_decisions()
+
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+
+    if in_sync:
+        console.print(f"[green]✓[/green] Search index matches {decisions} decisions")
+        return
+
+    console.print("[red]✗[/red] Search index is out of sync with the stored decisions")
+    console.print("\n[yellow]Hint: Run 'lattice index --rebuild-fts' to rebuild it[/yellow]")
+    raise typer.Exit(1)
@@ -20,6 +20,7 @@ class DbtToolConfig(BaseModel):
     enabled: bool = True
     manifest_path: str = "target/manifest.json"
     project_path: str = "."
+    stream_manifest: bool = False  # Read nodes incrementally instead of json.load
 
 
 class GitExtractionConfig(BaseModel):
@@ -28,6 +29,8 @@ class GitExtractionConfig(BaseModel):
     depth: int = 500
     branch: str = "main"
     include_merge_commits: bool = False
+    backend: str = "log"  # "log" (one streamed git log) or "gitpython"
+    workers: int = 1  # Threads (and, for the log backend, git processes) reading commits
 
 
 class LLMExtractionConfig(BaseModel):
@@ -54,6 +57,7 @@ class RetrievalConfig(BaseModel):
     """Retrieval configuration."""
     token_budgets: TokenBudgets = Field(default_factory=TokenBudgets)
     include_code_snippets: bool = True
+    semantic_search: bool = False  # Embed decisions to find related ones by wording (needs numpy)
 
 
 class ConventionConfig(BaseModel):
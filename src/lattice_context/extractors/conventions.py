@@ -0,0 +1,130 @@
+"""Discover naming conventions from the names of models and columns."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+from lattice_context.core.config import ConventionConfig
+from lattice_context.core.types import Convention, ConventionType, DataTool, EntityType
+
+# Examples stored with each convention
+MAX_EXAMPLES = 5
+
+
+def affix_confidence(frequency: int) -> float:
+    """Confidence in a naming convention seen on ``frequency`` names."""
+    return round(min(0.95, 0.7 + frequency * 0.05), 2)
+
+
+def _count_affixes(names: list[str], prefix: bool) -> Counter[str]:
+    """Count each name's first word plus ``_`` (or ``_`` plus its last word).
+
+    The separator must have a word on both sides, so ``"orders"`` and
+    ``"_loaded"`` have neither affix. Names are split in one comprehension;
+    numbers are dropped afterwards, once per distinct affix.
+    """
+    if prefix:
+        counts = Counter([name[:i + 1] for name in names if 0 < (i := name.find("_")) < len(name) - 1])
+        numeric = [affix for affix in counts if affix[:-1].isdigit()]
+    else:
+        counts = Counter([name[i:] for name in names if 0 < (i := name.rfind("_")) < len(name) - 1])
+        numeric = [affix for affix in counts if affix[1:].isdigit()]
+    for affix in numeric:
+        del counts[affix]
+    return counts
+
+
+def _affix_of(name: str, prefix: bool) -> Optional[str]:
+    """The affix :func:`_count_affixes` counts for ``name``, if any."""
+    if prefix:
+        i = name.find("_")
+        return name[:i + 1] if 0 < i < len(name) - 1 else None
+    i = name.rfind("_")
+    return name[i:] if 0 < i < len(name) - 1 else None
+
+
+def count_words(*name_lists: Iterable[str]) -> Counter[str]:
+    """Count the words of every name made of several ``_``-separated words.
+
+    One-word names are skipped: a column named ``id`` does not make ``_id``
+    any less of a convention. The names are joined and split once, so the
+    cost is linear in their total length.
+    """
+    return Counter("_".join([name for names in name_lists for name in names if "_" in name]).split("_"))
+
+
+def mine_affixes(
+    names: Iterable[str],
+    convention_type: ConventionType,
+    entity_type: EntityType,
+    config: Optional[ConventionConfig] = None,
+    tool: DataTool = DataTool.DBT,
+    word_counts: Optional[Counter[str]] = None,
+) -> list[Convention]:
+    """Find the prefixes or suffixes that names share, most frequent first.
+
+    Every name contributes its first (``PREFIX``) or last (``SUFFIX``)
+    ``_``-separated word, so conventions are discovered rather than matched
+    against a fixed list, in one counting pass plus one pass collecting
+    examples. Affixes below ``config.min_frequency`` names or
+    ``config.min_confidence`` are left out.
+
+    So are affixes whose word is mostly used otherwise: ``customer_`` is
+    an entity, not a convention, when ``dim_customer`` and ``customer_id``
+    outnumber the names starting with it. Words like ``stg`` or ``id``
+    rarely appear anywhere but at their end. ``word_counts``, from
+    :func:`count_words`, must cover ``names`` and may cover other names
+    whose words count too; by default only ``names`` are counted.
+    """
+    if convention_type not in (ConventionType.PREFIX, ConventionType.SUFFIX):
+        raise ValueError(f"Not an affix convention: {convention_type.value}")
+    config = config or ConventionConfig()
+    prefix = convention_type == ConventionType.PREFIX
+
+    names = [name for name in names if name]
+    counts = _count_affixes(names, prefix)
+    frequent = {
+        affix: frequency
+        for affix, frequency in counts.items()
+        if frequency >= config.min_frequency and affix_confidence(frequency) >= config.min_confidence
+    }
+    if frequent:
+        word_counts = count_words(names) if word_counts is None else word_counts
+        # Uses of the word other than as this affix, against uses as the affix
+        frequent = {
+            affix: frequency for affix, frequency in frequent.items()
+            if word_counts[affix.strip("_")] - frequency < frequency
+        }
+    if not frequent:
+        return []
+
+    # Examples in order of appearance; stop once every affix has enough
+    examples: dict[str, list[str]] = {affix: [] for affix in frequent}
+    unfilled = len(examples)
+    for name in names:
+        matched = examples.get(_affix_of(name, prefix))
+        if matched is not None and len(matched) < MAX_EXAMPLES:
+            matched.append(name)
+            if len(matched) == MAX_EXAMPLES:
+                unfilled -= 1
+                if not unfilled:
+                    break
+
+    now = datetime.now()
+    return [
+        Convention(
+            id=f"conv_{hashlib.sha256(f'{affix}:{entity_type.value}'.encode()).hexdigest()[:12]}",
+            type=convention_type,
+            pattern=affix,
+            applies_to=[entity_type],
+            examples=examples[affix],
+            frequency=frequency,
+            confidence=affix_confidence(frequency),
+            detected_at=now,
+            tool=tool,
+        )
+        for affix, frequency in sorted(frequent.items(), key=lambda item: (-item[1], item[0]))
+    ]
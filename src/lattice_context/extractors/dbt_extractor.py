@@ -2,10 +2,13 @@
 
 import hashlib
 import json
+from dataclasses import dataclass, field
 from datetime import datetime
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional
 
+from lattice_context.core.config import ConventionConfig
 from lattice_context.core.types import (
     ChangeType,
     Convention,
@@ -15,184 +18,245 @@ from lattice_context.core.types import (
     DecisionSource,
     EntityType,
 )
+from lattice_context.extractors.conventions import count_words, mine_affixes
+from lattice_context.extractors.manifest_stream import iter_manifest_nodes
+
+_MODEL = EntityType.MODEL.value
+_COLUMN = EntityType.COLUMN.value
+_DBT = DataTool.DBT.value
+
+
+def _column_metadata(model: Any, description: Any, data_type: Any) -> str:
+    """Same output as json.dumps of the column metadata dict, without the encoder overhead."""
+    if type(model) is str and type(description) is str and type(data_type) is str:
+        return (
+            f'{{"model": {encode_basestring_ascii(model)}, '
+            f'"description": {encode_basestring_ascii(description)}, '
+            f'"data_type": {encode_basestring_ascii(data_type)}}}'
+        )
+    return json.dumps({"model": model, "description": description, "data_type": data_type})
+
+
+@dataclass
+class ManifestScan:
+    """Everything extracted from one pass over the manifest's models."""
+    node_hashes: dict[str, tuple[str, str]] = field(default_factory=dict)  # node_id -> (name, hash)
+    changed_nodes: set[str] = field(default_factory=set)
+    entities: list[dict[str, Any]] = field(default_factory=list)
+    conventions: list[Convention] = field(default_factory=list)
+    yaml_decisions: list[Decision] = field(default_factory=list)
 
 
 class DbtExtractor:
     """Extract entities, decisions, and conventions from dbt projects."""
 
-    def __init__(self, manifest_path: Path):
+    def __init__(
+        self,
+        manifest_path: Path,
+        streaming: bool = False,
+        conventions: Optional[ConventionConfig] = None,
+    ):
         self.manifest_path = manifest_path
+        self.streaming = streaming
+        self.conventions = conventions or ConventionConfig()
         self.manifest: dict[str, Any] = {}
 
     def load_manifest(self) -> None:
-        """Load dbt manifest.json."""
+        """Load dbt manifest.json. In streaming mode nodes are read lazily instead."""
+        if self.streaming:
+            return
         with open(self.manifest_path) as f:
             self.manifest = json.load(f)
 
-    def extract_entities(self) -> list[dict[str, Any]]:
-        """Extract entities from manifest."""
-        entities = []
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """Hash a manifest file without reading it into memory at once."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def yaml_decision_id(node_id: str) -> str:
+        """Deterministic ID of the decision extracted from a node's description."""
+        return f"dec_{hashlib.sha256(f'yaml:{node_id}'.encode()).hexdigest()[:12]}"
+
+    def iter_models(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield (node_id, node) for every model, streaming from disk if enabled."""
+        if self.streaming:
+            nodes = iter_manifest_nodes(self.manifest_path)
+        else:
+            nodes = iter(self.manifest.get("nodes", {}).items())
 
-        # Extract models
-        for node_id, node in self.manifest.get("nodes", {}).items():
+        for node_id, node in nodes:
             if node.get("resource_type") == "model":
-                entity_id = hashlib.sha256(node_id.encode()).hexdigest()[:12]
-                entities.append({
-                    "id": f"ent_{entity_id}",
-                    "name": node.get("name"),
-                    "type": EntityType.MODEL.value,
-                    "tool": DataTool.DBT.value,
-                    "path": node.get("original_file_path"),
-                    "metadata": json.dumps({
-                        "schema": node.get("schema"),
-                        "database": node.get("database"),
-                        "description": node.get("description", ""),
-                    }),
-                    "created_at": datetime.now(),
-                    "updated_at": datetime.now(),
-                })
-
-                # Extract columns for this model
-                for col_name, col_data in node.get("columns", {}).items():
-                    col_id = hashlib.sha256(f"{node_id}:{col_name}".encode()).hexdigest()[:12]
-                    entities.append({
-                        "id": f"ent_{col_id}",
-                        "name": col_name,
-                        "type": EntityType.COLUMN.value,
-                        "tool": DataTool.DBT.value,
-                        "path": node.get("original_file_path"),
-                        "metadata": json.dumps({
-                            "model": node.get("name"),
-                            "description": col_data.get("description", ""),
-                            "data_type": col_data.get("data_type", ""),
-                        }),
-                        "created_at": datetime.now(),
-                        "updated_at": datetime.now(),
-                    })
+                yield node_id, node
+
+    def scan(self, previous_hashes: Optional[dict[str, str]] = None) -> ManifestScan:
+        """Extract entities, conventions and YAML decisions in a single pass.
+
+        Entities and decisions are only extracted for nodes whose content hash
+        differs from ``previous_hashes`` (all nodes when it is None). Conventions
+        always cover every model.
+        """
+        result = ManifestScan()
+        model_names: list[str] = []
+        column_names: list[str] = []
+        # One timestamp for everything extracted in this pass
+        now = datetime.now()
+
+        for node_id, node in self.iter_models():
+            node_hash = self._node_hash(node)
+            result.node_hashes[node_id] = (node.get("name"), node_hash)
+            model_names.append(node.get("name"))
+            column_names.extend(node.get("columns", {}).keys())
+
+            if previous_hashes is not None and previous_hashes.get(node_id) == node_hash:
+                continue
+
+            result.changed_nodes.add(node_id)
+            result.entities.extend(self._model_entities(node_id, node, now))
+            decision = self._yaml_decision(node_id, node, now)
+            if decision:
+                result.yaml_decisions.append(decision)
 
+        result.conventions = self._conventions_from_names(model_names, column_names)
+        return result
+
+    def extract_entities(self, node_ids: Optional[set[str]] = None) -> list[dict[str, Any]]:
+        """Extract entities from manifest, optionally limited to the given node IDs."""
+        entities = []
+        now = datetime.now()
+        for node_id, node in self.iter_models():
+            if node_ids is None or node_id in node_ids:
+                entities.extend(self._model_entities(node_id, node, now))
         return entities
 
     def detect_conventions(self) -> list[Convention]:
         """Detect naming conventions from entities."""
-        conventions = []
         model_names: list[str] = []
         column_names: list[str] = []
 
         # Collect names
-        for node_id, node in self.manifest.get("nodes", {}).items():
-            if node.get("resource_type") == "model":
-                model_names.append(node.get("name"))
-                for col_name in node.get("columns", {}).keys():
-                    column_names.append(col_name)
-
-        # Detect prefixes for models
-        model_conventions = self._detect_prefix_patterns(model_names, EntityType.MODEL)
-        conventions.extend(model_conventions)
-
-        # Detect suffixes for columns
-        column_conventions = self._detect_suffix_patterns(column_names, EntityType.COLUMN)
-        conventions.extend(column_conventions)
-
-        return conventions
-
-    def _detect_prefix_patterns(self, names: list[str], entity_type: EntityType) -> list[Convention]:
-        """Detect prefix patterns."""
-        conventions = []
-        prefix_counts: dict[str, list[str]] = {}
-
-        # Common dbt prefixes
-        common_prefixes = ["dim_", "fct_", "stg_", "int_", "rpt_"]
-
-        for name in names:
-            for prefix in common_prefixes:
-                if name.startswith(prefix):
-                    if prefix not in prefix_counts:
-                        prefix_counts[prefix] = []
-                    prefix_counts[prefix].append(name)
-
-        # Create conventions for patterns with 3+ occurrences
-        for prefix, examples in prefix_counts.items():
-            if len(examples) >= 3:
-                conv_id = hashlib.sha256(f"{prefix}:{entity_type.value}".encode()).hexdigest()[:12]
-                conventions.append(
-                    Convention(
-                        id=f"conv_{conv_id}",
-                        type=ConventionType.PREFIX,
-                        pattern=prefix,
-                        applies_to=[entity_type],
-                        examples=examples[:5],  # Max 5 examples
-                        frequency=len(examples),
-                        confidence=min(0.95, 0.7 + (len(examples) * 0.05)),
-                        detected_at=datetime.now(),
-                        tool=DataTool.DBT,
-                    )
-                )
-
-        return conventions
-
-    def _detect_suffix_patterns(self, names: list[str], entity_type: EntityType) -> list[Convention]:
-        """Detect suffix patterns."""
-        conventions = []
-        suffix_counts: dict[str, list[str]] = {}
-
-        # Common column suffixes
-        common_suffixes = ["_id", "_key", "_at", "_date", "_amount", "_count", "_flag"]
-
-        for name in names:
-            for suffix in common_suffixes:
-                if name.endswith(suffix):
-                    if suffix not in suffix_counts:
-                        suffix_counts[suffix] = []
-                    suffix_counts[suffix].append(name)
-
-        # Create conventions for patterns with 3+ occurrences
-        for suffix, examples in suffix_counts.items():
-            if len(examples) >= 3:
-                conv_id = hashlib.sha256(f"{suffix}:{entity_type.value}".encode()).hexdigest()[:12]
-                conventions.append(
-                    Convention(
-                        id=f"conv_{conv_id}",
-                        type=ConventionType.SUFFIX,
-                        pattern=suffix,
-                        applies_to=[entity_type],
-                        examples=examples[:5],
-                        frequency=len(examples),
-                        confidence=min(0.95, 0.7 + (len(examples) * 0.05)),
-                        detected_at=datetime.now(),
-                        tool=DataTool.DBT,
-                    )
-                )
-
-        return conventions
-
-    def extract_yaml_descriptions(self) -> list[Decision]:
-        """Extract descriptions from YAML as decisions."""
-        decisions = []
+        for _, node in self.iter_models():
+            model_names.append(node.get("name"))
+            column_names.extend(node.get("columns", {}).keys())
 
-        for node_id, node in self.manifest.get("nodes", {}).items():
-            if node.get("resource_type") != "model":
+        return self._conventions_from_names(model_names, column_names)
+
+    def extract_yaml_descriptions(self, node_ids: Optional[set[str]] = None) -> list[Decision]:
+        """Extract descriptions from YAML as decisions, optionally limited to the given node IDs."""
+        decisions = []
+        now = datetime.now()
+        for node_id, node in self.iter_models():
+            if node_ids is not None and node_id not in node_ids:
                 continue
+            decision = self._yaml_decision(node_id, node, now)
+            if decision:
+                decisions.append(decision)
+        return decisions
 
-            description = node.get("description", "").strip()
-            if description and len(description) > 20:
-                # This is substantial documentation - treat as a decision
-                dec_id = hashlib.sha256(f"yaml:{node_id}".encode()).hexdigest()[:12]
-                decisions.append(
-                    Decision(
-                        id=f"dec_{dec_id}",
-                        entity=node.get("name"),
-                        entity_type=EntityType.MODEL,
-                        change_type=ChangeType.CREATED,
-                        why=description,
-                        context="From dbt model documentation",
-                        source=DecisionSource.YAML_DESCRIPTION,
-                        source_ref=node.get("original_file_path", ""),
-                        author="unknown",
-                        timestamp=datetime.now(),
-                        confidence=0.8,
-                        tags=["documentation"],
-                        tool=DataTool.DBT,
-                    )
-                )
+    @staticmethod
+    def _node_hash(node: dict[str, Any]) -> str:
+        """Hash the node fields extraction reads, so unrelated edits (SQL, config) don't count."""
+        content = json.dumps([
+            node.get("name"),
+            node.get("schema"),
+            node.get("database"),
+            node.get("original_file_path"),
+            node.get("description", ""),
+            node.get("columns", {}),
+        ], default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
 
-        return decisions
+    def _model_entities(self, node_id: str, node: dict[str, Any], now: datetime) -> list[dict[str, Any]]:
+        """Build the model entity and its column entities."""
+        path = node.get("original_file_path")
+        model_name = node.get("name")
+
+        entity_id = hashlib.sha256(node_id.encode()).hexdigest()[:12]
+        entities = [{
+            "id": f"ent_{entity_id}",
+            "name": model_name,
+            "type": _MODEL,
+            "tool": _DBT,
+            "path": path,
+            "parent": None,
+            "node_id": node_id,
+            "metadata": json.dumps({
+                "schema": node.get("schema"),
+                "database": node.get("database"),
+                "description": node.get("description", ""),
+            }),
+            "created_at": now,
+            "updated_at": now,
+        }]
+
+        # Column IDs hash "<node_id>:<column>"; hash the shared prefix once
+        # and extend a copy of that state per column
+        prefix_hash = hashlib.sha256(f"{node_id}:".encode())
+
+        # Extract columns for this model
+        for col_name, col_data in node.get("columns", {}).items():
+            col_hash = prefix_hash.copy()
+            col_hash.update(col_name.encode())
+            entities.append({
+                "id": f"ent_{col_hash.hexdigest()[:12]}",
+                "name": col_name,
+                "type": _COLUMN,
+                "tool": _DBT,
+                "path": path,
+                "parent": model_name,
+                "node_id": node_id,
+                "metadata": _column_metadata(
+                    model_name,
+                    col_data.get("description", ""),
+                    col_data.get("data_type", ""),
+                ),
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        return entities
+
+    def _yaml_decision(self, node_id: str, node: dict[str, Any], now: datetime) -> Optional[Decision]:
+        """Turn a substantial model description into a decision."""
+        description = node.get("description", "").strip()
+        if not description or len(description) <= 20:
+            return None
+
+        # This is substantial documentation - treat as a decision
+        return Decision(
+            id=self.yaml_decision_id(node_id),
+            entity=node.get("name"),
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.CREATED,
+            why=description,
+            context="From dbt model documentation",
+            source=DecisionSource.YAML_DESCRIPTION,
+            source_ref=node.get("original_file_path", ""),
+            author="unknown",
+            timestamp=now,
+            confidence=0.8,
+            tags=["documentation"],
+            tool=DataTool.DBT,
+        )
+
+    def _conventions_from_names(self, model_names: list[str], column_names: list[str]) -> list[Convention]:
+        """Detect model prefix and column suffix conventions."""
+        if not self.conventions.enabled:
+            return []
+        # Words of both kinds of names, so a model prefix like "customer_"
+        # is recognised as an entity from customer_id columns, and back
+        word_counts = count_words(model_names, column_names)
+        return [
+            *mine_affixes(
+                model_names, ConventionType.PREFIX, EntityType.MODEL, self.conventions,
+                word_counts=word_counts,
+            ),
+            *mine_affixes(
+                column_names, ConventionType.SUFFIX, EntityType.COLUMN, self.conventions,
+                word_counts=word_counts,
+            ),
+        ]
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional, Sequence
 
 import hashlib
 import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -20,6 +23,110 @@ from lattice_context.core.types import (
     EntityType,
 )
 
+if TYPE_CHECKING:
+    from lattice_context.storage.database import Database
+
+# One record per commit: \x1e, then \x1f-separated header fields and message,
+# then the NUL-separated paths emitted by --name-only -z
+_LOG_FORMAT = "%x1e%H%x1f%ae%x1f%ct%x1f%P%x1f%B%x1f"
+
+
+class CommitRecord(NamedTuple):
+    """The parts of a commit the extractor looks at."""
+    hexsha: str
+    author_email: str
+    committed_date: int
+    parents: tuple[str, ...]
+    message: str
+    # Files changed relative to the first parent; None if not read yet
+    paths: Optional[tuple[str, ...]] = None
+
+
+class MessageMatcher:
+    """Classify commit messages without running every pattern on each one.
+
+    Each decision and tag pattern is paired with literal words it cannot
+    match without (e.g. "add" for "added column ..."). One scan of the
+    message with an alternation of those literals finds which occur, so
+    only the patterns that can match are run. The literals are matched
+    with re.IGNORECASE, the same case rules as the patterns themselves,
+    so the result is the same as running all of them.
+    """
+
+    # Messages only ever contain a few distinct literal combinations
+    MAX_PLANS = 4096
+
+    def __init__(
+        self,
+        patterns: Sequence[tuple[str, ChangeType, EntityType]],
+        pattern_keywords: Sequence[tuple[str, ...]],
+        tag_patterns: Sequence[tuple[str, str, str]],
+    ):
+        if len(patterns) != len(pattern_keywords):
+            raise ValueError("Every decision pattern needs its keywords")
+
+        self.patterns = [
+            (re.compile(pattern, re.IGNORECASE), change_type, entity_type)
+            for pattern, change_type, entity_type in patterns
+        ]
+        self.pattern_keywords = [
+            frozenset(keyword.lower() for keyword in keywords) for keywords in pattern_keywords
+        ]
+        self.tag_patterns = [
+            (re.compile(pattern, re.IGNORECASE), literal.lower(), tag)
+            for pattern, literal, tag in tag_patterns
+        ]
+        self.literals = tuple(
+            sorted(set().union(*self.pattern_keywords, (literal for _, literal, _ in self.tag_patterns)))
+        )
+        # Group k<i> reports self.literals[i]. Alternatives are grouped by
+        # first character so the engine rejects most positions with one
+        # comparison, and the lookahead reports literals inside or
+        # overlapping another one.
+        by_first: dict[str, list[int]] = {}
+        for i, literal in enumerate(self.literals):
+            by_first.setdefault(literal[0], []).append(i)
+        self._scanner = re.compile(
+            "(?=" + "|".join(
+                re.escape(first) + "(?:" + "|".join(
+                    f"(?P<k{i}>{re.escape(self.literals[i][1:])})"
+                    # Longest first: a shorter literal starting at the same
+                    # position is then covered by _implied
+                    for i in sorted(indices, key=lambda i: -len(self.literals[i]))
+                ) + ")"
+                for first, indices in by_first.items()
+            ) + ")",
+            re.IGNORECASE,
+        )
+        self._implied = {
+            f"k{i}": frozenset(other for other in self.literals if other in literal)
+            for i, literal in enumerate(self.literals)
+        }
+        # Which patterns to run for a given set of literals present
+        self._plans: dict[frozenset[str], tuple[list, list]] = {}
+
+    def scan(self, message: str) -> tuple[list[tuple[re.Pattern, ChangeType, EntityType]], list[str]]:
+        """Return the decision patterns worth running and the message's tags."""
+        groups = {match.lastgroup for match in self._scanner.finditer(message)}
+        present = frozenset().union(*(self._implied[group] for group in groups))
+
+        plan = self._plans.get(present)
+        if plan is None:
+            plan = (
+                [
+                    compiled
+                    for compiled, keywords in zip(self.patterns, self.pattern_keywords)
+                    if keywords & present
+                ],
+                [(compiled, tag) for compiled, literal, tag in self.tag_patterns if literal in present],
+            )
+            if len(self._plans) < self.MAX_PLANS:
+                self._plans[present] = plan
+
+        patterns, tag_checks = plan
+        tags = [tag for compiled, tag in tag_checks if compiled.search(message)]
+        return patterns, tags
+
 
 class GitExtractor:
     """Extract decisions from git commit history."""
@@ -35,40 +142,300 @@ class GitExtractor:
         (r"(?:fix|correct)(?:ed|ing)?\s+[`']?(\w+)[`']?", ChangeType.MODIFIED, EntityType.MODEL),
     ]
 
-    def __init__(self, repo_path: Path, limit: int = 500):
+    # Literal words each of PATTERNS needs; a pattern only runs if one occurs
+    PATTERN_KEYWORDS = [
+        ("add",),
+        ("remove", "drop"),
+        ("add",),
+        ("create", "add"),
+        ("update", "modify", "change"),
+        ("rename", "refactor"),
+        ("fix", "correct"),
+    ]
+
+    # Common tags, with a literal each pattern's matches contain
+    TAG_PATTERNS = [
+        (r"JIRA-\d+", "jira-", "jira"),
+        (r"#\d+", "#", "github-issue"),
+        (r"\bbreaking\b", "breaking", "breaking-change"),
+        (r"\bfeat(?:ure)?\b", "feat", "feature"),
+        (r"\bfix\b", "fix", "bugfix"),
+        (r"\brefactor\b", "refactor", "refactor"),
+        (r"\btest\b", "test", "test"),
+        (r"\bdocs?\b", "doc", "documentation"),
+    ]
+
+    # Bump when _analyze_commit changes what it extracts; cached analyses
+    # from other versions (or other PATTERNS) are discarded
+    EXTRACTOR_VERSION = 1
+
+    # Upper bound on commits handed to a worker at a time
+    MAX_CHUNK_SIZE = 256
+
+    # Chunk size for reading `git log` output
+    READ_SIZE = 1 << 16
+
+    def __init__(self, repo_path: Path, limit: int = 500, workers: int = 1, backend: str = "log"):
         try:
             self.repo = Repo(repo_path, search_parent_directories=True)
         except Exception:
             raise GitNotFoundError()
+        if backend not in ("log", "gitpython"):
+            raise ValueError(f"Unknown git backend: {backend}")
         self.limit = limit
+        self.workers = max(1, workers)
+        self.backend = backend
+        self.matcher = MessageMatcher(self.PATTERNS, self.PATTERN_KEYWORDS, self.TAG_PATTERNS)
 
-    def extract_decisions(self, branch: str = "main") -> list[Decision]:
-        """Extract decisions from git history."""
-        decisions = []
+    def head_sha(self, branch: str = "main") -> Optional[str]:
+        """Resolve the commit at the tip of a branch, falling back to HEAD."""
+        for rev in (branch, "HEAD"):
+            try:
+                return self.repo.commit(rev).hexsha
+            except Exception:
+                continue
+        # No commits yet
+        return None
 
-        try:
-            # Get commits from the specified branch
-            commits = list(self.repo.iter_commits(branch, max_count=self.limit))
-        except Exception:
-            # If branch doesn't exist, try HEAD
+    def cache_version(self) -> str:
+        """Version key for cached commit analyses."""
+        patterns = repr((self.PATTERNS, self.PATTERN_KEYWORDS, self.TAG_PATTERNS))
+        return f"{self.EXTRACTOR_VERSION}:{hashlib.sha256(patterns.encode()).hexdigest()[:12]}"
+
+    def extract_decisions(
+        self,
+        branch: str = "main",
+        since: Optional[str] = None,
+        cache: Optional[Database] = None,
+    ) -> list[Decision]:
+        """Extract decisions from git history.
+
+        If ``since`` is a commit SHA that is an ancestor of the branch tip, only
+        commits made after it are analyzed. Otherwise the full history (up to
+        ``limit``) is walked.
+
+        With a ``cache`` database, commits analyzed by an earlier run of the
+        same extractor version are not read from git again.
+        """
+        head = self.head_sha(branch)
+        if head is None:
+            return []
+        if since == head:
+            return []
+
+        rev = head
+        if since:
             try:
-                commits = list(self.repo.iter_commits("HEAD", max_count=self.limit))
+                if self.repo.is_ancestor(since, head):
+                    rev = f"{since}..{head}"
             except Exception:
-                # No commits yet
-                return []
+                # Unknown commit (e.g. history was rewritten) - walk everything
+                pass
+
+        if cache is not None:
+            analyzed = self._analyze_with_cache(rev, cache)
+        elif self.workers > 1:
+            analyzed = (decisions for _, decisions in self._analyze_parallel(self._rev_list(rev)))
+        elif self.backend == "log":
+            analyzed = (
+                self._analyze_commit(record)
+                for record in self.iter_log_records(rev)
+                # Skip merge commits
+                if len(record.parents) <= 1
+            )
+        else:
+            analyzed = (
+                self._analyze_commit(self._record_from_commit(commit))
+                for commit in self.repo.iter_commits(rev, max_count=self.limit)
+                # Skip merge commits
+                if len(commit.parents) <= 1
+            )
+
+        # IDs are deterministic; a repeated ID keeps the latest analysis,
+        # matching what INSERT OR REPLACE would store
+        merged: dict[str, Decision] = {}
+        for commit_decisions in analyzed:
+            for decision in commit_decisions:
+                merged[decision.id] = decision
+
+        return list(merged.values())
 
-        for commit in commits:
+    def _analyze_with_cache(self, rev: str, cache: Database) -> list[list[Decision]]:
+        """Analyze commits in ``rev``, reusing cached analyses by SHA."""
+        shas = self._rev_list(rev)
+        version = self.cache_version()
+        analyses = cache.get_cached_commits(shas, version)
+        missing = [sha for sha in shas if sha not in analyses]
+        if missing:
+            fresh = dict(self._analyze_shas(missing))
+            cache.cache_commits(fresh, version)
+            analyses.update(fresh)
+
+        return [analyses[sha] for sha in shas]
+
+    def _rev_list(self, rev: str) -> list[str]:
+        """The non-merge commits in ``rev`` (up to ``limit``), newest first."""
+        listing = self.repo.git.rev_list(rev, max_count=self.limit, parents=True)
+        return [
+            fields[0]
+            for fields in (line.split() for line in listing.splitlines())
             # Skip merge commits
-            if len(commit.parents) > 1:
-                continue
+            if len(fields) <= 2
+        ]
 
-            commit_decisions = self._analyze_commit(commit)
-            decisions.extend(commit_decisions)
+    def _analyze_shas(self, shas: list[str]) -> Iterator[tuple[str, list[Decision]]]:
+        """Analyze the given non-merge commits with the configured backend."""
+        if self.workers > 1:
+            yield from self._analyze_parallel(shas)
+        elif self.backend == "log":
+            for record in self.iter_log_records(shas=shas):
+                yield record.hexsha, self._analyze_commit(record)
+        else:
+            for sha in shas:
+                yield sha, self._analyze_commit(self._record_from_commit(self.repo.commit(sha)))
 
-        return decisions
+    def iter_log_records(
+        self,
+        rev: Optional[str] = None,
+        shas: Optional[Sequence[str]] = None,
+    ) -> Iterator[CommitRecord]:
+        """Stream commits from a single `git log` process.
+
+        Unlike GitPython's Commit objects, which load each attribute through
+        the object database, this reads every field and the changed paths
+        from one pass over the log output. Either walks ``rev`` (up to
+        ``limit`` commits) or reads exactly ``shas``, in order.
+        """
+        cmd = [
+            self.repo.git.GIT_PYTHON_GIT_EXECUTABLE or "git",
+            "--git-dir", self.repo.git_dir,
+            "log",
+        ]
+        if shas is None:
+            cmd += [rev, f"--max-count={self.limit}"]
+        else:
+            cmd += ["--no-walk=unsorted", "--stdin"]
+        cmd += ["--name-only", "--no-renames", "-z", f"--format={_LOG_FORMAT}"]
+
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if shas is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            if shas is not None:
+                # git reads all of stdin before it starts writing the log
+                proc.stdin.write("".join(f"{sha}\n" for sha in shas).encode())
+                proc.stdin.close()
+
+            pending = b""
+            while True:
+                chunk = proc.stdout.read(self.READ_SIZE)
+                if not chunk:
+                    break
+                records = (pending + chunk).split(b"\x1e")
+                # The last record may continue in the next chunk
+                pending = records.pop()
+                for raw in records:
+                    if raw:
+                        yield self._parse_log_record(raw)
+            if pending:
+                yield self._parse_log_record(pending)
+
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise RuntimeError(f"git log failed: {stderr.decode(errors='replace').strip()}")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            for stream in (proc.stdin, proc.stdout, proc.stderr):
+                if stream is not None:
+                    stream.close()
+
+    @staticmethod
+    def _parse_log_record(raw: bytes) -> CommitRecord:
+        """Parse one record written with ``_LOG_FORMAT``."""
+        text = raw.decode("utf-8", errors="replace")
+        # Paths never contain \x1f, so split the message off from the right
+        header, path_block = text.rsplit("\x1f", 1)
+        hexsha, email, timestamp, parents, message = header.split("\x1f", 4)
+        paths = tuple(
+            path for path in (p.strip("\n") for p in path_block.split("\0")) if path
+        )
+        return CommitRecord(
+            hexsha=hexsha,
+            author_email=email or "unknown",
+            committed_date=int(timestamp),
+            parents=tuple(parents.split()),
+            message=message,
+            paths=paths,
+        )
 
-    def _analyze_commit(self, commit: Commit) -> list[Decision]:
-        """Analyze a single commit for decisions."""
+    @staticmethod
+    def _record_from_commit(commit: Commit) -> CommitRecord:
+        """Wrap a GitPython commit; changed paths are read later if needed."""
+        return CommitRecord(
+            hexsha=commit.hexsha,
+            author_email=commit.author.email if commit.author else "unknown",
+            committed_date=commit.committed_date,
+            parents=tuple(parent.hexsha for parent in commit.parents),
+            message=commit.message,
+        )
+
+    def _analyze_parallel(self, shas: list[str]) -> Iterator[tuple[str, list[Decision]]]:
+        """Analyze non-merge commits on a thread pool, yielding (sha, decisions) in commit order.
+
+        With the log backend each chunk is read by its own `git log`
+        process, so git computes the diffs of several chunks at once.
+        """
+        # GitPython's object database is not thread-safe, so each worker
+        # thread reads commits through its own Repo
+        local = threading.local()
+        repos: list[Repo] = []
+        repos_lock = threading.Lock()
+
+        def read_chunk(chunk: list[str]) -> list[tuple[str, list[Decision]]]:
+            return [
+                (record.hexsha, self._analyze_commit(record))
+                for record in self.iter_log_records(shas=chunk)
+            ]
+
+        def analyze_chunk(chunk: list[str]) -> list[tuple[str, list[Decision]]]:
+            repo = getattr(local, "repo", None)
+            if repo is None:
+                repo = Repo(self.repo.git_dir)
+                local.repo = repo
+                with repos_lock:
+                    repos.append(repo)
+
+            return [
+                (sha, self._analyze_commit(self._record_from_commit(repo.commit(sha)), repo))
+                for sha in chunk
+            ]
+
+        # Several chunks per worker so slow commits don't leave threads idle;
+        # a git process per chunk costs more, so log chunks are larger
+        per_worker = 1 if self.backend == "log" else 4
+        chunk_size = max(1, min(self.MAX_CHUNK_SIZE, -(-len(shas) // (self.workers * per_worker))))
+        chunks = [shas[i:i + chunk_size] for i in range(0, len(shas), chunk_size)]
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                worker = read_chunk if self.backend == "log" else analyze_chunk
+                for chunk_results in executor.map(worker, chunks):
+                    yield from chunk_results
+        finally:
+            for repo in repos:
+                repo.close()
+
+    def _analyze_commit(self, commit: CommitRecord, repo: Optional[Repo] = None) -> list[Decision]:
+        """Analyze a single commit for decisions.
+
+        ``repo`` is used to diff the commit when its changed paths were not
+        read up front (defaults to ``self.repo``).
+        """
         decisions = []
         message = commit.message.strip()
 
@@ -76,19 +443,22 @@ class GitExtractor:
         if len(message) < 10 or message.lower() in ["wip", "update", "fix", "refactor"]:
             return []
 
+        patterns, tags = self.matcher.scan(message)
+        why = None
+
         # Try pattern-based extraction
-        for pattern, change_type, entity_type in self.PATTERNS:
-            matches = re.finditer(pattern, message, re.IGNORECASE)
-            for match in matches:
+        for pattern, change_type, entity_type in patterns:
+            for match in pattern.finditer(message):
                 entity_name = match.group(1) if match.groups() else "unknown"
 
-                # Extract the "why" from the commit message
-                # Use the full message if it's substantial, otherwise use the summary
-                lines = message.split("\n")
-                summary = lines[0]
-                body = "\n".join(lines[2:]) if len(lines) > 2 else ""
+                if why is None:
+                    # Extract the "why" from the commit message
+                    # Use the full message if it's substantial, otherwise use the summary
+                    lines = message.split("\n")
+                    summary = lines[0]
+                    body = "\n".join(lines[2:]) if len(lines) > 2 else ""
 
-                why = body if body and len(body) > 20 else summary
+                    why = body if body and len(body) > 20 else summary
 
                 dec_id = hashlib.sha256(f"{commit.hexsha}:{entity_name}".encode()).hexdigest()[:12]
 
@@ -101,10 +471,10 @@ class GitExtractor:
                     context=f"Commit: {commit.hexsha[:7]}",
                     source=DecisionSource.GIT_COMMIT,
                     source_ref=commit.hexsha,
-                    author=commit.author.email if commit.author else "unknown",
+                    author=commit.author_email,
                     timestamp=datetime.fromtimestamp(commit.committed_date),
                     confidence=0.7,  # Pattern-based has medium confidence
-                    tags=self._extract_tags(message),
+                    tags=list(tags),
                     tool=DataTool.DBT,  # Assume dbt for now, could be smarter
                 )
                 decisions.append(decision)
@@ -112,7 +482,7 @@ class GitExtractor:
         # If no patterns matched but message is substantial, create a generic decision
         if not decisions and len(message) > 50:
             # Try to extract entity from changed files
-            entity = self._guess_entity_from_diff(commit)
+            entity = self._guess_entity_from_diff(commit, repo or self.repo)
             if entity:
                 dec_id = hashlib.sha256(f"{commit.hexsha}:{entity}".encode()).hexdigest()[:12]
                 decision = Decision(
@@ -124,50 +494,31 @@ class GitExtractor:
                     context=f"Commit: {commit.hexsha[:7]}",
                     source=DecisionSource.GIT_COMMIT,
                     source_ref=commit.hexsha,
-                    author=commit.author.email if commit.author else "unknown",
+                    author=commit.author_email,
                     timestamp=datetime.fromtimestamp(commit.committed_date),
                     confidence=0.5,  # Lower confidence for generic extraction
-                    tags=self._extract_tags(message),
+                    tags=tags,
                     tool=DataTool.DBT,
                 )
                 decisions.append(decision)
 
         return decisions
 
-    def _guess_entity_from_diff(self, commit: Commit) -> Optional[str]:
+    def _guess_entity_from_diff(self, commit: CommitRecord, repo: Repo) -> Optional[str]:
         """Guess entity name from changed files."""
         try:
             if not commit.parents:
                 return None
 
-            diffs = commit.parents[0].diff(commit)
-            for diff in diffs:
-                if diff.a_path and ".sql" in diff.a_path:
+            paths = commit.paths
+            if paths is None:
+                git_commit = repo.commit(commit.hexsha)
+                paths = [diff.a_path for diff in git_commit.parents[0].diff(git_commit)]
+
+            for changed in paths:
+                if changed and ".sql" in changed:
                     # Extract filename without extension
-                    path = Path(diff.a_path)
-                    return path.stem
+                    return Path(changed).stem
         except Exception:
             pass
         return None
-
-    def _extract_tags(self, message: str) -> list[str]:
-        """Extract tags from commit message."""
-        tags = []
-
-        # Common tags
-        tag_patterns = [
-            (r"JIRA-\d+", "jira"),
-            (r"#\d+", "github-issue"),
-            (r"\bbreaking\b", "breaking-change"),
-            (r"\bfeat(?:ure)?\b", "feature"),
-            (r"\bfix\b", "bugfix"),
-            (r"\brefactor\b", "refactor"),
-            (r"\btest\b", "test"),
-            (r"\bdocs?\b", "documentation"),
-        ]
-
-        for pattern, tag in tag_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                tags.append(tag)
-
-        return tags
@@ -0,0 +1,141 @@
+"""Incremental reader for large dbt manifest.json files.
+
+Walks the top-level object of the manifest and decodes the entries of
+``nodes`` one at a time, so memory stays proportional to the largest single
+node rather than the whole manifest. Other top-level sections (``macros``,
+``sources``, ``parent_map``...) are skipped without being decoded.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+_WHITESPACE = re.compile(r"\s*")
+# A complete string, a lone quote (string cut off at the buffer end), or a bracket
+_SKIP_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|"|[\[\]{}]')
+
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Buffered cursor over a JSON text stream."""
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, dropping consumed input. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the given structural character."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid manifest JSON: expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode one complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value is cut off at the buffer end
+                if not self.fill():
+                    raise
+                continue
+            # A number at the buffer end may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """Skip one JSON value without building it."""
+        if self.peek() not in "{[":
+            self.decode()
+            return
+
+        depth = 0
+        while True:
+            match = _SKIP_TOKEN.search(self.buf, self.pos)
+            if match is None or match.group() == '"':
+                # Unterminated string or no bracket in the rest of the buffer
+                if match is not None:
+                    self.pos = match.start()
+                else:
+                    self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("Invalid manifest JSON: unexpected end of file")
+                continue
+
+            self.pos = match.end()
+            token = match.group()
+            if token in "{[":
+                depth += 1
+            elif token in "}]":
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _iter_object(reader: _Reader) -> Iterator[str]:
+    """Yield keys of a JSON object; the caller must consume each value."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+
+    while True:
+        key = reader.decode()
+        reader.expect(":")
+        yield key
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Invalid manifest JSON: unexpected {separator!r}")
+
+
+def iter_manifest_nodes(
+    manifest_path: Path,
+    chunk_size: int = 1 << 20,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield ``(node_id, node)`` for every entry of the manifest's ``nodes``."""
+    with open(manifest_path, encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+
+        for section in _iter_object(reader):
+            if section != "nodes":
+                reader.skip()
+                continue
+
+            for node_id in _iter_object(reader):
+                yield node_id, reader.decode()
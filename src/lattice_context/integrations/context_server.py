@@ -167,9 +167,10 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Initialize context provider
+    # Initialize context provider. Handlers that query it are plain functions,
+    # which FastAPI runs on its thread pool, each thread with its own reader
     try:
-        provider = CopilotContextProvider(project_root)
+        provider = CopilotContextProvider(project_root, pooled=True)
     except FileNotFoundError as e:
         print(f"Warning: {e}")
         print("Server will start but return empty context until indexed.")
@@ -207,7 +208,7 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
         }
 
     @app.post("/v1/context", response_model=UniversalContextResponse)
-    async def get_universal_context(request: UniversalContextRequest):
+    def get_universal_context(request: UniversalContextRequest):
         """Universal context endpoint for all tools.
 
         Args:
@@ -221,7 +222,7 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
         if not provider:
             raise HTTPException(
                 status_code=503,
-                detail="Lattice not indexed. Run 'lattice init && lattice index' first.',
+                detail="Lattice not indexed. Run 'lattice init && lattice index' first.",
             )
 
         # Get context from provider - always use search for consistency
@@ -268,7 +269,7 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
         )
 
     @app.post("/v1/context/cursor")
-    async def get_cursor_context(query: str, max_results: int = 5):
+    def get_cursor_context(query: str, max_results: int = 5):
         """Cursor-specific context endpoint.
 
         Shortcut for Cursor integration.
@@ -279,10 +280,10 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
             format=FormatType.MARKDOWN,
             max_results=max_results
         )
-        return await get_universal_context(request)
+        return get_universal_context(request)
 
     @app.post("/v1/context/windsurf")
-    async def get_windsurf_context(query: str, max_results: int = 5):
+    def get_windsurf_context(query: str, max_results: int = 5):
         """Windsurf-specific context endpoint.
 
         Shortcut for Windsurf integration.
@@ -293,10 +294,10 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
             format=FormatType.MARKDOWN,
             max_results=max_results
         )
-        return await get_universal_context(request)
+        return get_universal_context(request)
 
     @app.post("/v1/context/vscode")
-    async def get_vscode_context(query: str, max_results: int = 5):
+    def get_vscode_context(query: str, max_results: int = 5):
         """VS Code-specific context endpoint.
 
         Shortcut for VS Code extensions.
@@ -307,7 +308,7 @@ def create_universal_context_server(project_root: Path = Path(".")) -> FastAPI:
             format=FormatType.MARKDOWN,
             max_results=max_results
         )
-        return await get_universal_context(request)
+        return get_universal_context(request)
 
     @app.get("/health")
     async def health_check():
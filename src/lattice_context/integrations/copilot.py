@@ -7,19 +7,21 @@ to improve code suggestions with team conventions and decisions.
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
+from lattice_context.core.types import Decision
 from lattice_context.storage.database import Database
 
 
 class CopilotContextProvider:
     """Provides Lattice context to GitHub Copilot."""
 
-    def __init__(self, project_root: Path = Path(".")):
+    def __init__(self, project_root: Path = Path("."), pooled: bool = False):
         """Initialize context provider.
 
         Args:
             project_root: Root directory of the project (contains .lattice/)
+            pooled: Use per-thread database connections (for servers)
         """
         self.project_root = project_root
         self.lattice_dir = project_root / ".lattice"
@@ -31,7 +33,7 @@ class CopilotContextProvider:
                 "Run 'lattice init && lattice index' first."
             )
 
-        self.db = Database(self.db_path)
+        self.db = Database(self.db_path, pooled=pooled)
 
     def get_context_for_query(self, query: str, max_results: int = 5) -> str:
         """Get relevant context for a Copilot query.
@@ -103,17 +105,11 @@ class CopilotContextProvider:
         Returns:
             Dictionary with all context information
         """
-        decisions = [
-            d
-            for d in self.db.list_decisions(limit=1000)
-            if entity_name.lower() in d.entity.lower()
-        ]
-
-        corrections = [
-            c
-            for c in self.db.get_corrections()
-            if entity_name.lower() in c.entity.lower()
-        ]
+        # Entities whose name contains entity_name, filtered in SQL
+        decisions, _ = self.db.query_decisions(entity=entity_name, limit=1000)
+
+        # Corrections naming the entity, or mentioning it in their text
+        corrections = self.db.search_corrections(entity_name, limit=1000)
 
         return {
             "entity": entity_name,
@@ -147,6 +143,15 @@ class CopilotContextProvider:
             ],
         }
 
+    def _iter_decisions(self, page_size: int = 1000) -> Iterator[Decision]:
+        """Every decision, newest first, read one keyset page at a time."""
+        cursor = None
+        while True:
+            page, cursor = self.db.query_decisions(cursor=cursor, limit=page_size)
+            yield from page
+            if cursor is None:
+                return
+
     def format_for_copilot_chat(self, query: str) -> str:
         """Format context for Copilot Chat.
 
@@ -184,7 +189,7 @@ class CopilotContextProvider:
                     "author": d.author,
                     "timestamp": d.timestamp.isoformat(),
                 }
-                for d in self.db.list_decisions(limit=10000)
+                for d in self._iter_decisions()
             ],
             "conventions": [
                 {
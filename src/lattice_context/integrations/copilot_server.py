@@ -58,9 +58,10 @@ def create_copilot_server(project_root: Path = Path(".")) -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Initialize context provider
+    # Initialize context provider. Handlers that query it are plain functions,
+    # which FastAPI runs on its thread pool, each thread with its own reader
     try:
-        provider = CopilotContextProvider(project_root)
+        provider = CopilotContextProvider(project_root, pooled=True)
     except FileNotFoundError as e:
         print(f"Warning: {e}")
         print("Server will start but return empty context until indexed.")
@@ -89,7 +90,7 @@ def create_copilot_server(project_root: Path = Path(".")) -> FastAPI:
         }
 
     @app.post("/context", response_model=ContextResponse)
-    async def get_context(request: ContextRequest):
+    def get_context(request: ContextRequest):
         """Get context for a query.
 
         Args:
@@ -116,7 +117,7 @@ def create_copilot_server(project_root: Path = Path(".")) -> FastAPI:
         )
 
     @app.post("/context/file")
-    async def get_file_context(request: ContextRequest):
+    def get_file_context(request: ContextRequest):
         """Get context for a specific file.
 
         Args:
@@ -143,7 +144,7 @@ def create_copilot_server(project_root: Path = Path(".")) -> FastAPI:
         )
 
     @app.post("/context/entity")
-    async def get_entity_context(request: EntityContextRequest):
+    def get_entity_context(request: EntityContextRequest):
         """Get all context for an entity.
 
         Args:
@@ -163,7 +164,7 @@ def create_copilot_server(project_root: Path = Path(".")) -> FastAPI:
         return provider.get_context_for_entity(request.entity)
 
     @app.get("/context/all")
-    async def get_all_context():
+    def get_all_context():
         """Export all context.
 
         Returns:
@@ -180,7 +181,7 @@ def create_copilot_server(project_root: Path = Path(".")) -> FastAPI:
         return provider.export_all_context()
 
     @app.post("/context/chat")
-    async def get_chat_context(request: ContextRequest):
+    def get_chat_context(request: ContextRequest):
         """Get context formatted for Copilot Chat.
 
         Args:
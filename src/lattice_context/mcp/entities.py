@@ -0,0 +1,81 @@
+"""Recognise indexed entity names in free text."""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Sequence
+
+# Identifier-like words and single punctuation marks; whitespace separates tokens
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+# Trie node key holding the names that end at a node
+_NAMES = ""
+
+
+class EntityMatcher:
+    """Token trie over the names of indexed models and columns.
+
+    Finds every known name that appears as a whole word in a text in a
+    single pass over its tokens, however many names there are::
+
+        matcher = EntityMatcher(["fct_orders", "revenue_amount"], suffixes=["_amount"])
+        matcher.find("Fix revenue rounding in FCT_ORDERS")
+        # ['revenue_amount', 'fct_orders']
+
+    Matching is case-insensitive. Names made of several tokens, such as
+    ``analytics.fct_orders``, are walked token by token. A name ending in
+    one of ``suffixes`` can also be found by its stem ("revenue" for
+    "revenue_amount"), as long as the stem is longer than four characters
+    and not itself a known name.
+    """
+
+    MIN_STEM_LENGTH = 5
+
+    def __init__(self, names: Iterable[str], suffixes: Sequence[str] = ()):
+        # Lowercased key -> names it stands for; exact names win over stems
+        exact: dict[str, list[str]] = {}
+        stems: dict[str, list[str]] = {}
+        for name in dict.fromkeys(names):
+            key = name.lower()
+            exact.setdefault(key, []).append(name)
+            for suffix in suffixes:
+                stem = key[: -len(suffix)]
+                if key.endswith(suffix) and len(stem) >= self.MIN_STEM_LENGTH:
+                    stems.setdefault(stem, []).append(name)
+        for stem, matched in stems.items():
+            exact.setdefault(stem, matched)
+
+        self._root: dict[str, Any] = {}
+        for key, matched in exact.items():
+            tokens = _TOKEN.findall(key)
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_NAMES] = matched
+
+    def find(self, text: str) -> list[str]:
+        """Names found in ``text``, in order of appearance and without duplicates."""
+        tokens = _TOKEN.findall(text.lower())
+        root = self._root
+        found: dict[str, None] = {}
+
+        for start, token in enumerate(tokens):
+            node = root.get(token)
+            if node is None:
+                continue
+            # Most names are one token; only walk further for longer ones
+            position = start + 1
+            while True:
+                names = node.get(_NAMES)
+                if names:
+                    found.update(dict.fromkeys(names))
+                if position == len(tokens) or len(node) == (_NAMES in node):
+                    break
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                position += 1
+
+        return list(found)
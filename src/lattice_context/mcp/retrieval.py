@@ -1,88 +1,324 @@
 """Context retrieval engine with tiered approach and token budgeting."""
 
+import asyncio
+import functools
 import re
-from typing import Any
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Optional, TypeVar, Union
 
-from lattice_context.core.types import Convention, Correction, DataTool, Decision
+from lattice_context.core.config import TokenBudgets
+from lattice_context.core.types import Convention, Correction, DataTool, Decision, TierContent
+from lattice_context.mcp.entities import EntityMatcher
+from lattice_context.mcp.tokens import (
+    pack,
+    render_convention,
+    render_correction,
+    render_decision,
+    render_related,
+)
+from lattice_context.storage.async_database import AsyncDatabase
 from lattice_context.storage.database import Database
+from lattice_context.storage.vectors import VectorIndex
+
+T = TypeVar("T")
+
+# Names in quotes or backticks, taken as entities even if not indexed
+_QUOTED = re.compile(r'["`\'](\w+)["`\']')
 
 
 class ContextRetriever:
-    """Retrieve relevant context with tiered approach and token budgeting."""
+    """Retrieve relevant context with tiered approach and token budgeting.
+
+    The tiers are gathered concurrently only over a pooled database
+    (``Database(path, pooled=True)``); a non-pooled one runs each query
+    inline, so the tiers run one after another.
+    """
+
+    # Suffixes tried when a plain word might be part of a column name
+    ENTITY_SUFFIXES = ["_id", "_key", "_at", "_amount", "_date"]
 
-    def __init__(self, db: Database):
-        self.db = db
+    # Candidates fetched before packing each tier into its token budget
+    DECISIONS_PER_ENTITY = 10
+    RELATED_CANDIDATES = 20
+
+    # Cosine similarity below which an embedded decision is not related
+    SEMANTIC_MIN_SIMILARITY = 0.15
+
+    # Reciprocal rank fusion constant: how much a top rank counts over the next
+    RANK_FUSION_K = 60
+
+    def __init__(
+        self,
+        db: Union[Database, AsyncDatabase],
+        token_budgets: Optional[TokenBudgets] = None,
+        cache_size: int = 256,
+        cache_ttl: float = 300.0,
+        vectors: Optional[VectorIndex] = None,
+    ):
+        self.db = db if isinstance(db, AsyncDatabase) else AsyncDatabase(db)
+        self.token_budgets = token_budgets or TokenBudgets()
+        # Embeddings of decisions, for finding related ones by wording
+        self.vectors = vectors
+
+        # (normalized task, max_tokens) -> (stored at, response), least recently used first
+        self._cache: OrderedDict[tuple[str, int], tuple[float, dict[str, Any]]] = OrderedDict()
+        self._cache_generation: Optional[int] = None
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Lowercased entity name -> stored name, refreshed after each index run
+        self._entity_matcher: Optional[EntityMatcher] = None
+        self._entity_matcher_indexed_at: Optional[datetime] = None
 
     async def get_context(
         self,
         task: str,
         max_tokens: int = 8000,
     ) -> dict[str, Any]:
-        """Get context for a task using tiered retrieval."""
+        """Get context for a task, reusing a recent response for the same task.
+
+        Cached responses are dropped once they are older than ``cache_ttl``
+        seconds, or when the index generation changes (re-index or new
+        correction).
+        """
+        generation = await self.db.index_generation()
+        if generation != self._cache_generation:
+            self._cache.clear()
+            self._cache_generation = generation
+
+        key = (" ".join(task.split()), max_tokens)
+        entry = self._cache.get(key)
+        if entry is not None:
+            stored_at, response = entry
+            if time.monotonic() - stored_at <= self.cache_ttl:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return {**response, "metadata": {**response["metadata"], "cached": True}}
+            del self._cache[key]
+
+        self.cache_misses += 1
+        response = await self._retrieve(task, max_tokens)
+
+        if self.cache_size > 0:
+            self._cache[key] = (time.monotonic(), response)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return {**response, "metadata": {**response["metadata"], "cached": False}}
+
+    def cache_stats(self) -> dict[str, int]:
+        """Hit and miss counts of the context cache, for sizing it."""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+        }
+
+    async def _retrieve(self, task: str, max_tokens: int) -> dict[str, Any]:
+        """Get context for a task using tiered retrieval.
+
+        Each tier is a few batched queries, and the tiers run concurrently.
+        Ranked results are then packed into the tier token budgets, scaled
+        down to fit ``max_tokens``. Per-tier latency is reported under
+        ``metadata``.
+        """
+        start = time.perf_counter()
 
         # Extract entities mentioned in the task
-        entities = self._extract_entities(task)
+        entities = await self._extract_entities(task)
 
-        # Tier 1: Immediate - Directly mentioned entities
-        immediate_decisions = []
-        for entity in entities:
-            decisions = self.db.get_decisions_for_entity(entity, limit=5)
-            immediate_decisions.extend(decisions)
+        (
+            (immediate_decisions, immediate_ms),
+            ((related, entity_matches), related_ms),
+            (corrections, corrections_ms),
+            (conventions, conventions_ms),
+        ) = await asyncio.gather(
+            # Tier 1: Immediate - Directly mentioned entities
+            self._timed(
+                self.db.get_decisions_for_entities(entities, limit=self.DECISIONS_PER_ENTITY, ranked=True)
+            ),
+            # Tier 2: Related - Search using the first entity, and the
+            # whole task by similarity
+            self._timed(self._related(task, entities)),
+            # Corrections (highest priority) for any entity, plus global ones
+            self._timed(self.db.get_corrections_for_entities(entities)),
+            # Tier 3: Global - Get conventions
+            self._timed(self.db.get_conventions(tool=DataTool.DBT)),
+        )
 
         # If no immediate results, try fuzzy search
         if not immediate_decisions and entities:
-            for entity in entities[:3]:  # Try first 3 entities
-                # Search decisions by partial match
-                search_results = self.db.search_decisions(entity, limit=3)
+            fallback_start = time.perf_counter()
+            # Tier 2 already searched for the first entity; its top full-text
+            # matches stand in for that search
+            searches = await asyncio.gather(
+                *(self.db.search_decisions(entity, limit=3) for entity in entities[1:3])
+            )
+            for search_results in [entity_matches[:3], *searches]:
                 immediate_decisions.extend(search_results)
+            immediate_ms += (time.perf_counter() - fallback_start) * 1000
+
+        # Exclude immediate decisions
+        immediate_ids = {d.id for d in immediate_decisions}
+        related_decisions = [d for d in related if d.id not in immediate_ids]
+
+        # Decisions come ranked from the database; rank the rest, then fill
+        # each tier up to its budget. Corrections share tier 1 with the
+        # immediate decisions and go first; budget a tier leaves unused
+        # carries over to the next one
+        tier1_budget, tier2_budget, tier3_budget = self._budgets(max_tokens)
+
+        corrections, correction_lines, correction_tokens = pack(
+            self._rank_corrections(corrections), tier1_budget, render_correction
+        )
+        immediate, immediate_lines, immediate_tokens = pack(
+            immediate_decisions, tier1_budget - correction_tokens, render_decision
+        )
+        tier1_tokens = correction_tokens + immediate_tokens
+
+        related, related_lines, tier2_tokens = pack(
+            related_decisions,
+            tier2_budget + tier1_budget - tier1_tokens,
+            render_related,
+        )
+        conventions, convention_lines, tier3_tokens = pack(
+            self._rank_conventions(conventions),
+            tier3_budget + tier1_budget + tier2_budget - tier1_tokens - tier2_tokens,
+            render_convention,
+        )
+
+        tiers = {
+            "tier1_immediate": TierContent(
+                content="\n".join(correction_lines + immediate_lines),
+                tokens=tier1_tokens,
+                sources=[c.id for c in corrections] + [d.id for d in immediate],
+            ),
+            "tier2_related": TierContent(
+                content="\n".join(related_lines),
+                tokens=tier2_tokens,
+                sources=[d.id for d in related],
+            ),
+            "tier3_global": TierContent(
+                content="\n".join(convention_lines),
+                tokens=tier3_tokens,
+                sources=[c.id for c in conventions],
+            ),
+        }
 
-        # Get corrections (highest priority)
-        corrections = []
-        for entity in entities:
-            entity_corrections = self.db.get_corrections(entity)
-            corrections.extend(entity_corrections)
-
-        # Get global corrections
-        global_corrections = self.db.get_corrections()
-        corrections.extend([c for c in global_corrections if c.scope.value == "global"])
-
-        # Deduplicate corrections
-        seen_ids = set()
-        unique_corrections = []
-        for corr in corrections:
-            if corr.id not in seen_ids:
-                unique_corrections.append(corr)
-                seen_ids.add(corr.id)
-
-        # Tier 2: Related - Search for related decisions
-        related_decisions = []
-        if entities:
-            # Use first entity as search query
-            search_query = entities[0]
-            related = self.db.search_decisions(search_query, limit=10)
-            # Exclude immediate decisions
-            immediate_ids = {d.id for d in immediate_decisions}
-            related_decisions = [d for d in related if d.id not in immediate_ids]
-
-        # Tier 3: Global - Get conventions
-        conventions = self.db.get_conventions(tool=DataTool.DBT)
-
-        # Rank and prioritize within token budget
         response = {
-            "immediate_decisions": self._rank_decisions(immediate_decisions[:5]),
-            "related_decisions": self._rank_decisions(related_decisions[:5]),
-            "corrections": self._rank_corrections(unique_corrections[:5]),
-            "conventions": self._rank_conventions(conventions[:5]),
+            "immediate_decisions": immediate,
+            "related_decisions": related,
+            "corrections": corrections,
+            "conventions": conventions,
+            "tiers": tiers,
+            "total_tokens": tier1_tokens + tier2_tokens + tier3_tokens,
+            "metadata": {
+                "entities": entities,
+                "latency_ms": {
+                    "tier1_immediate": round(immediate_ms, 2),
+                    "tier2_related": round(related_ms, 2),
+                    "tier3_global": round(conventions_ms, 2),
+                    "corrections": round(corrections_ms, 2),
+                    "total": round((time.perf_counter() - start) * 1000, 2),
+                },
+            },
         }
 
         return response
 
-    def _extract_entities(self, task: str) -> list[str]:
+    async def _related(self, task: str, entities: list[str]) -> tuple[list[Decision], list[Decision]]:
+        """Decisions related to the task, best first, and the full-text matches among them.
+
+        Full-text matches for the first entity are fused with the decisions
+        worded most like the task, when there is a vector index, by
+        reciprocal rank: a decision both searches find ranks highest. The
+        full-text matches alone are returned too, as only they name the entity.
+        """
+        lexical = (
+            await self.db.search_decisions(entities[0], limit=self.RELATED_CANDIDATES)
+            if entities
+            else []
+        )
+        if self.vectors is None:
+            return lexical, lexical
+
+        # Embedding the task and scoring the matrix is CPU-bound numpy work;
+        # run it off the event loop like the database calls
+        loop = asyncio.get_running_loop()
+        [hits] = await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.vectors.search,
+                [task],
+                k=self.RELATED_CANDIDATES,
+                min_similarity=self.SEMANTIC_MIN_SIMILARITY,
+            ),
+        )
+        if not hits:
+            return lexical, lexical
+        semantic = await self.db.get_decisions_by_ids(decision_id for decision_id, _ in hits)
+
+        scores: dict[str, float] = {}
+        decisions: dict[str, Decision] = {}
+        for ranking in (lexical, semantic):
+            for rank, decision in enumerate(ranking):
+                scores[decision.id] = scores.get(decision.id, 0.0) + 1.0 / (self.RANK_FUSION_K + rank)
+                decisions[decision.id] = decision
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        return [decisions[decision_id] for decision_id in ranked[: self.RELATED_CANDIDATES]], lexical
+
+    def _budgets(self, max_tokens: int) -> tuple[int, int, int]:
+        """Tier budgets, scaled down proportionally if they exceed ``max_tokens``."""
+        budgets = (
+            self.token_budgets.tier1_immediate,
+            self.token_budgets.tier2_related,
+            self.token_budgets.tier3_global,
+        )
+        total = sum(budgets)
+        if total <= max_tokens:
+            return budgets
+        scale = max(max_tokens, 0) / total
+        tier1, tier2, tier3 = (int(budget * scale) for budget in budgets)
+        return tier1, tier2, tier3
+
+    @staticmethod
+    async def _timed(awaitable: Awaitable[T]) -> tuple[T, float]:
+        """Await a query, returning its result and elapsed milliseconds."""
+        start = time.perf_counter()
+        result = await awaitable
+        return result, (time.perf_counter() - start) * 1000
+
+    async def _known_entities(self) -> Optional[EntityMatcher]:
+        """Matcher for indexed entity names, rebuilt whenever the project is re-indexed."""
+        indexed_at = await self.db.last_indexed_at()
+        if indexed_at != self._entity_matcher_indexed_at:
+            names = await self.db.get_entity_names()
+            self._entity_matcher = EntityMatcher(names, self.ENTITY_SUFFIXES) if names else None
+            self._entity_matcher_indexed_at = indexed_at
+        return self._entity_matcher
+
+    async def _extract_entities(self, task: str) -> list[str]:
         """Extract entity names from task description."""
+        matcher = await self._known_entities()
+        if matcher is None:
+            # Nothing indexed from the manifest yet - fall back to guessing
+            return self._guess_entities(task)
+
+        # Quoted entities are explicit even if not indexed; other words must
+        # name a real model or column ("revenue" finds "revenue_amount")
+        quoted = _QUOTED.findall(task)
+        return self._dedupe(quoted + matcher.find(task))
+
+    def _guess_entities(self, task: str) -> list[str]:
+        """Guess entity names from naming patterns when no entities are indexed."""
         entities = []
 
         # Look for quoted entities
-        quoted = re.findall(r'["`\'](\w+)["`\']', task)
+        quoted = _QUOTED.findall(task)
         entities.extend(quoted)
 
         # Look for common dbt patterns (exact matches)
@@ -118,34 +354,21 @@ class ContextRetriever:
                 entities.append(word)
             elif len(word) > 4:  # Could be a partial name
                 # Add with suffix patterns for fuzzy matching
-                potential_entities = [
-                    f"{word}_id",
-                    f"{word}_key",
-                    f"{word}_at",
-                    f"{word}_amount",
-                    f"{word}_date",
-                ]
-                entities.extend(potential_entities)
-
-        # Deduplicate while preserving order
+                entities.extend(f"{word}{suffix}" for suffix in self.ENTITY_SUFFIXES)
+
+        return self._dedupe(entities)
+
+    @staticmethod
+    def _dedupe(entities: list[str]) -> list[str]:
+        """Deduplicate while preserving order."""
         seen = set()
         unique_entities = []
         for entity in entities:
             if entity not in seen:
                 unique_entities.append(entity)
                 seen.add(entity)
-
         return unique_entities
 
-    def _rank_decisions(self, decisions: list[Decision]) -> list[Decision]:
-        """Rank decisions by relevance."""
-        # Sort by confidence and recency
-        return sorted(
-            decisions,
-            key=lambda d: (d.confidence, d.timestamp),
-            reverse=True
-        )
-
     def _rank_corrections(self, corrections: list[Correction]) -> list[Correction]:
         """Rank corrections by priority."""
         priority_order = {"high": 3, "medium": 2, "low": 1}
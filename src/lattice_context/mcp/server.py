@@ -1,5 +1,6 @@
 """MCP server for serving context to AI assistants."""
 
+import asyncio
 import hashlib
 from datetime import datetime
 from pathlib import Path
@@ -9,13 +10,22 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from lattice_context.core.config import LatticeConfig, RetrievalConfig
 from lattice_context.core.types import (
     Correction,
     CorrectionPriority,
     CorrectionScope,
 )
 from lattice_context.mcp.retrieval import ContextRetriever
+from lattice_context.mcp.tokens import (
+    render_convention,
+    render_correction,
+    render_decision,
+    render_related,
+)
+from lattice_context.storage.async_database import AsyncDatabase
 from lattice_context.storage.database import Database
+from lattice_context.storage.vectors import VectorIndex
 
 
 class LatticeServer:
@@ -24,8 +34,15 @@ class LatticeServer:
     def __init__(self, project_path: Path):
         self.project_path = project_path
         self.lattice_dir = project_path / ".lattice"
-        self.db = Database(self.lattice_dir / "index.db")
-        self.retriever = ContextRetriever(self.db)
+        # Queries run off the event loop, so tool calls don't wait on each other
+        self.db = AsyncDatabase(Database(self.lattice_dir / "index.db", pooled=True))
+        try:
+            retrieval = LatticeConfig.load(project_path).retrieval
+        except Exception:
+            # Missing or invalid config - use the defaults
+            retrieval = RetrievalConfig()
+        vectors = VectorIndex.open(self.lattice_dir) if retrieval.semantic_search else None
+        self.retriever = ContextRetriever(self.db, retrieval.token_budgets, vectors=vectors)
         self.server = Server("lattice-context")
         self._setup_handlers()
 
@@ -132,7 +149,7 @@ class LatticeServer:
             priority=CorrectionPriority.HIGH,
         )
 
-        self.db.add_correction(correction)
+        await self.db.add_correction(correction)
 
         return [TextContent(
             type="text",
@@ -147,8 +164,10 @@ class LatticeServer:
             return [TextContent(type="text", text="Error: entity parameter is required")]
 
         # Get decisions for this entity
-        decisions = self.db.get_decisions_for_entity(entity)
-        corrections = self.db.get_corrections(entity)
+        decisions, corrections = await asyncio.gather(
+            self.db.get_decisions_for_entity(entity),
+            self.db.get_corrections(entity),
+        )
 
         if not decisions and not corrections:
             return [TextContent(
@@ -182,42 +201,34 @@ class LatticeServer:
         """Format context response for AI consumption."""
         sections = []
 
+        # Items were already packed into the tier token budgets by the retriever
+
         # High-priority corrections first
         corrections = response.get("corrections", [])
         if corrections:
             sections.append("## ⚠️ Important Notes\n")
-            for corr in corrections[:3]:  # Max 3
-                sections.append(f"- **{corr.entity}**: {corr.correction}")
-                if corr.context:
-                    sections.append(f"  - {corr.context}")
+            sections.extend(render_correction(corr) for corr in corrections)
             sections.append("")
 
         # Relevant decisions
         decisions = response.get("immediate_decisions", [])
         if decisions:
             sections.append("## Relevant Decisions\n")
-            for dec in decisions[:5]:  # Max 5
-                sections.append(f"- **{dec.entity}** ({dec.change_type.value}): {dec.why}")
-                if dec.context:
-                    sections.append(f"  - Context: {dec.context}")
+            sections.extend(render_decision(dec) for dec in decisions)
             sections.append("")
 
         # Conventions
         conventions = response.get("conventions", [])
         if conventions:
             sections.append("## Conventions to Follow\n")
-            for conv in conventions[:3]:  # Max 3
-                pattern_desc = f"{conv.pattern} for {', '.join(e.value for e in conv.applies_to)}"
-                sections.append(f"- **{pattern_desc}**")
-                sections.append(f"  - Examples: {', '.join(conv.examples[:3])}")
+            sections.extend(render_convention(conv) for conv in conventions)
             sections.append("")
 
         # Related context
         related_decisions = response.get("related_decisions", [])
         if related_decisions:
             sections.append("## Related Context\n")
-            for dec in related_decisions[:3]:  # Max 3
-                sections.append(f"- {dec.entity}: {dec.why}")
+            sections.extend(render_related(dec) for dec in related_decisions)
             sections.append("")
 
         if not sections:
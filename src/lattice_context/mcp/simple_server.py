@@ -3,6 +3,7 @@
 This is a minimal implementation for testing. For production, install the mcp package.
 """
 
+import asyncio
 import hashlib
 import json
 import sys
@@ -10,9 +11,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from lattice_context.core.config import LatticeConfig, RetrievalConfig
 from lattice_context.core.types import Correction, CorrectionPriority, CorrectionScope
 from lattice_context.mcp.retrieval import ContextRetriever
+from lattice_context.storage.async_database import AsyncDatabase
 from lattice_context.storage.database import Database
+from lattice_context.storage.vectors import VectorIndex
 
 
 class SimpleMCPServer:
@@ -21,8 +25,15 @@ class SimpleMCPServer:
     def __init__(self, project_path: Path):
         self.project_path = project_path
         self.lattice_dir = project_path / ".lattice"
-        self.db = Database(self.lattice_dir / "index.db")
-        self.retriever = ContextRetriever(self.db)
+        # Queries run off the event loop, so tool calls don't wait on each other
+        self.db = AsyncDatabase(Database(self.lattice_dir / "index.db", pooled=True))
+        try:
+            retrieval = LatticeConfig.load(project_path).retrieval
+        except Exception:
+            # Missing or invalid config - use the defaults
+            retrieval = RetrievalConfig()
+        vectors = VectorIndex.open(self.lattice_dir) if retrieval.semantic_search else None
+        self.retriever = ContextRetriever(self.db, retrieval.token_budgets, vectors=vectors)
 
     async def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
         """Handle a JSON-RPC request."""
@@ -146,14 +157,16 @@ class SimpleMCPServer:
             priority=CorrectionPriority.HIGH,
         )
 
-        self.db.add_correction(correction)
+        await self.db.add_correction(correction)
         return f"✓ Correction added for '{entity}'"
 
     async def _handle_explain(self, arguments: dict[str, Any]) -> str:
         """Handle explain tool call."""
         entity = arguments.get("entity", "")
-        decisions = self.db.get_decisions_for_entity(entity)
-        corrections = self.db.get_corrections(entity)
+        decisions, corrections = await asyncio.gather(
+            self.db.get_decisions_for_entity(entity),
+            self.db.get_corrections(entity),
+        )
 
         if not decisions and not corrections:
             return f"No context found for '{entity}'"
@@ -179,19 +192,19 @@ class SimpleMCPServer:
         corrections = response.get("corrections", [])
         if corrections:
             sections.append("## ⚠️ Important Notes\n")
-            for corr in corrections[:3]:
+            for corr in corrections:
                 sections.append(f"- **{corr.entity}**: {corr.correction}")
 
         decisions = response.get("immediate_decisions", [])
         if decisions:
             sections.append("\n## Relevant Decisions\n")
-            for dec in decisions[:5]:
+            for dec in decisions:
                 sections.append(f"- **{dec.entity}**: {dec.why}")
 
         conventions = response.get("conventions", [])
         if conventions:
             sections.append("\n## Conventions\n")
-            for conv in conventions[:3]:
+            for conv in conventions:
                 sections.append(f"- {conv.pattern}: {', '.join(conv.examples[:3])}")
 
         if not sections:
@@ -200,27 +213,46 @@ class SimpleMCPServer:
         return "\n".join(sections)
 
     async def run(self) -> None:
-        """Run the server."""
+        """Run the server.
+
+        Each request is handled in its own task, so a slow tool call doesn't
+        hold up the ones behind it. Responses carry the request id and may be
+        written out of order.
+        """
+        loop = asyncio.get_running_loop()
+        pending: set[asyncio.Task] = set()
+
         while True:
-            try:
-                line = sys.stdin.readline()
-                if not line:
-                    break
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
 
+            try:
                 request = json.loads(line)
-                response = await self.handle_request(request)
-                print(json.dumps(response), flush=True)
-
             except json.JSONDecodeError:
                 continue
-            except Exception as e:
-                print(json.dumps({
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32603,
-                        "message": str(e)
-                    }
-                }), flush=True)
+
+            task = asyncio.create_task(self._respond(request))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending)
+        self.db.close()
+
+    async def _respond(self, request: dict[str, Any]) -> None:
+        """Handle one request and write its response."""
+        try:
+            response = await self.handle_request(request)
+            print(json.dumps(response), flush=True)
+        except Exception as e:
+            print(json.dumps({
+                "jsonrpc": "2.0",
+                "error": {
+                    "code": -32603,
+                    "message": str(e)
+                }
+            }), flush=True)
 
 
 async def serve_simple(project_path: Path) -> None:
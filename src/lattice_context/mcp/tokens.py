@@ -0,0 +1,75 @@
+"""Token estimation and budget packing for retrieved context."""
+
+from __future__ import annotations
+
+from typing import Callable, Sequence, TypeVar
+
+from lattice_context.core.types import Convention, Correction, Decision
+
+T = TypeVar("T")
+
+# Average characters per token for English prose and snake_case identifiers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate how many tokens ``text`` takes up in a prompt."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def render_correction(correction: Correction) -> str:
+    """Render a correction as it appears in context."""
+    text = f"- **{correction.entity}**: {correction.correction}"
+    if correction.context:
+        text += f"\n  - {correction.context}"
+    return text
+
+
+def render_decision(decision: Decision) -> str:
+    """Render a directly relevant decision as it appears in context."""
+    text = f"- **{decision.entity}** ({decision.change_type.value}): {decision.why}"
+    if decision.context:
+        text += f"\n  - Context: {decision.context}"
+    return text
+
+
+def render_related(decision: Decision) -> str:
+    """Render a related decision as it appears in context."""
+    return f"- {decision.entity}: {decision.why}"
+
+
+def render_convention(convention: Convention) -> str:
+    """Render a convention as it appears in context."""
+    applies_to = ", ".join(e.value for e in convention.applies_to)
+    return (
+        f"- **{convention.pattern} for {applies_to}**\n"
+        f"  - Examples: {', '.join(convention.examples[:3])}"
+    )
+
+
+def pack(
+    items: Sequence[T],
+    budget: int,
+    render: Callable[[T], str],
+) -> tuple[list[T], list[str], int]:
+    """Take items in ranked order while they fit in ``budget`` tokens.
+
+    An item too large for what is left is skipped, so smaller items further
+    down can still use the space. Returns the packed items, their rendered
+    text and the tokens used.
+    """
+    packed: list[T] = []
+    lines: list[str] = []
+    used = 0
+
+    for item in items:
+        text = render(item)
+        # One more for the newline that separates items
+        cost = estimate_tokens(text) + 1
+        if used + cost > budget:
+            continue
+        packed.append(item)
+        lines.append(text)
+        used += cost
+
+    return packed, lines, used
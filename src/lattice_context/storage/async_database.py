@@ -0,0 +1,59 @@
+"""Async facade over the SQLite database for the servers."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine
+
+from lattice_context.storage.database import Database
+
+
+class AsyncDatabase:
+    """Awaitable access to a :class:`Database`.
+
+    Every public ``Database`` method is available as a coroutine function
+    with the same signature::
+
+        db = AsyncDatabase(Database(path, pooled=True))
+        decisions = await db.search_decisions("revenue")
+
+    Calls on a pooled database run on a dedicated thread pool, so a slow
+    query never blocks the event loop and concurrent calls read through
+    separate connections. A non-pooled database is tied to the thread that
+    opened it, so its calls run inline.
+    """
+
+    def __init__(self, db: Database, max_workers: int = 4):
+        self.db = db
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lattice-db")
+            if db.pooled
+            else None
+        )
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        method = getattr(self.db, name)
+        if not callable(method):
+            raise AttributeError(f"{name} is not a database method")
+
+        @functools.wraps(method)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            if self._executor is None:
+                return method(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+        # Cache so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    def close(self) -> None:
+        """Wait for running queries, then close the database."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self.db.close()
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Optional
-
+import base64
+import heapq
+import json
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, TypeVar, Union
+
+from pydantic import BaseModel
 
 from lattice_context.core.types import (
     ChangeType,
@@ -20,28 +27,227 @@ from lattice_context.core.types import (
     DecisionSource,
     EntityType,
 )
+from lattice_context.storage.graph import related_entities
+
+M = TypeVar("M", bound=BaseModel)
 
 # Register datetime adapters for Python 3.12+ compatibility
 sqlite3.register_adapter(datetime, lambda dt: dt.isoformat())
 sqlite3.register_converter("timestamp", lambda b: datetime.fromisoformat(b.decode()))
 
+# Max bound parameters per statement when a query takes a list of ids or
+# names; longer lists are split into chunks of this size
+_SQL_CHUNK_SIZE = 500
+
+# bm25() weights of the decisions_fts columns (entity, why, context, tags);
+# a hit on the entity name or a tag counts for more than one in the prose
+_FTS_WEIGHTS = "10.0, 2.0, 1.0, 5.0"
+
+# How much a decision should be trusted, from about 0 to 2.5: its confidence,
+# plus up to 1 for recency (halving after 30 days), plus 0.1 per net team
+# vote, capped at 0.5 either way. Expects decisions as d, decision_metadata as m.
+_QUALITY_SQL = """(
+    d.confidence
+    + 1.0 / (1.0 + MAX(julianday('now') - julianday(d.timestamp), 0) / 30.0)
+    + 0.1 * MIN(MAX(COALESCE(m.vote_score, 0), -5), 5)
+)"""
+
+# bm25() weights of the corrections_fts columns (entity, correction, context)
+# and the conventions_fts columns (pattern, examples, applies_to)
+_CORRECTION_FTS_WEIGHTS = "10.0, 2.0, 1.0"
+_CONVENTION_FTS_WEIGHTS = "5.0, 2.0, 1.0"
+
+# Full-text indexes: FTS table -> (content table, indexed columns)
+_FTS_INDEXES = {
+    "decisions_fts": ("decisions", ("entity", "why", "context", "tags")),
+    "corrections_fts": ("corrections", ("entity", "correction", "context")),
+    "conventions_fts": ("conventions", ("pattern", "examples", "applies_to")),
+}
+
+# Corrections outrank decisions and conventions of equal relevance in
+# search_all, by priority. bm25 scores are negative, so these scale them up.
+_CORRECTION_BOOST_SQL = "CASE c.priority WHEN 'high' THEN 3.0 WHEN 'medium' THEN 2.0 ELSE 1.5 END"
+
+_FTS_TERM = re.compile(r"\w+")
+
+# Enum members by stored value, for hydrating rows without calling the enum
+_ENTITY_TYPES = {member.value: member for member in EntityType}
+_CHANGE_TYPES = {member.value: member for member in ChangeType}
+_DECISION_SOURCES = {member.value: member for member in DecisionSource}
+_DATA_TOOLS = {member.value: member for member in DataTool}
+_CONVENTION_TYPES = {member.value: member for member in ConventionType}
+_CORRECTION_SCOPES = {member.value: member for member in CorrectionScope}
+_CORRECTION_PRIORITIES = {member.value: member for member in CorrectionPriority}
+
+
+def _trusted(model: type[M]) -> Callable[..., M]:
+    """A constructor for ``model`` taking every field's value as is.
+
+    It does what ``model_construct`` does when given every field, without
+    that method's per-call pass over the fields for defaults and aliases,
+    which costs more than reading the row. The values are not validated.
+    """
+    fields = frozenset(model.model_fields)
+    new = object.__new__
+    setattr_ = object.__setattr__
+
+    def construct(**values: Any) -> M:
+        instance = new(model)
+        setattr_(instance, "__dict__", values)
+        setattr_(instance, "__pydantic_fields_set__", set(fields))
+        setattr_(instance, "__pydantic_extra__", None)
+        setattr_(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+_new_decision = _trusted(Decision)
+_new_convention = _trusted(Convention)
+_new_correction = _trusted(Correction)
+
+
+def _decision_from_row(row: sqlite3.Row) -> Decision:
+    """Build a Decision from a ``decisions`` row.
+
+    Rows are only ever written from validated models, so the row helpers
+    build models with :func:`_trusted` constructors instead of validating
+    every field again, and unpack columns by position (the table's column
+    order) rather than by name. Extra columns selected after the table's
+    own are ignored.
+    """
+    (id_, entity, entity_type, change_type, why, context, source, source_ref,
+     author, timestamp, confidence, tags, tool) = row[:13]
+    return _new_decision(
+        id=id_,
+        entity=entity,
+        entity_type=_ENTITY_TYPES[entity_type],
+        change_type=_CHANGE_TYPES[change_type],
+        why=why,
+        context=context or "",
+        source=_DECISION_SOURCES[source],
+        source_ref=source_ref,
+        author=author,
+        timestamp=datetime.fromisoformat(timestamp),
+        confidence=confidence,
+        tags=tags.split(",") if tags else [],
+        tool=_DATA_TOOLS[tool],
+    )
+
+
+def _convention_from_row(row: sqlite3.Row) -> Convention:
+    """Build a Convention from a ``conventions`` row."""
+    (id_, type_, pattern, applies_to, examples, frequency, confidence,
+     detected_at, tool) = row[:9]
+    return _new_convention(
+        id=id_,
+        type=_CONVENTION_TYPES[type_],
+        pattern=pattern,
+        applies_to=[_ENTITY_TYPES[e] for e in applies_to.split(",")],
+        examples=examples.split(","),
+        frequency=frequency,
+        confidence=confidence,
+        detected_at=datetime.fromisoformat(detected_at),
+        tool=_DATA_TOOLS[tool],
+    )
+
+
+def _correction_from_row(row: sqlite3.Row) -> Correction:
+    """Build a Correction from a ``corrections`` row."""
+    (id_, entity, entity_type, correction, context, added_by, added_at,
+     scope, priority) = row[:9]
+    return _new_correction(
+        id=id_,
+        entity=entity,
+        entity_type=_ENTITY_TYPES[entity_type] if entity_type else None,
+        correction=correction,
+        context=context or "",
+        added_by=added_by,
+        added_at=datetime.fromisoformat(added_at),
+        scope=_CORRECTION_SCOPES[scope],
+        priority=_CORRECTION_PRIORITIES[priority],
+    )
+
+
+class SearchHit(NamedTuple):
+    """One result of :meth:`Database.search_all`."""
+    kind: str  # "decision", "correction" or "convention"
+    score: float  # Lower is better, as with bm25()
+    item: Union[Decision, Correction, Convention]
+
 
 class Database:
-    """SQLite database for storing Lattice data."""
+    """SQLite database for storing Lattice data.
+
+    By default a single connection is used, from the thread that opened it.
+    With ``pooled=True`` (for servers sharing one instance across threads)
+    each thread reads through its own connection, while writes go through
+    one shared writer connection, serialized by a lock. In WAL mode readers
+    never wait for the writer.
+    """
 
-    def __init__(self, db_path: Path):
+    # Seconds to wait on a locked database (e.g. another process indexing)
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, db_path: Path, pooled: bool = False):
         self.db_path = db_path
+        self.pooled = pooled
         self.conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection to the database file."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.BUSY_TIMEOUT,
+            # Pooled connections are closed by close(), possibly from another thread
+            check_same_thread=not self.pooled,
+        )
+        conn.row_factory = sqlite3.Row
+        return conn
 
     def connect(self) -> sqlite3.Connection:
-        """Get database connection."""
+        """Get database connection (the writer connection in pooled mode)."""
         if self.conn is None:
-            self.conn = sqlite3.connect(str(self.db_path))
-            self.conn.row_factory = sqlite3.Row
-            # Enable WAL mode for better concurrency
-            self.conn.execute("PRAGMA journal_mode=WAL")
+            with self._write_lock:
+                if self.conn is None:
+                    conn = self._open()
+                    # Enable WAL mode for better concurrency
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    if self.pooled:
+                        # Durable at each checkpoint rather than each commit;
+                        # safe against corruption in WAL mode
+                        conn.execute("PRAGMA synchronous=NORMAL")
+                    self.conn = conn
         return self.conn
 
+    def _reader(self) -> sqlite3.Connection:
+        """Get the connection for reads on the calling thread."""
+        if not self.pooled:
+            return self.connect()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Make sure the file exists and is in WAL mode first
+            self.connect()
+            conn = self._open()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Yield the write connection inside a transaction."""
+        with self._write_lock:
+            conn = self.connect()
+            with conn:
+                yield conn
+
     def initialize(self) -> None:
         """Initialize database schema."""
         conn = self.connect()
@@ -56,9 +262,16 @@ class Database:
                 path TEXT,
                 metadata TEXT,
                 created_at TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP NOT NULL
+                updated_at TIMESTAMP NOT NULL,
+                parent TEXT,
+                node_id TEXT
             )
         """)
+        # Indexes created before entities were persisted lack the parent column
+        self._add_column_if_missing(conn, "entities", "parent", "TEXT")
+        # Entities are replaced by the manifest node they came from, as
+        # versioned models share a name; older rows have no node id
+        untracked_entities = self._add_column_if_missing(conn, "entities", "node_id", "TEXT")
 
         # Decisions table
         conn.execute("""
@@ -109,17 +322,23 @@ class Database:
             )
         """)
 
-        # Create FTS5 virtual tables for full-text search
-        conn.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS decisions_fts USING fts5(
-                entity, why, context, tags, content='decisions', content_rowid='rowid'
-            )
-        """)
+        # Full-text search over decisions, corrections and conventions
+        for name, (content, columns) in _FTS_INDEXES.items():
+            self._create_fts_index(conn, name, content, columns)
 
         # Create indexes
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_entity ON decisions(entity)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_tool ON decisions(tool)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions(timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(name)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_parent ON entities(parent)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_node ON entities(node_id)")
+        # Decisions are listed newest first, with id breaking timestamp ties,
+        # so each index ends in (timestamp, id) for keyset pagination
+        conn.execute("DROP INDEX IF EXISTS idx_decisions_entity")
+        conn.execute("DROP INDEX IF EXISTS idx_decisions_tool")
+        conn.execute("DROP INDEX IF EXISTS idx_decisions_timestamp")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_entity_time ON decisions(entity, timestamp, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_tool_time ON decisions(tool, timestamp, id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_time ON decisions(timestamp, id)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_conventions_tool ON conventions(tool)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_corrections_entity ON corrections(entity)")
 
@@ -132,6 +351,58 @@ class Database:
             )
         """)
 
+        # Content hashes of indexed manifest nodes, for incremental indexing
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS manifest_nodes (
+                node_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                hash TEXT NOT NULL
+            )
+        """)
+        if untracked_entities:
+            # Forget what was indexed so the next run extracts every model again
+            conn.execute("DELETE FROM entities WHERE tool = 'dbt'")
+            conn.execute("DELETE FROM manifest_nodes")
+            conn.execute("DELETE FROM metadata WHERE key = 'manifest_hash'")
+
+        # Decision count and latest decision per entity, kept up to date by
+        # add_decisions and delete_decisions for the entity catalog
+        stats_exist = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entity_stats'"
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entity_stats (
+                entity TEXT PRIMARY KEY,
+                entity_type TEXT NOT NULL,
+                decision_count INTEGER NOT NULL,
+                last_updated TIMESTAMP NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entity_stats_count ON entity_stats(decision_count, entity)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entity_stats_updated ON entity_stats(last_updated, entity)")
+        if not stats_exist:
+            # Backfill databases indexed before the catalog existed
+            self._refresh_entity_stats(conn)
+
+        # Related entities for the decision graph, rebuilt after each index run
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entity_graph (
+                entity TEXT NOT NULL,
+                related TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (entity, related)
+            )
+        """)
+
+        # Analyzed git commits; "[]" records a commit without decisions
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS git_commit_cache (
+                sha TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                decisions TEXT NOT NULL
+            )
+        """)
+
         # Team Workspace tables (v0.2.0)
         # Comments on decisions
         conn.execute("""
@@ -181,16 +452,74 @@ class Database:
 
         conn.commit()
 
+    @staticmethod
+    def _create_fts_index(
+        conn: sqlite3.Connection, name: str, content: str, columns: tuple[str, ...]
+    ) -> None:
+        """Create an external-content FTS5 table over ``content`` and its sync triggers.
+
+        Prefix indexes let partial names ("cust") match without scanning
+        every term; indexes from before they existed are rebuilt. Before the
+        triggers existed, replaced rows left stale entries behind, so indexes
+        without them are rebuilt too.
+        """
+        fts = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+        recreate = fts is not None and "prefix" not in fts[0]
+        if recreate:
+            conn.execute(f"DROP TABLE {name}")
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+                {", ".join(columns)}, content='{content}', content_rowid='rowid',
+                prefix='2 3 4'
+            )
+        """)
+
+        has_triggers = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f"{name}_insert",)
+        ).fetchone()
+        names = ", ".join(columns)
+        new = ", ".join(f"new.{column}" for column in columns)
+        old = ", ".join(f"old.{column}" for column in columns)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON {content} BEGIN
+                INSERT INTO {name} (rowid, {names}) VALUES (new.rowid, {new});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON {content} BEGIN
+                INSERT INTO {name} ({name}, rowid, {names}) VALUES ('delete', old.rowid, {old});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_update AFTER UPDATE ON {content} BEGIN
+                INSERT INTO {name} ({name}, rowid, {names}) VALUES ('delete', old.rowid, {old});
+                INSERT INTO {name} (rowid, {names}) VALUES (new.rowid, {new});
+            END
+        """)
+        if recreate or not has_triggers:
+            conn.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+    @staticmethod
+    def _add_column_if_missing(
+        conn: sqlite3.Connection, table: str, column: str, definition: str
+    ) -> bool:
+        """Add a column to an existing table (schema migration). Returns whether it was added."""
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column in columns:
+            return False
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+
     def is_indexed(self) -> bool:
         """Check if project has been indexed."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute("SELECT value FROM metadata WHERE key = 'last_indexed_at'")
         row = cursor.fetchone()
         return row is not None
 
     def last_indexed_at(self) -> Optional[datetime]:
         """Get last indexed timestamp."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute("SELECT value FROM metadata WHERE key = 'last_indexed_at'")
         row = cursor.fetchone()
         if row:
@@ -199,49 +528,226 @@ class Database:
 
     def set_last_indexed_at(self, timestamp: datetime) -> None:
         """Set last indexed timestamp."""
-        conn = self.connect()
+        with self._writer() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value, updated_at) VALUES (?, ?, ?)",
+                ("last_indexed_at", timestamp.isoformat(), datetime.now())
+            )
+            self._bump_generation(conn)
+
+    def index_generation(self) -> int:
+        """Counter that changes whenever indexed content or corrections change."""
+        conn = self._reader()
+        cursor = conn.execute("SELECT value FROM metadata WHERE key = 'index_generation'")
+        row = cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection) -> None:
+        """Advance the index generation, so readers drop cached context."""
         conn.execute(
-            "INSERT OR REPLACE INTO metadata (key, value, updated_at) VALUES (?, ?, ?)",
-            ("last_indexed_at", timestamp.isoformat(), datetime.now())
+            """
+            INSERT INTO metadata (key, value, updated_at) VALUES ('index_generation', '1', ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = CAST(value AS INTEGER) + 1,
+                updated_at = excluded.updated_at
+            """,
+            (datetime.now(),)
         )
-        conn.commit()
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        """Get a metadata value."""
+        conn = self._reader()
+        cursor = conn.execute("SELECT value FROM metadata WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def set_metadata(self, key: str, value: str) -> None:
+        """Set a metadata value."""
+        with self._writer() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, value, datetime.now())
+            )
+
+    def get_manifest_nodes(self) -> dict[str, tuple[str, str]]:
+        """Get indexed manifest nodes as node_id -> (name, hash)."""
+        conn = self._reader()
+        cursor = conn.execute("SELECT node_id, name, hash FROM manifest_nodes")
+        return {row["node_id"]: (row["name"], row["hash"]) for row in cursor.fetchall()}
+
+    def set_manifest_nodes(
+        self,
+        upserted: dict[str, tuple[str, str]],
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Record node hashes after indexing and forget removed nodes."""
+        with self._writer() as conn:
+            conn.executemany(
+                "DELETE FROM manifest_nodes WHERE node_id = ?",
+                [(node_id,) for node_id in removed]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO manifest_nodes (node_id, name, hash) VALUES (?, ?, ?)",
+                [(node_id, name, node_hash) for node_id, (name, node_hash) in upserted.items()]
+            )
+
+    def get_cached_commits(self, shas: Iterable[str], version: str) -> dict[str, list[Decision]]:
+        """Get cached commit analyses made by the given extractor version."""
+        shas = list(shas)
+        cached: dict[str, list[Decision]] = {}
+
+        conn = self._reader()
+        for start in range(0, len(shas), _SQL_CHUNK_SIZE):
+            chunk = shas[start:start + _SQL_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT sha, decisions FROM git_commit_cache WHERE version = ? AND sha IN ({placeholders})",
+                (version, *chunk)
+            )
+            for row in cursor.fetchall():
+                cached[row["sha"]] = [Decision.model_validate(d) for d in json.loads(row["decisions"])]
+
+        return cached
+
+    def cache_commits(self, analyses: dict[str, list[Decision]], version: str) -> None:
+        """Cache commit analyses, dropping entries from other extractor versions."""
+        with self._writer() as conn:
+            conn.execute("DELETE FROM git_commit_cache WHERE version != ?", (version,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO git_commit_cache (sha, version, decisions) VALUES (?, ?, ?)",
+                [
+                    (sha, version, "[" + ",".join(d.model_dump_json() for d in decisions) + "]")
+                    for sha, decisions in analyses.items()
+                ]
+            )
 
     def count_entities(self) -> int:
         """Count entities."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute("SELECT COUNT(*) FROM entities")
         return cursor.fetchone()[0]
 
+    def add_entities(self, entities: Iterable[dict]) -> int:
+        """Add extracted entities in a single transaction. Returns the number written."""
+        rows = [
+            (
+                entity["id"],
+                entity["name"],
+                entity["type"],
+                entity["tool"],
+                entity.get("path"),
+                entity.get("metadata"),
+                entity["created_at"],
+                entity["updated_at"],
+                entity.get("parent"),
+                entity.get("node_id"),
+            )
+            for entity in entities
+        ]
+        if not rows:
+            return 0
+
+        with self._writer() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO entities
+                (id, name, type, tool, path, metadata, created_at, updated_at, parent, node_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        return len(rows)
+
+    def delete_node_entities(self, node_ids: Iterable[str]) -> int:
+        """Delete the entities extracted from manifest nodes (a model and its columns).
+
+        Returns the number of entities deleted.
+        """
+        node_ids = list(node_ids)
+        deleted = 0
+
+        with self._writer() as conn:
+            for start in range(0, len(node_ids), _SQL_CHUNK_SIZE):
+                chunk = node_ids[start:start + _SQL_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(f"DELETE FROM entities WHERE node_id IN ({placeholders})", chunk)
+                deleted += cursor.rowcount
+
+        return deleted
+
+    def get_entities(
+        self,
+        name: Optional[str] = None,
+        entity_type: Optional[EntityType] = None,
+        parent: Optional[str] = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Get entities filtered by name, type and/or parent model."""
+        conditions = []
+        params: list = []
+        if name is not None:
+            conditions.append("name = ?")
+            params.append(name)
+        if entity_type is not None:
+            conditions.append("type = ?")
+            params.append(entity_type.value)
+        if parent is not None:
+            conditions.append("parent = ?")
+            params.append(parent)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = self._reader()
+        cursor = conn.execute(
+            f"SELECT * FROM entities {where} ORDER BY name LIMIT ?",
+            (*params, limit)
+        )
+
+        return [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "type": row["type"],
+                "tool": row["tool"],
+                "path": row["path"],
+                "parent": row["parent"],
+                "node_id": row["node_id"],
+                "metadata": row["metadata"],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def get_entity_names(self) -> set[str]:
+        """Get the distinct names of all indexed entities."""
+        conn = self._reader()
+        cursor = conn.execute("SELECT DISTINCT name FROM entities")
+        return {row[0] for row in cursor.fetchall()}
+
     def count_decisions(self) -> int:
         """Count decisions."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute("SELECT COUNT(*) FROM decisions")
         return cursor.fetchone()[0]
 
     def count_conventions(self) -> int:
         """Count conventions."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute("SELECT COUNT(*) FROM conventions")
         return cursor.fetchone()[0]
 
     def count_corrections(self) -> int:
         """Count corrections."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute("SELECT COUNT(*) FROM corrections")
         return cursor.fetchone()[0]
 
     def add_decision(self, decision: Decision) -> None:
         """Add a decision."""
-        conn = self.connect()
+        self.add_decisions([decision])
 
-        # Insert into main table
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO decisions
-            (id, entity, entity_type, change_type, why, context, source, source_ref,
-             author, timestamp, confidence, tags, tool)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    def add_decisions(self, decisions: Iterable[Decision]) -> int:
+        """Add decisions in a single transaction. Returns the number written."""
+        rows = [
             (
                 decision.id,
                 decision.entity,
@@ -257,22 +763,223 @@ class Database:
                 ",".join(decision.tags),
                 decision.tool.value,
             )
+            for decision in decisions
+        ]
+        if not rows:
+            return 0
+
+        ids = [row[0] for row in rows]
+        with self._writer() as conn:
+            # Replaced decisions may have belonged to other entities
+            affected = {row[1] for row in rows}
+            affected.update(self._entities_of(conn, ids))
+
+            # Update in place rather than REPLACE, which would delete the row
+            # without firing the FTS delete trigger; triggers keep the FTS
+            # index in sync
+            conn.executemany(
+                """
+                INSERT INTO decisions
+                (id, entity, entity_type, change_type, why, context, source, source_ref,
+                 author, timestamp, confidence, tags, tool)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    entity = excluded.entity,
+                    entity_type = excluded.entity_type,
+                    change_type = excluded.change_type,
+                    why = excluded.why,
+                    context = excluded.context,
+                    source = excluded.source,
+                    source_ref = excluded.source_ref,
+                    author = excluded.author,
+                    timestamp = excluded.timestamp,
+                    confidence = excluded.confidence,
+                    tags = excluded.tags,
+                    tool = excluded.tool
+                """,
+                rows
+            )
+
+            self._refresh_entity_stats(conn, affected)
+
+        return len(rows)
+
+    def delete_decisions(self, decision_ids: Iterable[str]) -> int:
+        """Delete decisions (triggers drop their FTS entries). Returns the number deleted."""
+        ids = list(decision_ids)
+        deleted = 0
+
+        with self._writer() as conn:
+            affected = self._entities_of(conn, ids)
+            for start in range(0, len(ids), _SQL_CHUNK_SIZE):
+                chunk = ids[start:start + _SQL_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"DELETE FROM decisions WHERE id IN ({placeholders})",
+                    chunk
+                )
+                deleted += cursor.rowcount
+
+            self._refresh_entity_stats(conn, affected)
+
+        return deleted
+
+    @staticmethod
+    def _entities_of(conn: sqlite3.Connection, decision_ids: list[str]) -> set[str]:
+        """Entities of the stored decisions with the given ids."""
+        entities: set[str] = set()
+        for start in range(0, len(decision_ids), _SQL_CHUNK_SIZE):
+            chunk = decision_ids[start:start + _SQL_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"SELECT DISTINCT entity FROM decisions WHERE id IN ({placeholders})", chunk)
+            entities.update(row[0] for row in cursor)
+        return entities
+
+    @staticmethod
+    def _refresh_entity_stats(conn: sqlite3.Connection, entities: Optional[Iterable[str]] = None) -> None:
+        """Recompute the catalog rows of ``entities`` (all entities if None)."""
+        # With MAX(), SQLite takes entity_type from the latest decision
+        aggregate = """
+            INSERT INTO entity_stats (entity, entity_type, decision_count, last_updated)
+            SELECT entity, entity_type, COUNT(*), MAX(timestamp) FROM decisions
+            {where}
+            GROUP BY entity
+        """
+        if entities is None:
+            conn.execute("DELETE FROM entity_stats")
+            conn.execute(aggregate.format(where=""))
+            return
+
+        entities = list(entities)
+        for start in range(0, len(entities), _SQL_CHUNK_SIZE):
+            chunk = entities[start:start + _SQL_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM entity_stats WHERE entity IN ({placeholders})", chunk)
+            conn.execute(aggregate.format(where=f"WHERE entity IN ({placeholders})"), chunk)
+
+    # Sort keys accepted by list_entity_stats
+    ENTITY_SORTS = ("entity", "decision_count", "last_updated")
+
+    def list_entity_stats(
+        self,
+        sort: str = "last_updated",
+        descending: bool = True,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Entities that have decisions, with their decision count and latest decision time.
+
+        ``sort`` is one of ENTITY_SORTS; ties are broken by entity name.
+        Raises ValueError for an unknown sort key.
+        """
+        if sort not in self.ENTITY_SORTS:
+            raise ValueError(f"Unknown sort key {sort!r}, expected one of: {', '.join(self.ENTITY_SORTS)}")
+        direction = "DESC" if descending else "ASC"
+
+        conn = self._reader()
+        cursor = conn.execute(
+            f"""
+            SELECT entity, entity_type, decision_count, last_updated FROM entity_stats
+            ORDER BY {sort} {direction}, entity {direction}
+            LIMIT ? OFFSET ?
+            """,
+            (limit, offset)
         )
+        return [
+            {
+                "entity": row["entity"],
+                "entity_type": row["entity_type"],
+                "decision_count": row["decision_count"],
+                "last_updated": datetime.fromisoformat(row["last_updated"]),
+            }
+            for row in cursor
+        ]
+
+    def count_entity_stats(self) -> int:
+        """Count entities that have decisions."""
+        conn = self._reader()
+        return conn.execute("SELECT COUNT(*) FROM entity_stats").fetchone()[0]
+
+    def rebuild_entity_graph(self) -> int:
+        """Recompute related entities for all entities with decisions. Returns the edge count."""
+        conn = self._reader()
+        entities = [row[0] for row in conn.execute("SELECT entity FROM entity_stats")]
+        edges = related_entities(entities)
+
+        with self._writer() as conn:
+            conn.execute("DELETE FROM entity_graph")
+            conn.executemany(
+                "INSERT INTO entity_graph (entity, related, score) VALUES (?, ?, ?)",
+                edges
+            )
+        return len(edges)
+
+    def get_entity_edges(self, entities: Iterable[str]) -> list[tuple[str, str, float]]:
+        """Related-entity edges with both ends among ``entities``, each pair once."""
+        entities = list(dict.fromkeys(entities))
+        wanted = set(entities)
+        edges = {}
+
+        conn = self._reader()
+        for start in range(0, len(entities), _SQL_CHUNK_SIZE):
+            chunk = entities[start:start + _SQL_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT entity, related, score FROM entity_graph WHERE entity IN ({placeholders})",
+                chunk
+            )
+            for entity, related, score in cursor:
+                if related in wanted:
+                    edges.setdefault(tuple(sorted((entity, related))), score)
 
-        # Update FTS5 index
-        conn.execute(
+        return [(a, b, score) for (a, b), score in edges.items()]
+
+    def get_entity_neighborhood(self, entity: str, depth: int = 1, limit: int = 100) -> list[str]:
+        """Entities within ``depth`` related-entity hops of ``entity``, nearest first."""
+        conn = self._reader()
+        cursor = conn.execute(
             """
-            INSERT OR REPLACE INTO decisions_fts (rowid, entity, why, context, tags)
-            SELECT rowid, entity, why, context, tags FROM decisions WHERE id = ?
+            WITH RECURSIVE hood(entity, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT g.related, h.depth + 1 FROM hood h
+                JOIN entity_graph g ON g.entity = h.entity
+                WHERE h.depth < ?
+            )
+            SELECT entity, MIN(depth) AS hops FROM hood
+            GROUP BY entity
+            ORDER BY hops, entity
+            LIMIT ?
             """,
-            (decision.id,)
+            (entity, depth, limit)
         )
-
-        conn.commit()
+        return [row[0] for row in cursor]
+
+    def get_decision(self, decision_id: str) -> Optional[Decision]:
+        """Get a decision by id."""
+        conn = self._reader()
+        row = conn.execute("SELECT * FROM decisions WHERE id = ?", (decision_id,)).fetchone()
+        return _decision_from_row(row) if row else None
+
+    def get_decisions_by_ids(self, decision_ids: Iterable[str]) -> list[Decision]:
+        """Get decisions by id, in the order given. Unknown ids are skipped."""
+        decision_ids = list(dict.fromkeys(decision_ids))
+        found: dict[str, Decision] = {}
+
+        conn = self._reader()
+        for start in range(0, len(decision_ids), _SQL_CHUNK_SIZE):
+            chunk = decision_ids[start:start + _SQL_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"SELECT * FROM decisions WHERE id IN ({placeholders})", chunk)
+            for row in cursor:
+                decision = _decision_from_row(row)
+                found[decision.id] = decision
+
+        return [found[i] for i in decision_ids if i in found]
 
     def get_decisions_for_entity(self, entity: str, limit: int = 10) -> list[Decision]:
         """Get decisions for an entity."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute(
             """
             SELECT * FROM decisions
@@ -283,112 +990,315 @@ class Database:
             (entity, limit)
         )
 
-        decisions = []
-        for row in cursor.fetchall():
-            decisions.append(
-                Decision(
-                    id=row["id"],
-                    entity=row["entity"],
-                    entity_type=EntityType(row["entity_type"]),
-                    change_type=ChangeType(row["change_type"]),
-                    why=row["why"],
-                    context=row["context"] or "",
-                    source=DecisionSource(row["source"]),
-                    source_ref=row["source_ref"],
-                    author=row["author"],
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
-                    confidence=row["confidence"],
-                    tags=row["tags"].split(",") if row["tags"] else [],
-                    tool=DataTool(row["tool"]),
-                )
-            )
-        return decisions
+        return [_decision_from_row(row) for row in cursor]
 
-    def list_decisions(self, limit: int = 100) -> list[Decision]:
-        """List all decisions."""
-        conn = self.connect()
-        cursor = conn.execute(
-            """
-            SELECT * FROM decisions
-            ORDER BY timestamp DESC
-            LIMIT ?
-            """,
-            (limit,)
-        )
+    def get_decisions_for_entities(
+        self, entities: Iterable[str], limit: int = 5, ranked: bool = False
+    ) -> list[Decision]:
+        """Get the latest ``limit`` decisions for each entity in one query.
 
+        Results are grouped by entity in the order given, newest first. With
+        ``ranked``, each entity's ``limit`` most trusted decisions (by
+        confidence, recency and team votes) are returned instead, most
+        trusted first across all entities.
+        """
+        entities = list(dict.fromkeys(entities))
         decisions = []
-        for row in cursor.fetchall():
-            decisions.append(
-                Decision(
-                    id=row["id"],
-                    entity=row["entity"],
-                    entity_type=EntityType(row["entity_type"]),
-                    change_type=ChangeType(row["change_type"]),
-                    why=row["why"],
-                    context=row["context"] or "",
-                    source=DecisionSource(row["source"]),
-                    source_ref=row["source_ref"],
-                    author=row["author"],
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
-                    confidence=row["confidence"],
-                    tags=row["tags"].split(",") if row["tags"] else [],
-                    tool=DataTool(row["tool"]),
+        order = f"{_QUALITY_SQL} DESC" if ranked else "d.timestamp DESC"
+
+        conn = self._reader()
+        # Two parameters per entity
+        batch = _SQL_CHUNK_SIZE // 2
+        for start in range(0, len(entities), batch):
+            chunk = entities[start:start + batch]
+            values = ",".join("(?, ?)" for _ in chunk)
+            cursor = conn.execute(
+                f"""
+                WITH wanted(entity, pos) AS (VALUES {values})
+                SELECT * FROM (
+                    SELECT d.*, w.pos AS pos, {_QUALITY_SQL} AS quality,
+                           ROW_NUMBER() OVER (PARTITION BY d.entity ORDER BY {order}) AS rn
+                    FROM decisions d
+                    JOIN wanted w ON w.entity = d.entity
+                    LEFT JOIN decision_metadata m ON m.decision_id = d.id
                 )
+                WHERE rn <= ?
+                ORDER BY {"quality DESC" if ranked else "pos, timestamp DESC"}
+                """,
+                (*(param for pos, entity in enumerate(chunk) for param in (entity, pos)), limit)
             )
+
+            decisions.extend(_decision_from_row(row) for row in cursor)
         return decisions
 
-    def search_decisions(self, query: str, limit: int = 20) -> list[Decision]:
-        """Search decisions using FTS5."""
-        # Sanitize query for FTS5 - remove special characters that cause syntax errors
-        # FTS5 special chars: " * ( ) : -
-        sanitized_query = query.replace('"', '').replace('*', '').replace('(', '').replace(')', '').replace(':', '').replace('?', '')
+    def list_decisions(self, limit: int = 100) -> list[Decision]:
+        """List all decisions, newest first."""
+        return self.query_decisions(limit=limit)[0]
 
-        # If query is empty after sanitization, return empty list
-        if not sanitized_query.strip():
-            return []
+    def query_decisions(
+        self,
+        entity: Optional[str] = None,
+        entity_prefix: Optional[str] = None,
+        entity_type: Optional[EntityType] = None,
+        source: Optional[DecisionSource] = None,
+        tool: Optional[DataTool] = None,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> tuple[list[Decision], Optional[str]]:
+        """Get one page of decisions matching the filters, newest first.
+
+        ``entity`` matches a case-insensitive substring of the entity name,
+        ``entity_prefix`` the start of it. ``status`` is the team status
+        ("active", "verified" or "outdated"). ``since`` is inclusive and
+        ``until`` exclusive.
+
+        Returns the page and a cursor for the next one, or None after the
+        last page. Pages are keyed on ``(timestamp, id)`` rather than an
+        offset, so any page costs the same and rows added meanwhile do not
+        shift later pages. Raises ValueError for a malformed cursor.
+        """
+        clauses = []
+        params: list = []
 
-        conn = self.connect()
-        cursor = conn.execute(
-            """
+        if entity:
+            clauses.append("instr(lower(d.entity), ?) > 0")
+            params.append(entity.lower())
+        if entity_prefix:
+            # Range rather than LIKE so the entity index is used
+            clauses.append("d.entity >= ? AND d.entity < ?")
+            params.extend((entity_prefix, entity_prefix + "\U0010ffff"))
+        if entity_type:
+            clauses.append("d.entity_type = ?")
+            params.append(entity_type.value)
+        if source:
+            clauses.append("d.source = ?")
+            params.append(source.value)
+        if tool:
+            clauses.append("d.tool = ?")
+            params.append(tool.value)
+        if status:
+            # Decisions without team metadata are active
+            clauses.append("COALESCE(m.status, 'active') = ?")
+            params.append(status)
+        if since:
+            clauses.append("d.timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("d.timestamp < ?")
+            params.append(until)
+        if cursor:
+            clauses.append("(d.timestamp, d.id) < (?, ?)")
+            params.extend(self._decode_cursor(cursor))
+
+        join = "LEFT JOIN decision_metadata m ON m.decision_id = d.id" if status else ""
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self._reader()
+        rows = conn.execute(
+            f"""
             SELECT d.* FROM decisions d
+            {join}
+            {where}
+            ORDER BY d.timestamp DESC, d.id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1)
+        ).fetchall()
+
+        # One extra row tells whether there is another page
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+
+        return [_decision_from_row(row) for row in rows], next_cursor
+
+    @staticmethod
+    def _encode_cursor(timestamp: str, decision_id: str) -> str:
+        """Opaque page cursor for the position after the given row."""
+        return base64.urlsafe_b64encode(json.dumps([timestamp, decision_id]).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[str, str]:
+        try:
+            timestamp, decision_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+        if not isinstance(timestamp, str) or not isinstance(decision_id, str):
+            raise ValueError(f"Invalid page cursor: {cursor!r}")
+        return timestamp, decision_id
+
+    def rebuild_fts(self) -> None:
+        """Rebuild the search indexes from their tables, then merge their segments."""
+        with self._writer() as conn:
+            for name in _FTS_INDEXES:
+                conn.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+                conn.execute(f"INSERT INTO {name} ({name}) VALUES ('optimize')")
+
+    def check_fts(self) -> bool:
+        """Whether every search index matches its table."""
+        try:
+            with self._writer() as conn:
+                for name in _FTS_INDEXES:
+                    # rank = 1 also compares the index with the content table
+                    conn.execute(f"INSERT INTO {name} ({name}, rank) VALUES ('integrity-check', 1)")
+        except sqlite3.DatabaseError:
+            return False
+        return True
+
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """FTS5 query matching every word of ``query`` as a prefix, or None if it has none."""
+        # Quote each word so FTS5 syntax in the query (" * ( ) : -) is inert
+        terms = _FTS_TERM.findall(query)
+        if not terms:
+            return None
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def _search_decisions(self, fts_query: str, limit: int) -> list[tuple[float, Decision]]:
+        cursor = self._reader().execute(
+            f"""
+            SELECT d.*, bm25(decisions_fts, {_FTS_WEIGHTS}) * (1.0 + {_QUALITY_SQL}) AS score
+            FROM decisions d
             JOIN decisions_fts ON decisions_fts.rowid = d.rowid
+            LEFT JOIN decision_metadata m ON m.decision_id = d.id
             WHERE decisions_fts MATCH ?
-            ORDER BY rank
+            ORDER BY score
+            LIMIT ?
+            """,
+            (fts_query, limit)
+        )
+        return [(row["score"], _decision_from_row(row)) for row in cursor]
+
+    def _search_corrections(self, fts_query: str, limit: int) -> list[tuple[float, Correction]]:
+        cursor = self._reader().execute(
+            f"""
+            SELECT c.*, bm25(corrections_fts, {_CORRECTION_FTS_WEIGHTS}) * {_CORRECTION_BOOST_SQL} AS score
+            FROM corrections c
+            JOIN corrections_fts ON corrections_fts.rowid = c.rowid
+            WHERE corrections_fts MATCH ?
+            ORDER BY score
             LIMIT ?
             """,
-            (sanitized_query, limit)
+            (fts_query, limit)
         )
+        return [(row["score"], _correction_from_row(row)) for row in cursor]
+
+    def _search_conventions(self, fts_query: str, limit: int) -> list[tuple[float, Convention]]:
+        cursor = self._reader().execute(
+            f"""
+            SELECT c.*, bm25(conventions_fts, {_CONVENTION_FTS_WEIGHTS}) * (1.0 + c.confidence) AS score
+            FROM conventions c
+            JOIN conventions_fts ON conventions_fts.rowid = c.rowid
+            WHERE conventions_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (fts_query, limit)
+        )
+        return [(row["score"], _convention_from_row(row)) for row in cursor]
 
-        decisions = []
-        for row in cursor.fetchall():
-            decisions.append(
-                Decision(
-                    id=row["id"],
-                    entity=row["entity"],
-                    entity_type=EntityType(row["entity_type"]),
-                    change_type=ChangeType(row["change_type"]),
-                    why=row["why"],
-                    context=row["context"] or "",
-                    source=DecisionSource(row["source"]),
-                    source_ref=row["source_ref"],
-                    author=row["author"],
-                    timestamp=datetime.fromisoformat(row["timestamp"]),
-                    confidence=row["confidence"],
-                    tags=row["tags"].split(",") if row["tags"] else [],
-                    tool=DataTool(row["tool"]),
-                )
+    def search_decisions(self, query: str, limit: int = 20) -> list[Decision]:
+        """Search decisions using FTS5, best first.
+
+        Every word of ``query`` must match, as a prefix ("cust" finds
+        "customers"). Matches are ordered by bm25 relevance, weighted
+        towards entity names and tags, scaled by how much each decision can
+        be trusted (confidence, recency and team votes).
+        """
+        fts_query = self._fts_query(query)
+        if fts_query is None:
+            return []
+        return [decision for _, decision in self._search_decisions(fts_query, limit)]
+
+    def search_corrections(self, query: str, limit: int = 20) -> list[Correction]:
+        """Search corrections using FTS5, best first.
+
+        Words match as prefixes, as in :meth:`search_decisions`. Matches are
+        ordered by bm25 relevance, weighted towards the entity name, scaled
+        by priority.
+        """
+        fts_query = self._fts_query(query)
+        if fts_query is None:
+            return []
+        return [correction for _, correction in self._search_corrections(fts_query, limit)]
+
+    def search_conventions(self, query: str, limit: int = 20) -> list[Convention]:
+        """Search conventions by pattern, examples and entity types using FTS5, best first."""
+        fts_query = self._fts_query(query)
+        if fts_query is None:
+            return []
+        return [convention for _, convention in self._search_conventions(fts_query, limit)]
+
+    def search_all(self, query: str, limit: int = 20) -> list[SearchHit]:
+        """Search decisions, corrections and conventions at once, best first.
+
+        Each kind is ranked as by its own search method, and the results are
+        merged on score. A correction's score is scaled by its priority, so
+        corrections come ahead of equally relevant decisions and conventions.
+        """
+        fts_query = self._fts_query(query)
+        if fts_query is None:
+            return []
+
+        hits = [
+            SearchHit(kind, score, item)
+            for kind, search in (
+                ("decision", self._search_decisions),
+                ("correction", self._search_corrections),
+                ("convention", self._search_conventions),
             )
-        return decisions
+            for score, item in search(fts_query, limit)
+        ]
+        return heapq.nsmallest(limit, hits, key=lambda hit: hit.score)
 
     def add_convention(self, convention: Convention) -> None:
         """Add a convention."""
-        conn = self.connect()
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO conventions
-            (id, type, pattern, applies_to, examples, frequency, confidence, detected_at, tool)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self.add_conventions([convention])
+
+    def add_conventions(self, conventions: Iterable[Convention]) -> int:
+        """Add conventions in a single transaction. Returns the number written."""
+        with self._writer() as conn:
+            return self._upsert_conventions(conn, conventions)
+
+    def replace_conventions(
+        self,
+        conventions: Iterable[Convention],
+        tool: DataTool,
+        types: Iterable[ConventionType],
+    ) -> int:
+        """Store ``conventions`` as all of ``tool``'s conventions of the given types.
+
+        Those no longer detected are deleted in the same transaction.
+        Returns the number deleted.
+        """
+        conventions = list(conventions)
+        detected = {convention.id for convention in conventions}
+        types = [t.value for t in types]
+        deleted = 0
+
+        with self._writer() as conn:
+            cursor = conn.execute(
+                f"SELECT id FROM conventions WHERE tool = ? AND type IN ({','.join('?' * len(types))})",
+                [tool.value, *types]
+            )
+            stale = [row[0] for row in cursor if row[0] not in detected]
+            for start in range(0, len(stale), _SQL_CHUNK_SIZE):
+                chunk = stale[start:start + _SQL_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(f"DELETE FROM conventions WHERE id IN ({placeholders})", chunk)
+                deleted += cursor.rowcount
+            self._upsert_conventions(conn, conventions)
+
+        return deleted
+
+    @staticmethod
+    def _upsert_conventions(conn: sqlite3.Connection, conventions: Iterable[Convention]) -> int:
+        """Insert or update conventions on ``conn``. Returns the number written."""
+        rows = [
             (
                 convention.id,
                 convention.type.value,
@@ -400,12 +1310,31 @@ class Database:
                 convention.detected_at,
                 convention.tool.value,
             )
+            for convention in conventions
+        ]
+        # Update in place: REPLACE would skip the FTS delete trigger
+        conn.executemany(
+            """
+            INSERT INTO conventions
+            (id, type, pattern, applies_to, examples, frequency, confidence, detected_at, tool)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                type = excluded.type,
+                pattern = excluded.pattern,
+                applies_to = excluded.applies_to,
+                examples = excluded.examples,
+                frequency = excluded.frequency,
+                confidence = excluded.confidence,
+                detected_at = excluded.detected_at,
+                tool = excluded.tool
+            """,
+            rows
         )
-        conn.commit()
+        return len(rows)
 
     def get_conventions(self, tool: Optional[DataTool] = None) -> list[Convention]:
         """Get conventions."""
-        conn = self.connect()
+        conn = self._reader()
 
         if tool:
             cursor = conn.execute(
@@ -415,49 +1344,44 @@ class Database:
         else:
             cursor = conn.execute("SELECT * FROM conventions ORDER BY confidence DESC")
 
-        conventions = []
-        for row in cursor.fetchall():
-            conventions.append(
-                Convention(
-                    id=row["id"],
-                    type=ConventionType(row["type"]),
-                    pattern=row["pattern"],
-                    applies_to=[EntityType(e) for e in row["applies_to"].split(",")],
-                    examples=row["examples"].split(","),
-                    frequency=row["frequency"],
-                    confidence=row["confidence"],
-                    detected_at=datetime.fromisoformat(row["detected_at"]),
-                    tool=DataTool(row["tool"]),
-                )
-            )
-        return conventions
+        return [_convention_from_row(row) for row in cursor]
 
     def add_correction(self, correction: Correction) -> None:
         """Add a correction."""
-        conn = self.connect()
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO corrections
-            (id, entity, entity_type, correction, context, added_by, added_at, scope, priority)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                correction.id,
-                correction.entity,
-                correction.entity_type.value if correction.entity_type else None,
-                correction.correction,
-                correction.context,
-                correction.added_by,
-                correction.added_at,
-                correction.scope.value,
-                correction.priority.value,
+        with self._writer() as conn:
+            # Update in place: REPLACE would skip the FTS delete trigger
+            conn.execute(
+                """
+                INSERT INTO corrections
+                (id, entity, entity_type, correction, context, added_by, added_at, scope, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    entity = excluded.entity,
+                    entity_type = excluded.entity_type,
+                    correction = excluded.correction,
+                    context = excluded.context,
+                    added_by = excluded.added_by,
+                    added_at = excluded.added_at,
+                    scope = excluded.scope,
+                    priority = excluded.priority
+                """,
+                (
+                    correction.id,
+                    correction.entity,
+                    correction.entity_type.value if correction.entity_type else None,
+                    correction.correction,
+                    correction.context,
+                    correction.added_by,
+                    correction.added_at,
+                    correction.scope.value,
+                    correction.priority.value,
+                )
             )
-        )
-        conn.commit()
+            self._bump_generation(conn)
 
     def get_corrections(self, entity: Optional[str] = None) -> list[Correction]:
         """Get corrections."""
-        conn = self.connect()
+        conn = self._reader()
 
         if entity:
             cursor = conn.execute(
@@ -471,22 +1395,28 @@ class Database:
         else:
             cursor = conn.execute("SELECT * FROM corrections ORDER BY priority DESC, added_at DESC")
 
-        corrections = []
-        for row in cursor.fetchall():
-            corrections.append(
-                Correction(
-                    id=row["id"],
-                    entity=row["entity"],
-                    entity_type=EntityType(row["entity_type"]) if row["entity_type"] else None,
-                    correction=row["correction"],
-                    context=row["context"] or "",
-                    added_by=row["added_by"],
-                    added_at=datetime.fromisoformat(row["added_at"]),
-                    scope=CorrectionScope(row["scope"]),
-                    priority=CorrectionPriority(row["priority"]),
-                )
-            )
-        return corrections
+        return [_correction_from_row(row) for row in cursor]
+
+    def get_corrections_for_entities(self, entities: Iterable[str]) -> list[Correction]:
+        """Get corrections for any of the given entities, plus global ones."""
+        entities = list(dict.fromkeys(entities))
+        # Few enough to filter in one statement; fall back to a scan otherwise
+        if len(entities) > _SQL_CHUNK_SIZE:
+            wanted = set(entities)
+            return [c for c in self.get_corrections() if c.entity in wanted or c.scope == CorrectionScope.GLOBAL]
+
+        placeholders = ",".join("?" * len(entities))
+        conn = self._reader()
+        cursor = conn.execute(
+            f"""
+            SELECT * FROM corrections
+            WHERE entity IN ({placeholders}) OR scope = 'global'
+            ORDER BY priority DESC, added_at DESC
+            """,
+            entities
+        )
+
+        return [_correction_from_row(row) for row in cursor]
 
     # Team Workspace methods (v0.2.0)
 
@@ -502,22 +1432,21 @@ class Database:
         import uuid
 
         comment_id = f"cmt_{uuid.uuid4().hex[:12]}"
-        conn = self.connect()
+        with self._writer() as conn:
+            conn.execute(
+                """
+                INSERT INTO decision_comments
+                (id, decision_id, author, author_email, content, created_at, parent_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (comment_id, decision_id, author, author_email, content, datetime.now(), parent_id)
+            )
 
-        conn.execute(
-            """
-            INSERT INTO decision_comments
-            (id, decision_id, author, author_email, content, created_at, parent_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (comment_id, decision_id, author, author_email, content, datetime.now(), parent_id)
-        )
-        conn.commit()
         return comment_id
 
     def get_comments(self, decision_id: str) -> list[dict]:
         """Get all comments for a decision."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute(
             """
             SELECT * FROM decision_comments
@@ -543,48 +1472,46 @@ class Database:
 
     def vote_decision(self, decision_id: str, user_email: str, vote: int) -> None:
         """Vote on a decision. Vote: 1 for upvote, -1 for downvote, 0 to remove."""
-        conn = self.connect()
+        with self._writer() as conn:
 
-        if vote == 0:
-            # Remove vote
-            conn.execute(
-                "DELETE FROM decision_votes WHERE decision_id = ? AND user_email = ?",
-                (decision_id, user_email)
+            if vote == 0:
+                # Remove vote
+                conn.execute(
+                    "DELETE FROM decision_votes WHERE decision_id = ? AND user_email = ?",
+                    (decision_id, user_email)
+                )
+            else:
+                # Add or update vote
+                conn.execute(
+                    """
+                    INSERT INTO decision_votes (decision_id, user_email, vote, created_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(decision_id, user_email)
+                    DO UPDATE SET vote = excluded.vote
+                    """,
+                    (decision_id, user_email, vote, datetime.now())
+                )
+
+            # Update vote score in metadata
+            cursor = conn.execute(
+                "SELECT SUM(vote) as score FROM decision_votes WHERE decision_id = ?",
+                (decision_id,)
             )
-        else:
-            # Add or update vote
+            score = cursor.fetchone()["score"] or 0
+
             conn.execute(
                 """
-                INSERT INTO decision_votes (decision_id, user_email, vote, created_at)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(decision_id, user_email)
-                DO UPDATE SET vote = excluded.vote
+                INSERT INTO decision_metadata (decision_id, vote_score)
+                VALUES (?, ?)
+                ON CONFLICT(decision_id)
+                DO UPDATE SET vote_score = excluded.vote_score
                 """,
-                (decision_id, user_email, vote, datetime.now())
+                (decision_id, score)
             )
 
-        # Update vote score in metadata
-        cursor = conn.execute(
-            "SELECT SUM(vote) as score FROM decision_votes WHERE decision_id = ?",
-            (decision_id,)
-        )
-        score = cursor.fetchone()["score"] or 0
-
-        conn.execute(
-            """
-            INSERT INTO decision_metadata (decision_id, vote_score)
-            VALUES (?, ?)
-            ON CONFLICT(decision_id)
-            DO UPDATE SET vote_score = excluded.vote_score
-            """,
-            (decision_id, score)
-        )
-
-        conn.commit()
-
     def get_vote_score(self, decision_id: str) -> int:
         """Get vote score for a decision."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute(
             "SELECT vote_score FROM decision_metadata WHERE decision_id = ?",
             (decision_id,)
@@ -594,7 +1521,7 @@ class Database:
 
     def get_user_vote(self, decision_id: str, user_email: str) -> int:
         """Get user's vote on a decision. Returns 1, -1, or 0."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute(
             "SELECT vote FROM decision_votes WHERE decision_id = ? AND user_email = ?",
             (decision_id, user_email)
@@ -604,38 +1531,36 @@ class Database:
 
     def verify_decision(self, decision_id: str, user_email: str) -> None:
         """Mark a decision as verified by a user."""
-        conn = self.connect()
-        conn.execute(
-            """
-            INSERT INTO decision_metadata (decision_id, status, last_verified_at, last_verified_by)
-            VALUES (?, 'verified', ?, ?)
-            ON CONFLICT(decision_id)
-            DO UPDATE SET
-                status = 'verified',
-                last_verified_at = excluded.last_verified_at,
-                last_verified_by = excluded.last_verified_by
-            """,
-            (decision_id, datetime.now(), user_email)
-        )
-        conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                """
+                INSERT INTO decision_metadata (decision_id, status, last_verified_at, last_verified_by)
+                VALUES (?, 'verified', ?, ?)
+                ON CONFLICT(decision_id)
+                DO UPDATE SET
+                    status = 'verified',
+                    last_verified_at = excluded.last_verified_at,
+                    last_verified_by = excluded.last_verified_by
+                """,
+                (decision_id, datetime.now(), user_email)
+            )
 
     def mark_outdated(self, decision_id: str) -> None:
         """Mark a decision as outdated."""
-        conn = self.connect()
-        conn.execute(
-            """
-            INSERT INTO decision_metadata (decision_id, status)
-            VALUES (?, 'outdated')
-            ON CONFLICT(decision_id)
-            DO UPDATE SET status = 'outdated'
-            """,
-            (decision_id,)
-        )
-        conn.commit()
+        with self._writer() as conn:
+            conn.execute(
+                """
+                INSERT INTO decision_metadata (decision_id, status)
+                VALUES (?, 'outdated')
+                ON CONFLICT(decision_id)
+                DO UPDATE SET status = 'outdated'
+                """,
+                (decision_id,)
+            )
 
     def get_decision_metadata(self, decision_id: str) -> Optional[dict]:
         """Get metadata for a decision."""
-        conn = self.connect()
+        conn = self._reader()
         cursor = conn.execute(
             "SELECT * FROM decision_metadata WHERE decision_id = ?",
             (decision_id,)
@@ -652,7 +1577,14 @@ class Database:
         return None
 
     def close(self) -> None:
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Close database connection(s)."""
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._local = threading.local()
+
+        with self._write_lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,67 @@
+"""Relationships between entities, for the decision graph."""
+
+from __future__ import annotations
+
+import heapq
+import re
+from collections import defaultdict
+from typing import Iterable
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Minimum share of the shorter name's tokens two entities must have in common
+MIN_OVERLAP = 0.3
+
+# Most related entities kept per entity
+MAX_EDGES_PER_ENTITY = 10
+
+# Tokens shared by more entities than this (layer prefixes such as "fct" or
+# "stg") say little about how two entities relate and are not used
+MAX_TOKEN_ENTITIES = 200
+
+
+def entity_tokens(entity: str) -> frozenset[str]:
+    """Words of an entity name ("fct_customer_orders" -> customer, fct, orders)."""
+    return frozenset(token for token in _SEPARATORS.split(entity.lower()) if token)
+
+
+def related_entities(
+    entities: Iterable[str],
+    max_edges: int = MAX_EDGES_PER_ENTITY,
+) -> list[tuple[str, str, float]]:
+    """Find entities whose names share words.
+
+    Candidates come from an inverted index of name tokens, so only entities
+    sharing a token are ever compared. Returns ``(entity, related, score)``
+    for the ``max_edges`` best matches of each entity, where the score is
+    the shared tokens as a share of the shorter name's tokens.
+    """
+    tokens = {entity: entity_tokens(entity) for entity in dict.fromkeys(entities)}
+
+    postings: dict[str, list[str]] = defaultdict(list)
+    for entity, words in tokens.items():
+        for word in words:
+            postings[word].append(entity)
+
+    edges = []
+    for entity, words in tokens.items():
+        shared: dict[str, int] = defaultdict(int)
+        for word in words:
+            posting = postings[word]
+            if len(posting) > MAX_TOKEN_ENTITIES:
+                continue
+            for other in posting:
+                if other != entity:
+                    shared[other] += 1
+
+        scored = (
+            (common / min(len(words), len(tokens[other])), other)
+            for other, common in shared.items()
+        )
+        best = heapq.nsmallest(
+            max_edges,
+            ((-score, other) for score, other in scored if score > MIN_OVERLAP),
+        )
+        edges.extend((entity, other, -score) for score, other in best)
+
+    return edges
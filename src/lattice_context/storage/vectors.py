@@ -0,0 +1,333 @@
+"""Optional embedding index for finding decisions by similar wording.
+
+Needs NumPy (``pip install lattice-context[semantic]``). Without it
+:meth:`VectorIndex.open` returns None and retrieval stays lexical.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Protocol, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+if TYPE_CHECKING:
+    from lattice_context.core.types import Decision
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Words too common to say what a text is about
+_STOPWORDS = frozenset("""
+    a an and are as at be by do does for from how in is it of on or so that the
+    this to was we were what when where which why will with
+""".split())
+
+# Words longer than this also contribute their character trigrams, so
+# inflections and compounds ("discounts", "discounted") land near each other
+_MIN_TRIGRAM_WORD = 4
+
+# Combined (L2) weight of a word's trigrams relative to the word itself
+_TRIGRAM_WEIGHT = 2.0
+
+# Hashed features kept per word before the cache is cleared
+_FEATURE_CACHE_SIZE = 100_000
+
+
+class Embedder(Protocol):
+    """Turns texts into vectors. ``name`` changes whenever the vectors would."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        """Unit-length float32 vectors, one row per text."""
+        ...
+
+
+class HashingEmbedder:
+    """Embeds texts by hashing their words and word trigrams into a fixed vector.
+
+    Runs locally with no model to download. Texts sharing words, or parts
+    of words, get similar vectors; synonyms with no letters in common do
+    not, which takes a trained model implementing :class:`Embedder`.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        # Word -> (feature indexes, signed weights)
+        self._features: dict[str, tuple[list[int], list[float]]] = {}
+
+    def _word_features(self, word: str) -> tuple[list[int], list[float]]:
+        features = self._features.get(word)
+        if features is not None:
+            return features
+
+        keys = [word]
+        weights = [1.0]
+        if len(word) >= _MIN_TRIGRAM_WORD:
+            padded = f"<{word}>"
+            trigrams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+            keys.extend(f"#{trigram}" for trigram in trigrams)
+            weights.extend([_TRIGRAM_WEIGHT / len(trigrams) ** 0.5] * len(trigrams))
+
+        indexes = []
+        signed = []
+        for key, weight in zip(keys, weights):
+            # crc32 rather than hash(), which changes between processes
+            h = zlib.crc32(key.encode())
+            indexes.append(h % self.dim)
+            signed.append(weight if (h // self.dim) & 1 else -weight)
+
+        if len(self._features) >= _FEATURE_CACHE_SIZE:
+            self._features.clear()
+        self._features[word] = (indexes, signed)
+        return indexes, signed
+
+    def embed(self, texts: Sequence[str]) -> Any:
+        """Unit-length float32 vectors, one row per text."""
+        # Features of every text as offsets into the flattened matrix, summed
+        # in a single bincount
+        offsets: list[int] = []
+        weights: list[float] = []
+        for row, text in enumerate(texts):
+            base = row * self.dim
+            for word in _WORD.findall(text.lower()):
+                if word in _STOPWORDS:
+                    continue
+                indexes, signed = self._word_features(word)
+                offsets.extend(base + index for index in indexes)
+                weights.extend(signed)
+        vectors = np.bincount(
+            np.asarray(offsets, dtype=np.int64),
+            weights=np.asarray(weights, dtype=np.float64),
+            minlength=len(texts) * self.dim,
+        ).astype(np.float32).reshape(len(texts), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def decision_text(decision: Decision) -> str:
+    """The text of a decision that gets embedded."""
+    return " ".join(
+        part for part in (decision.entity.replace("_", " "), decision.why, decision.context) if part
+    )
+
+
+class VectorIndex:
+    """Decision embeddings in a memory-mapped ``.npy`` matrix next to ``index.db``.
+
+    ``vectors.npy`` holds one unit vector per row and only ever grows:
+    new and changed decisions are appended, by writing a new file and
+    renaming it over the old one so readers never see a partial write. ``vectors.json`` maps each
+    decision id to its current row and a digest of the embedded text, so
+    unchanged decisions are not embedded again. Rows no longer current are
+    dropped by compacting once they outnumber the live ones::
+
+        index = VectorIndex.open(project / ".lattice")
+        if index is not None:
+            index.sync({d.id: decision_text(d) for d in decisions})
+            index.search(["add a discount column"], k=20)
+    """
+
+    MATRIX_FILE = "vectors.npy"
+    META_FILE = "vectors.json"
+
+    def __init__(self, directory: Path, embedder: Optional[Embedder] = None):
+        if np is None:
+            raise ImportError("The vector index needs numpy: pip install 'lattice-context[semantic]'")
+        self.directory = directory
+        self.embedder = embedder or HashingEmbedder()
+        self.matrix_path = directory / self.MATRIX_FILE
+        self.meta_path = directory / self.META_FILE
+
+        self._rows: dict[str, tuple[int, str]] = {}
+        self._matrix: Any = None
+        self._live: Any = None
+        self._ids: list[Optional[str]] = []
+        self._loaded_stat: Optional[tuple[int, int]] = None
+
+    @classmethod
+    def open(cls, directory: Path, embedder: Optional[Embedder] = None) -> Optional[VectorIndex]:
+        """The index stored in ``directory``, or None if numpy is not installed."""
+        if np is None:
+            return None
+        return cls(directory, embedder)
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._rows)
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.meta_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> None:
+        """(Re)load the index if another process has written it since."""
+        stat = self._stat()
+        if self._matrix is not None and stat == self._loaded_stat:
+            return
+
+        self._rows = {}
+        self._matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        if stat is not None:
+            meta = json.loads(self.meta_path.read_text())
+            if meta.get("embedder") == self.embedder.name and self.matrix_path.exists():
+                matrix = np.load(self.matrix_path, mmap_mode="r")
+                if matrix.ndim == 2 and matrix.shape[1] == self.embedder.dim:
+                    self._matrix = matrix
+                    self._rows = {
+                        decision_id: (row, digest)
+                        for decision_id, (row, digest) in meta["rows"].items()
+                        if row < len(matrix)
+                    }
+        self._index_rows()
+        self._loaded_stat = stat
+
+    def _index_rows(self) -> None:
+        """Rebuild the row -> id lookup and the mask of current rows."""
+        self._ids = [None] * len(self._matrix)
+        for decision_id, (row, _) in self._rows.items():
+            self._ids[row] = decision_id
+        self._live = np.array([i is not None for i in self._ids], dtype=bool)
+
+    def sync(self, documents: Mapping[str, str]) -> tuple[int, int]:
+        """Make the index hold exactly ``documents`` (decision id -> text).
+
+        Only new and changed texts are embedded, in one batch, and appended.
+        Returns the number of decisions embedded and removed.
+        """
+        self._load()
+        return self.update(
+            documents, [decision_id for decision_id in self._rows if decision_id not in documents]
+        )
+
+    def update(self, documents: Mapping[str, str], removed: Iterable[str] = ()) -> tuple[int, int]:
+        """Add or replace ``documents`` and drop the ``removed`` ids; keep the rest.
+
+        Lets an incremental run touch only the decisions it wrote or deleted.
+        Returns the number of decisions embedded and removed, as :meth:`sync`.
+        """
+        self._load()
+        digests = {
+            decision_id: hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+            for decision_id, text in documents.items()
+        }
+        changed = [
+            decision_id for decision_id, digest in digests.items()
+            if self._rows.get(decision_id, (None, None))[1] != digest
+        ]
+        removed = [
+            decision_id for decision_id in dict.fromkeys(removed)
+            if decision_id in self._rows and decision_id not in digests
+        ]
+        if not changed and not removed:
+            return 0, 0
+
+        for decision_id in removed:
+            del self._rows[decision_id]
+
+        start = len(self._matrix)
+        vectors = self.embedder.embed([documents[decision_id] for decision_id in changed])
+        for offset, decision_id in enumerate(changed):
+            self._rows[decision_id] = (start + offset, digests[decision_id])
+
+        if start + len(changed) > 2 * max(len(self._rows), 1):
+            self._compact(vectors, changed)
+        else:
+            self._append(vectors)
+        self._write_meta()
+        return len(changed), len(removed)
+
+    def _append(self, vectors: Any) -> None:
+        """Append rows by writing the grown matrix to a new file.
+
+        Other processes may have the current file memory-mapped, so it is
+        replaced rather than changed in place.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        # A file with no usable rows (missing, or from another embedder) is replaced
+        if len(self._matrix) and self.matrix_path.exists():
+            vectors = np.concatenate([self._matrix, vectors])
+        # Release the memory map before the file is swapped
+        self._matrix = None
+        self._save(vectors)
+        self._matrix = np.load(self.matrix_path, mmap_mode="r")
+        self._index_rows()
+
+    def _save(self, matrix: Any) -> None:
+        """Replace the matrix file in one step, so readers never see half of it."""
+        temp_path = self.matrix_path.with_suffix(".tmp.npy")
+        np.save(temp_path, matrix)
+        os.replace(temp_path, self.matrix_path)
+
+    def _compact(self, vectors: Any, changed: list[str]) -> None:
+        """Rewrite the matrix with only the current rows, in id order."""
+        changed_rows = {decision_id: i for i, decision_id in enumerate(changed)}
+        old = self._matrix
+        ids = list(self._rows)
+        matrix = np.empty((len(ids), self.embedder.dim), dtype=np.float32)
+        for row, decision_id in enumerate(ids):
+            if decision_id in changed_rows:
+                matrix[row] = vectors[changed_rows[decision_id]]
+            else:
+                matrix[row] = old[self._rows[decision_id][0]]
+            self._rows[decision_id] = (row, self._rows[decision_id][1])
+
+        self._matrix = None
+        self._save(matrix)
+        self._matrix = np.load(self.matrix_path, mmap_mode="r")
+        self._index_rows()
+
+    def _write_meta(self) -> None:
+        meta = {
+            "embedder": self.embedder.name,
+            "rows": {decision_id: [row, digest] for decision_id, (row, digest) in self._rows.items()},
+        }
+        temp_path = self.meta_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(meta))
+        os.replace(temp_path, self.meta_path)
+        self._loaded_stat = self._stat()
+
+    def search(
+        self,
+        queries: Sequence[str],
+        k: int = 20,
+        min_similarity: float = 0.0,
+    ) -> list[list[tuple[str, float]]]:
+        """The ``k`` decisions most similar to each query, by cosine similarity.
+
+        All queries are scored against the matrix in one product. Returns,
+        per query, ``(decision id, similarity)`` pairs best first, leaving
+        out those below ``min_similarity``.
+        """
+        self._load()
+        if not queries or not self._rows or k <= 0:
+            return [[] for _ in queries]
+
+        scores = self.embedder.embed(queries) @ self._matrix.T
+        scores[:, ~self._live] = -np.inf
+        k = min(k, len(self._rows))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        results = []
+        for query_scores, candidates in zip(scores, top):
+            best = candidates[np.argsort(-query_scores[candidates], kind="stable")]
+            results.append([
+                (self._ids[row], float(query_scores[row]))
+                for row in best
+                if query_scores[row] >= min_similarity
+            ])
+        return results
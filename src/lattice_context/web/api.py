@@ -4,15 +4,26 @@ from __future__ import annotations
 
 from typing import Optional
 
+import asyncio
+import hashlib
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from lattice_context.core.types import (
+    Convention,
+    Correction,
+    DataTool,
+    Decision,
+    DecisionSource,
+    EntityType,
+)
+from lattice_context.storage.async_database import AsyncDatabase
 from lattice_context.storage.database import Database
 from lattice_context.core.licensing import (
     get_current_tier,
@@ -53,6 +64,72 @@ class SearchRequest(BaseModel):
     limit: int = 20
 
 
+# Decisions shown per entity when the graph is focused on a neighbourhood
+GRAPH_DECISIONS_PER_ENTITY = 5
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag`` (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def _decision_response(d: Decision) -> DecisionResponse:
+    """A decision as returned by the API."""
+    return DecisionResponse(
+        id=d.id,
+        entity=d.entity,
+        entity_type=d.entity_type.value,
+        change_type=d.change_type.value,
+        why=d.why,
+        context=d.context,
+        source=d.source.value,
+        source_ref=d.source_ref,
+        author=d.author,
+        timestamp=d.timestamp,
+        confidence=d.confidence,
+        tags=d.tags,
+        tool=d.tool.value,
+    )
+
+
+def _decision_json(d: Decision) -> dict:
+    """A decision as returned by the API, as plain JSON data."""
+    return _decision_response(d).model_dump(mode="json")
+
+
+def _convention_json(c: Convention) -> dict:
+    """A convention as returned by the API."""
+    return {
+        "id": c.id,
+        "type": c.type.value,
+        "pattern": c.pattern,
+        "applies_to": [e.value for e in c.applies_to],
+        "examples": c.examples,
+        "frequency": c.frequency,
+        "confidence": c.confidence,
+        "detected_at": c.detected_at.isoformat(),
+        "tool": c.tool.value,
+    }
+
+
+def _correction_json(c: Correction) -> dict:
+    """A correction as returned by the API."""
+    return {
+        "id": c.id,
+        "entity": c.entity,
+        "entity_type": c.entity_type.value if c.entity_type else None,
+        "correction": c.correction,
+        "context": c.context,
+        "added_by": c.added_by,
+        "added_at": c.added_at.isoformat(),
+        "scope": c.scope.value,
+        "priority": c.priority.value,
+    }
+
+
 def create_app(db_path: Path) -> FastAPI:
     """Create FastAPI application."""
     app = FastAPI(
@@ -68,167 +145,164 @@ def create_app(db_path: Path) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
     )
 
-    # Database connection
-    db = Database(db_path)
+    # Database connection, shared by all requests. Queries run on worker
+    # threads so a slow one doesn't hold up the event loop
+    db = AsyncDatabase(Database(db_path, pooled=True))
 
     @app.get("/api/stats", response_model=StatsResponse)
     async def get_stats():
         """Get dashboard statistics."""
+        entities, decisions, conventions, corrections, last_indexed_at = await asyncio.gather(
+            db.count_entities(),
+            db.count_decisions(),
+            db.count_conventions(),
+            db.count_corrections(),
+            db.last_indexed_at(),
+        )
         return StatsResponse(
-            total_entities=db.count_entities(),
-            total_decisions=db.count_decisions(),
-            total_conventions=db.count_conventions(),
-            total_corrections=db.count_corrections(),
-            last_indexed_at=db.last_indexed_at(),
+            total_entities=entities,
+            total_decisions=decisions,
+            total_conventions=conventions,
+            total_corrections=corrections,
+            last_indexed_at=last_indexed_at,
         )
 
     @app.get("/api/decisions", response_model=list[DecisionResponse])
-    async def list_decisions(limit: int = 100, entity: Optional[str] = None):
-        """List all decisions."""
-        decisions = db.list_decisions(limit=limit)
+    async def list_decisions(
+        response: Response,
+        limit: int = 100,
+        entity: Optional[str] = None,
+        entity_prefix: Optional[str] = None,
+        entity_type: Optional[EntityType] = None,
+        source: Optional[DecisionSource] = None,
+        tool: Optional[DataTool] = None,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ):
+        """List decisions matching the filters, newest first.
+
+        When there are more, the cursor for the next page is returned in
+        the X-Next-Cursor header.
+        """
+        try:
+            decisions, next_cursor = await db.query_decisions(
+                entity=entity,
+                entity_prefix=entity_prefix,
+                entity_type=entity_type,
+                source=source,
+                tool=tool,
+                status=status,
+                since=since,
+                until=until,
+                cursor=cursor,
+                limit=limit,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        # Filter by entity if specified
-        if entity:
-            decisions = [d for d in decisions if entity.lower() in d.entity.lower()]
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
-        return [
-            DecisionResponse(
-                id=d.id,
-                entity=d.entity,
-                entity_type=d.entity_type.value,
-                change_type=d.change_type.value,
-                why=d.why,
-                context=d.context,
-                source=d.source.value,
-                source_ref=d.source_ref,
-                author=d.author,
-                timestamp=d.timestamp,
-                confidence=d.confidence,
-                tags=d.tags,
-                tool=d.tool.value,
-            )
-            for d in decisions
-        ]
+        return [_decision_response(d) for d in decisions]
 
     @app.get("/api/decisions/{decision_id}", response_model=DecisionResponse)
-    async def get_decision(decision_id: str):
-        """Get a specific decision."""
-        # Get all decisions and find the matching one
-        decisions = db.list_decisions(limit=10000)
-        decision = next((d for d in decisions if d.id == decision_id), None)
+    async def get_decision(decision_id: str, if_none_match: Optional[str] = Header(None)):
+        """Get a specific decision.
+
+        The response carries an ETag; a request whose If-None-Match still
+        matches it gets an empty 304 instead.
+        """
+        decision = await db.get_decision(decision_id)
 
         if not decision:
             raise HTTPException(status_code=404, detail="Decision not found")
 
-        return DecisionResponse(
-            id=decision.id,
-            entity=decision.entity,
-            entity_type=decision.entity_type.value,
-            change_type=decision.change_type.value,
-            why=decision.why,
-            context=decision.context,
-            source=decision.source.value,
-            source_ref=decision.source_ref,
-            author=decision.author,
-            timestamp=decision.timestamp,
-            confidence=decision.confidence,
-            tags=decision.tags,
-            tool=decision.tool.value,
-        )
+        body = _decision_response(decision).model_dump_json()
+        etag = f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
 
     @app.post("/api/search", response_model=list[DecisionResponse])
     async def search_decisions(request: SearchRequest):
         """Search decisions."""
-        decisions = db.search_decisions(request.query, limit=request.limit)
+        decisions = await db.search_decisions(request.query, limit=request.limit)
 
-        return [
-            DecisionResponse(
-                id=d.id,
-                entity=d.entity,
-                entity_type=d.entity_type.value,
-                change_type=d.change_type.value,
-                why=d.why,
-                context=d.context,
-                source=d.source.value,
-                source_ref=d.source_ref,
-                author=d.author,
-                timestamp=d.timestamp,
-                confidence=d.confidence,
-                tags=d.tags,
-                tool=d.tool.value,
-            )
-            for d in decisions
-        ]
+        return [_decision_response(d) for d in decisions]
 
     @app.get("/api/conventions")
     async def list_conventions():
         """List detected conventions."""
-        conventions = db.get_conventions()
+        conventions = await db.get_conventions()
 
-        return [
-            {
-                "id": c.id,
-                "type": c.type.value,
-                "pattern": c.pattern,
-                "description": c.description,
-                "applies_to": [e.value for e in c.applies_to],
-                "examples": c.examples,
-                "frequency": c.frequency,
-                "confidence": c.confidence,
-                "detected_at": c.detected_at.isoformat(),
-                "tool": c.tool.value,
-            }
-            for c in conventions
-        ]
+        return [_convention_json(c) for c in conventions]
 
     @app.get("/api/corrections")
-    async def list_corrections():
-        """List user corrections."""
-        corrections = db.get_corrections()
-
+    async def list_corrections(q: Optional[str] = None, limit: int = 100):
+        """List user corrections, or search them with ``q`` (best first)."""
+        if q:
+            corrections = await db.search_corrections(q, limit=limit)
+        else:
+            corrections = await db.get_corrections()
+
+        return [_correction_json(c) for c in corrections]
+
+    @app.post("/api/search/all")
+    async def search_all(request: SearchRequest):
+        """Search decisions, corrections and conventions, merged best first."""
+        hits = await db.search_all(request.query, limit=request.limit)
+
+        serializers = {
+            "decision": _decision_json,
+            "correction": _correction_json,
+            "convention": _convention_json,
+        }
         return [
-            {
-                "id": c.id,
-                "entity": c.entity,
-                "entity_type": c.entity_type.value if c.entity_type else None,
-                "correction": c.correction,
-                "context": c.context,
-                "added_by": c.added_by,
-                "added_at": c.added_at.isoformat(),
-                "scope": c.scope.value,
-                "priority": c.priority.value,
-            }
-            for c in corrections
+            {"kind": hit.kind, "score": hit.score, "item": serializers[hit.kind](hit.item)}
+            for hit in hits
         ]
 
     @app.get("/api/entities")
-    async def list_entities():
-        """List unique entities."""
-        decisions = db.list_decisions(limit=10000)
+    async def list_entities(
+        response: Response,
+        sort: str = "last_updated",
+        order: str = "desc",
+        limit: int = 500,
+        offset: int = 0,
+    ):
+        """List entities that have decisions, with decision counts.
+
+        Sort by entity, decision_count or last_updated. The total number of
+        entities is returned in the X-Total-Count header.
+        """
+        if order not in ("asc", "desc"):
+            raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
 
-        # Group by entity
-        entities = {}
-        for d in decisions:
-            if d.entity not in entities:
-                entities[d.entity] = {
-                    "entity": d.entity,
-                    "entity_type": d.entity_type.value,
-                    "decision_count": 0,
-                    "last_updated": d.timestamp,
-                }
-            entities[d.entity]["decision_count"] += 1
-            if d.timestamp > entities[d.entity]["last_updated"]:
-                entities[d.entity]["last_updated"] = d.timestamp
+        try:
+            entities, total = await asyncio.gather(
+                db.list_entity_stats(sort=sort, descending=order == "desc", limit=limit, offset=offset),
+                db.count_entity_stats(),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        return list(entities.values())
+        response.headers["X-Total-Count"] = str(total)
+        return entities
 
     @app.get("/api/entities/{entity_name}")
     async def get_entity(entity_name: str):
         """Get entity details with all decisions."""
-        decisions = db.get_decisions_for_entity(entity_name, limit=1000)
-        corrections = db.get_corrections(entity=entity_name)
+        decisions, corrections = await asyncio.gather(
+            db.get_decisions_for_entity(entity_name, limit=1000),
+            db.get_corrections(entity=entity_name),
+        )
 
         if not decisions:
             raise HTTPException(status_code=404, detail="Entity not found")
@@ -266,16 +340,26 @@ def create_app(db_path: Path) -> FastAPI:
         }
 
     @app.get("/api/graph")
-    async def get_graph(entity_type: Optional[str] = None, limit: int = 100):
+    async def get_graph(
+        entity_type: Optional[EntityType] = None,
+        limit: int = 100,
+        focus: Optional[str] = None,
+        depth: int = 1,
+    ):
         """Get graph data for visualization.
 
         Returns nodes (decisions) and links (relationships) for D3.js force graph.
+        With ``focus``, only entities within ``depth`` hops of that entity are
+        included, so the view can expand around a node incrementally.
         """
-        decisions = db.list_decisions(limit=limit)
-
-        # Filter by entity type if specified
-        if entity_type:
-            decisions = [d for d in decisions if d.entity_type.value == entity_type]
+        if focus:
+            entities = await db.get_entity_neighborhood(focus, depth=depth, limit=limit)
+            decisions = await db.get_decisions_for_entities(entities, limit=GRAPH_DECISIONS_PER_ENTITY)
+            if entity_type:
+                decisions = [d for d in decisions if d.entity_type == entity_type]
+            decisions = decisions[:limit]
+        else:
+            decisions, _ = await db.query_decisions(entity_type=entity_type, limit=limit)
 
         # Create nodes from decisions
         nodes = []
@@ -295,42 +379,30 @@ def create_app(db_path: Path) -> FastAPI:
         links = []
         entity_decisions = {}
 
-        # Group decisions by entity
-        for d in decisions:
-            if d.entity not in entity_decisions:
-                entity_decisions[d.entity] = []
-            entity_decisions[d.entity].append(d)
+        # Group decisions by entity, oldest first
+        for d in sorted(decisions, key=lambda x: x.timestamp):
+            entity_decisions.setdefault(d.entity, []).append(d)
 
         # Link decisions about the same entity (chronologically)
         for entity, decs in entity_decisions.items():
-            sorted_decs = sorted(decs, key=lambda x: x.timestamp)
-            for i in range(len(sorted_decs) - 1):
+            for i in range(len(decs) - 1):
                 links.append({
-                    "source": sorted_decs[i].id,
-                    "target": sorted_decs[i + 1].id,
+                    "source": decs[i].id,
+                    "target": decs[i + 1].id,
                     "type": "evolution",  # Same entity over time
                     "label": "evolves to"
                 })
 
-        # Link decisions with similar entities (e.g., dim_customer and fct_customer_orders)
-        entities = list(entity_decisions.keys())
-        for i, entity1 in enumerate(entities):
-            for entity2 in entities[i+1:]:
-                # Check if entities share keywords (simple heuristic)
-                words1 = set(entity1.lower().replace('_', ' ').split())
-                words2 = set(entity2.lower().replace('_', ' ').split())
-                common = words1 & words2
-
-                # If they share significant words, link their most recent decisions
-                if len(common) >= 1 and len(common) / min(len(words1), len(words2)) > 0.3:
-                    dec1 = entity_decisions[entity1][-1]  # Most recent
-                    dec2 = entity_decisions[entity2][-1]
-                    links.append({
-                        "source": dec1.id,
-                        "target": dec2.id,
-                        "type": "related",  # Related entities
-                        "label": "related to"
-                    })
+        # Link the latest decisions of related entities (e.g., dim_customer and
+        # fct_customer_orders), precomputed at index time
+        for entity1, entity2, score in await db.get_entity_edges(entity_decisions):
+            links.append({
+                "source": entity_decisions[entity1][-1].id,
+                "target": entity_decisions[entity2][-1].id,
+                "type": "related",  # Related entities
+                "label": "related to",
+                "score": score,
+            })
 
         return {
             "nodes": nodes,
@@ -338,7 +410,8 @@ def create_app(db_path: Path) -> FastAPI:
             "metadata": {
                 "total_nodes": len(nodes),
                 "total_links": len(links),
-                "entity_types": list(set(n["type"] for n in nodes))
+                "entity_types": list(set(n["type"] for n in nodes)),
+                "focus": focus,
             }
         }
 
@@ -346,7 +419,7 @@ def create_app(db_path: Path) -> FastAPI:
     async def get_tier_info():
         """Get current tier and usage information."""
         tier = get_current_tier()
-        decision_count = db.count_decisions()
+        decision_count = await db.count_decisions()
         stats = get_usage_stats(tier, decision_count)
 
         return {
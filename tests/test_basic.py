@@ -1,5 +1,6 @@
 """Basic tests to verify core functionality."""
 
+import asyncio
 import shutil
 import tempfile
 from datetime import datetime
@@ -33,6 +34,52 @@ def temp_db():
     shutil.rmtree(temp_dir)
 
 
+def make_decision(i: int, entity: str, **fields) -> Decision:
+    """A decision numbered ``i`` about ``entity``; ``fields`` override the defaults."""
+    return Decision(**{
+        "id": f"dec_{i}",
+        "entity": entity,
+        "entity_type": EntityType.MODEL,
+        "change_type": ChangeType.MODIFIED,
+        "why": f"Change {i}",
+        "source": DecisionSource.GIT_COMMIT,
+        "source_ref": f"ref{i}",
+        "author": "test@example.com",
+        "timestamp": datetime.now(),
+        "confidence": 0.7,
+        "tool": DataTool.DBT,
+        **fields,
+    })
+
+
+def make_correction(id_: str, entity: str, text: str, **fields) -> Correction:
+    """A correction of ``entity``; ``fields`` override the defaults."""
+    return Correction(**{
+        "id": id_,
+        "entity": entity,
+        "correction": text,
+        "added_by": "user",
+        "added_at": datetime.now(),
+        **fields,
+    })
+
+
+def make_convention(pattern: str, convention_type: ConventionType = ConventionType.PREFIX, **fields) -> Convention:
+    """A model-name convention for ``pattern``; ``fields`` override the defaults."""
+    return Convention(**{
+        "id": f"conv_{pattern}",
+        "type": convention_type,
+        "pattern": pattern,
+        "applies_to": [EntityType.MODEL],
+        "examples": [],
+        "frequency": 3,
+        "confidence": 0.85,
+        "detected_at": datetime.now(),
+        "tool": DataTool.DBT,
+        **fields,
+    })
+
+
 def test_database_initialization(temp_db):
     """Test that database initializes correctly."""
     assert not temp_db.is_indexed()
@@ -68,6 +115,16 @@ def test_add_decision(temp_db):
     assert len(decisions) == 1
     assert decisions[0].entity == "dim_customer"
     assert decisions[0].why == "Created to centralize customer data"
+    # Loaded without validation, but identical to what was stored
+    assert decisions[0] == decision
+    assert decisions[0].model_fields_set == decision.model_fields_set
+    assert decisions[0].model_dump_json() == decision.model_dump_json()
+    assert temp_db.list_decisions() == [decision]
+
+    # Primary-key lookups
+    assert temp_db.get_decision("dec_test123") == decision
+    assert temp_db.get_decision("dec_missing") is None
+    assert temp_db.get_decisions_by_ids(["dec_missing", "dec_test123", "dec_test123"]) == [decision]
 
 
 def test_add_convention(temp_db):
@@ -91,6 +148,24 @@ def test_add_convention(temp_db):
     conventions = temp_db.get_conventions()
     assert len(conventions) == 1
     assert conventions[0].pattern == "dim_"
+    assert conventions[0] == convention
+
+
+def test_replace_conventions(temp_db):
+    """Test that affix conventions no longer detected are dropped on replace."""
+    temp_db.add_conventions([
+        make_convention("dim_"),
+        make_convention("customer_"),
+        make_convention("_id", ConventionType.SUFFIX),
+        make_convention("snake_case", ConventionType.CASE),
+        make_convention("looker_", tool=DataTool.LOOKER),
+    ])
+
+    affixes = [ConventionType.PREFIX, ConventionType.SUFFIX]
+    current = [make_convention("dim_"), make_convention("fct_")]
+    assert temp_db.replace_conventions(current, DataTool.DBT, affixes) == 2
+    assert sorted(c.pattern for c in temp_db.get_conventions()) == ["dim_", "fct_", "looker_", "snake_case"]
+    assert temp_db.search_conventions("customer") == []
 
 
 def test_add_correction(temp_db):
@@ -114,6 +189,7 @@ def test_add_correction(temp_db):
     corrections = temp_db.get_corrections("revenue")
     assert len(corrections) == 1
     assert corrections[0].correction == "Always exclude refunds and taxes"
+    assert corrections[0] == correction
 
 
 def test_search_decisions(temp_db):
@@ -159,3 +235,640 @@ def test_search_decisions(temp_db):
     results = temp_db.search_decisions("financial")
     assert len(results) >= 1
     assert any(d.entity == "revenue" for d in results)
+
+    # Words match as prefixes, and FTS syntax in the query is harmless
+    assert [d.id for d in temp_db.search_decisions("promo*")] == ["dec_2"]
+    assert [d.id for d in temp_db.search_decisions('fin (report')] == ["dec_1"]
+    assert temp_db.search_decisions('" : -') == []
+
+
+def test_search_decisions_ranking(temp_db):
+    """Test that search favours entity and tag hits, then trusted decisions."""
+    temp_db.add_decisions([
+        make_decision(1, "fct_orders", why="Joined customers to orders for attribution"),
+        make_decision(2, "dim_customers", why="Deduplicated rows"),
+        make_decision(3, "fct_payments", why="Reworked joins", tags=["customers"]),
+    ])
+    # An entity hit beats a tag hit, which beats a hit in the prose
+    assert [d.id for d in temp_db.search_decisions("customers")] == ["dec_2", "dec_3", "dec_1"]
+
+    # Among equal matches, the one the team voted for wins
+    temp_db.add_decisions([
+        make_decision(4, "stg_refunds", why="Refund logic"),
+        make_decision(5, "stg_refunds", why="Refund logic"),
+    ])
+    for user in ("a@example.com", "b@example.com"):
+        temp_db.vote_decision("dec_5", user, 1)
+    assert [d.id for d in temp_db.search_decisions("refund")] == ["dec_5", "dec_4"]
+
+    # Indexes created without prefix indexes are rebuilt on initialize
+    conn = temp_db.connect()
+    conn.execute("DROP TABLE decisions_fts")
+    conn.execute(
+        "CREATE VIRTUAL TABLE decisions_fts USING fts5("
+        "entity, why, context, tags, content='decisions', content_rowid='rowid')"
+    )
+    conn.commit()
+    temp_db.initialize()
+    assert [d.id for d in temp_db.search_decisions("dedup")] == ["dec_2"]
+
+
+def test_add_decisions_batch(temp_db):
+    """Test bulk-adding decisions in one transaction."""
+    decisions = [
+        Decision(
+            id=f"dec_batch_{i}",
+            entity=f"fct_orders_{i}",
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.MODIFIED,
+            why=f"Batch decision number {i} about refunds",
+            source=DecisionSource.GIT_COMMIT,
+            source_ref=f"ref{i}",
+            author="test@example.com",
+            timestamp=datetime.now(),
+            confidence=0.7,
+            tool=DataTool.DBT,
+        )
+        for i in range(1200)
+    ]
+
+    assert temp_db.add_decisions(decisions) == 1200
+    assert temp_db.add_decisions([]) == 0
+    assert temp_db.count_decisions() == 1200
+
+    # Every row in the batch is searchable
+    results = temp_db.search_decisions("refunds", limit=2000)
+    assert len(results) == 1200
+
+
+def test_query_decisions_filters_and_pages(temp_db):
+    """Test filtered keyset pagination over decisions."""
+    base = datetime(2024, 1, 1)
+    temp_db.add_decisions(
+        Decision(
+            id=f"dec_{i:03d}",
+            entity="fct_orders" if i % 2 else "dim_customers",
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.MODIFIED,
+            why=f"Change {i}",
+            source=DecisionSource.GIT_COMMIT if i % 3 else DecisionSource.YAML_DESCRIPTION,
+            source_ref=f"ref{i}",
+            author="test@example.com",
+            # Pairs of decisions share a timestamp, so ids break the tie
+            timestamp=base.replace(day=1 + i // 2),
+            confidence=0.7,
+            tool=DataTool.DBT,
+        )
+        for i in range(25)
+    )
+    temp_db.mark_outdated("dec_003")
+
+    # Walking every page visits each decision once, newest first
+    seen, cursor = [], None
+    while True:
+        page, cursor = temp_db.query_decisions(cursor=cursor, limit=7)
+        seen.extend(d.id for d in page)
+        if cursor is None:
+            break
+    assert seen == [f"dec_{i:03d}" for i in reversed(range(25))]
+
+    orders, cursor = temp_db.query_decisions(entity="ORDERS", limit=100)
+    assert cursor is None
+    assert {d.entity for d in orders} == {"fct_orders"} and len(orders) == 12
+    assert len(temp_db.query_decisions(entity_prefix="dim_")[0]) == 13
+    assert all(
+        d.source == DecisionSource.YAML_DESCRIPTION
+        for d in temp_db.query_decisions(source=DecisionSource.YAML_DESCRIPTION)[0]
+    )
+    assert [d.id for d in temp_db.query_decisions(status="outdated")[0]] == ["dec_003"]
+    assert len(temp_db.query_decisions(status="active")[0]) == 24
+    ranged = temp_db.query_decisions(since=base.replace(day=2), until=base.replace(day=4))[0]
+    assert [d.id for d in ranged] == ["dec_005", "dec_004", "dec_003", "dec_002"]
+
+    with pytest.raises(ValueError):
+        temp_db.query_decisions(cursor="not-a-cursor")
+
+
+def test_entity_stats_follow_decision_writes(temp_db):
+    """Test that the entity catalog tracks added, moved and deleted decisions."""
+    temp_db.add_decisions([
+        make_decision(1, "fct_orders", timestamp=datetime(2024, 1, 1)),
+        make_decision(2, "fct_orders", timestamp=datetime(2024, 1, 3)),
+        make_decision(3, "dim_customers", timestamp=datetime(2024, 1, 2)),
+    ])
+    stats = temp_db.list_entity_stats()
+    assert [(s["entity"], s["decision_count"]) for s in stats] == [("fct_orders", 2), ("dim_customers", 1)]
+    assert stats[0]["last_updated"] == datetime(2024, 1, 3)
+
+    # Replacing a decision under another entity moves it between entries
+    temp_db.add_decisions([make_decision(2, "dim_customers", timestamp=datetime(2024, 1, 4))])
+    stats = temp_db.list_entity_stats(sort="decision_count")
+    assert [(s["entity"], s["decision_count"]) for s in stats] == [("dim_customers", 2), ("fct_orders", 1)]
+
+    temp_db.delete_decisions(["dec_1"])
+    assert [s["entity"] for s in temp_db.list_entity_stats(sort="entity", descending=False)] == ["dim_customers"]
+    assert temp_db.count_entity_stats() == 1
+
+    # Databases indexed before the catalog existed are backfilled
+    conn = temp_db.connect()
+    conn.execute("DROP TABLE entity_stats")
+    conn.commit()
+    temp_db.initialize()
+    assert temp_db.list_entity_stats()[0]["decision_count"] == 2
+
+    with pytest.raises(ValueError):
+        temp_db.list_entity_stats(sort="why")
+
+
+def test_entity_graph(temp_db, monkeypatch):
+    """Test related-entity edges from shared name tokens, and neighbourhoods."""
+    from lattice_context.storage import graph
+
+    edges = graph.related_entities(["dim_customer", "fct_customer_orders", "stg_orders", "rpt_revenue"])
+    assert ("dim_customer", "fct_customer_orders", 0.5) in edges
+    assert ("stg_orders", "fct_customer_orders", 0.5) in edges
+    assert not any("rpt_revenue" in edge[:2] for edge in edges)
+
+    # Edges are capped per entity, best first
+    capped = graph.related_entities(["orders", "orders_a", "orders_b", "orders_c"], max_edges=2)
+    assert [edge for edge in capped if edge[0] == "orders"] == [
+        ("orders", "orders_a", 1.0), ("orders", "orders_b", 1.0)
+    ]
+
+    # Tokens shared by too many entities are ignored
+    monkeypatch.setattr(graph, "MAX_TOKEN_ENTITIES", 2)
+    assert graph.related_entities(["fct_a", "fct_b", "fct_c"]) == []
+    monkeypatch.undo()
+
+    temp_db.add_decisions(
+        Decision(
+            id=f"dec_{entity}",
+            entity=entity,
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.CREATED,
+            why="Created",
+            source=DecisionSource.GIT_COMMIT,
+            source_ref="ref",
+            author="test@example.com",
+            timestamp=datetime(2024, 1, 1),
+            confidence=0.7,
+            tool=DataTool.DBT,
+        )
+        for entity in ["dim_customer", "fct_customer_orders", "stg_orders", "rpt_revenue"]
+    )
+    assert temp_db.rebuild_entity_graph() == 4
+
+    assert temp_db.get_entity_neighborhood("dim_customer") == ["dim_customer", "fct_customer_orders"]
+    assert temp_db.get_entity_neighborhood("dim_customer", depth=2) == [
+        "dim_customer", "fct_customer_orders", "stg_orders"
+    ]
+    assert temp_db.get_entity_edges(["dim_customer", "fct_customer_orders", "rpt_revenue"]) == [
+        ("dim_customer", "fct_customer_orders", 0.5)
+    ]
+
+
+def test_fts_stays_in_sync_across_rewrites(temp_db):
+    """Test that re-adding and deleting decisions doesn't leave stale FTS entries."""
+    def fts_rows() -> int:
+        return temp_db.connect().execute("SELECT COUNT(*) FROM decisions_fts_docsize").fetchone()[0]
+
+    # Re-indexing the same decisions
+    for why in ("Excluded test orders", "Excluded cancelled orders", "Excluded refunded orders"):
+        temp_db.add_decisions(make_decision(i, f"fct_orders_{i}", why=why) for i in range(50))
+    assert fts_rows() == 50
+    assert temp_db.search_decisions("cancelled") == []
+    assert len(temp_db.search_decisions("refunded", limit=100)) == 50
+
+    temp_db.delete_decisions(["dec_0", "dec_1"])
+    assert fts_rows() == 48
+    assert temp_db.check_fts()
+
+    temp_db.rebuild_fts()
+    assert fts_rows() == 48
+    assert temp_db.check_fts()
+
+
+def test_search_corrections_conventions_and_all(temp_db):
+    """Test full-text search over corrections and conventions, and the merged search."""
+    temp_db.add_correction(make_correction("corr_1", "fct_revenue", "Exclude refunds", priority=CorrectionPriority.HIGH))
+    temp_db.add_correction(
+        make_correction("corr_2", "dim_customers", "Revenue is net of tax", priority=CorrectionPriority.LOW)
+    )
+    temp_db.add_convention(Convention(
+        id="conv_1",
+        type=ConventionType.PREFIX,
+        pattern="fct_",
+        applies_to=[EntityType.MODEL],
+        examples=["fct_revenue", "fct_orders"],
+        frequency=2,
+        confidence=0.9,
+        detected_at=datetime.now(),
+        tool=DataTool.DBT,
+    ))
+    temp_db.add_decision(Decision(
+        id="dec_1",
+        entity="rpt_revenue",
+        entity_type=EntityType.MODEL,
+        change_type=ChangeType.CREATED,
+        why="Revenue report for finance",
+        source=DecisionSource.GIT_COMMIT,
+        source_ref="abc",
+        author="test@example.com",
+        timestamp=datetime.now(),
+        confidence=0.9,
+        tool=DataTool.DBT,
+    ))
+
+    # Prefix matches on the entity name outrank matches in the text
+    assert [c.id for c in temp_db.search_corrections("reven")] == ["corr_1", "corr_2"]
+    assert [c.id for c in temp_db.search_conventions("fct_orders")] == ["conv_1"]
+    assert temp_db.search_corrections("*") == []
+
+    hits = temp_db.search_all("revenue")
+    assert {(hit.kind, hit.item.id) for hit in hits} == {
+        ("correction", "corr_1"),
+        ("correction", "corr_2"),
+        ("convention", "conv_1"),
+        ("decision", "dec_1"),
+    }
+    assert hits[0].item.id == "corr_1"
+    assert [hit.score for hit in hits] == sorted(hit.score for hit in hits)
+    assert len(temp_db.search_all("revenue", limit=2)) == 2
+
+    # Rewriting a correction replaces its index entry
+    temp_db.add_correction(
+        make_correction("corr_1", "fct_revenue", "Exclude chargebacks", priority=CorrectionPriority.HIGH)
+    )
+    assert temp_db.search_corrections("refunds") == []
+    assert [c.id for c in temp_db.search_corrections("chargebacks")] == ["corr_1"]
+    assert temp_db.check_fts()
+
+
+def test_entities_store(temp_db):
+    """Test bulk-adding, querying and deleting entities."""
+    now = datetime.now()
+    entities = [
+        {"id": "ent_m", "name": "fct_orders", "type": "model", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": None, "node_id": "model.p.fct_orders"},
+        {"id": "ent_c1", "name": "order_id", "type": "column", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": "fct_orders", "node_id": "model.p.fct_orders"},
+        {"id": "ent_c2", "name": "revenue_amount", "type": "column", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": "fct_orders", "node_id": "model.p.fct_orders"},
+    ]
+
+    assert temp_db.add_entities(entities) == 3
+    assert temp_db.count_entities() == 3
+    assert temp_db.get_entity_names() == {"fct_orders", "order_id", "revenue_amount"}
+    assert [e["name"] for e in temp_db.get_entities(parent="fct_orders")] == [
+        "order_id", "revenue_amount"
+    ]
+    assert len(temp_db.get_entities(entity_type=EntityType.MODEL)) == 1
+
+    assert temp_db.delete_node_entities(["model.p.fct_orders"]) == 3
+    assert temp_db.count_entities() == 0
+
+
+def test_extract_entities_uses_indexed_names(temp_db):
+    """Test that task text is matched against real entity names."""
+    from lattice_context.mcp.retrieval import ContextRetriever
+
+    now = datetime.now()
+    temp_db.add_entities([
+        {"id": "ent_m", "name": "fct_orders", "type": "model", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": None},
+        {"id": "ent_c", "name": "revenue_amount", "type": "column", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": "fct_orders"},
+    ])
+    temp_db.set_last_indexed_at(now)
+
+    retriever = ContextRetriever(temp_db)
+    entities = asyncio.run(retriever._extract_entities("Fix revenue rounding in fct_orders and dim_unknown"))
+
+    assert entities == ["revenue_amount", "fct_orders"]
+
+
+def test_entity_matcher_finds_whole_names():
+    """Test that the entity matcher finds overlapping names on word boundaries."""
+    from lattice_context.mcp.entities import EntityMatcher
+
+    matcher = EntityMatcher(
+        ["fct_orders", "orders", "order_id", "Customer_Key", "customer", "paid_at", "id"],
+        suffixes=["_id", "_key", "_at"],
+    )
+
+    assert matcher.find("Join FCT_ORDERS to orders on order_id") == ["fct_orders", "orders", "order_id"]
+    # Stems find suffixed names unless they are names themselves or too short
+    assert matcher.find("customer churn once paid") == ["customer"]
+    assert matcher.find("customer_key, customer_keys, xorders") == ["Customer_Key"]
+    assert matcher.find("ids (id)") == ["id"]
+    assert EntityMatcher(["analytics.fct_orders"]).find("Read analytics . FCT_orders") == ["analytics.fct_orders"]
+    assert EntityMatcher([]).find("anything") == []
+
+
+def test_pooled_database_threads(temp_db):
+    """Test that a pooled database can be shared by reader and writer threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    db = Database(temp_db.db_path, pooled=True)
+
+    def write(batch: int) -> int:
+        return db.add_decisions(
+            Decision(
+                id=f"dec_pool_{batch}_{i}",
+                entity=f"fct_orders_{i}",
+                entity_type=EntityType.MODEL,
+                change_type=ChangeType.MODIFIED,
+                why=f"Pooled decision {i} about refunds",
+                source=DecisionSource.GIT_COMMIT,
+                source_ref=f"ref{i}",
+                author="test@example.com",
+                timestamp=datetime.now(),
+                confidence=0.7,
+                tool=DataTool.DBT,
+            )
+            for i in range(50)
+        )
+
+    def read(_: int) -> int:
+        return len(db.search_decisions("refunds", limit=1000)) + db.count_decisions()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        writes = [executor.submit(write, batch) for batch in range(10)]
+        reads = [executor.submit(read, n) for n in range(40)]
+        assert sum(f.result() for f in writes) == 500
+        assert all(f.result() >= 0 for f in reads)
+
+    assert db.count_decisions() == 500
+    assert len(db._readers) > 1
+    db.close()
+    assert db._readers == [] and db.conn is None
+
+
+def test_async_database_does_not_block_event_loop(temp_db, monkeypatch):
+    """Test that a slow query runs off the event loop."""
+    import time
+
+    from lattice_context.storage.async_database import AsyncDatabase
+
+    pooled = Database(temp_db.db_path, pooled=True)
+    monkeypatch.setattr(pooled, "search_decisions", lambda query, limit=20: time.sleep(0.3) or [])
+    db = AsyncDatabase(pooled)
+
+    async def scenario():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        results, count, indexed = await asyncio.gather(
+            db.search_decisions("slow"),
+            db.count_decisions(),
+            db.is_indexed(),
+        )
+        beat.cancel()
+        return ticks, results, count, indexed
+
+    ticks, results, count, indexed = asyncio.run(scenario())
+    db.close()
+
+    assert ticks >= 10
+    assert (results, count, indexed) == ([], 0, False)
+
+
+def test_get_context_batches_tiers(temp_db):
+    """Test that tiered retrieval returns per-entity decisions and tier latencies."""
+    from lattice_context.mcp.retrieval import ContextRetriever
+
+    now = datetime.now()
+    temp_db.add_entities([
+        {"id": f"ent_{name}", "name": name, "type": "model", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": None}
+        for name in ("fct_orders", "dim_customer")
+    ])
+    temp_db.set_last_indexed_at(now)
+    temp_db.add_decisions(
+        Decision(
+            id=f"dec_{entity}_{i}",
+            entity=entity,
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.MODIFIED,
+            why=f"Change {i} to {entity}",
+            source=DecisionSource.GIT_COMMIT,
+            source_ref=f"ref{i}",
+            author="test@example.com",
+            timestamp=datetime(2024, 1, i + 1),
+            confidence=0.7,
+            tool=DataTool.DBT,
+        )
+        for entity in ("fct_orders", "dim_customer")
+        for i in range(8)
+    )
+    temp_db.add_correction(Correction(
+        id="corr_orders",
+        entity="fct_orders",
+        correction="Orders exclude test accounts",
+        added_by="test@example.com",
+        added_at=now,
+        scope=CorrectionScope.ENTITY,
+        priority=CorrectionPriority.HIGH,
+    ))
+
+    batched = temp_db.get_decisions_for_entities(["dim_customer", "fct_orders", "dim_customer"], limit=3)
+    assert [d.id for d in batched] == [
+        "dec_dim_customer_7", "dec_dim_customer_6", "dec_dim_customer_5",
+        "dec_fct_orders_7", "dec_fct_orders_6", "dec_fct_orders_5",
+    ]
+
+    response = asyncio.run(ContextRetriever(temp_db).get_context("Why does fct_orders join dim_customer?"))
+
+    assert response["metadata"]["entities"] == ["fct_orders", "dim_customer"]
+    # Everything fits in the default tier 1 budget
+    assert len(response["immediate_decisions"]) == 16
+    assert [c.id for c in response["corrections"]] == ["corr_orders"]
+    assert set(response["metadata"]["latency_ms"]) == {
+        "tier1_immediate", "tier2_related", "tier3_global", "corrections", "total",
+    }
+
+
+
+def test_get_context_packs_tiers_into_budget(temp_db):
+    """Test that tiers are filled in ranked order up to the token budget."""
+    from lattice_context.core.config import TokenBudgets
+    from lattice_context.mcp.retrieval import ContextRetriever
+    from lattice_context.mcp.tokens import estimate_tokens, pack, render_decision
+
+    temp_db.add_decisions(
+        Decision(
+            id=f"dec_orders_{i}",
+            entity="fct_orders",
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.MODIFIED,
+            why=f"Reworked order logic, revision {i}. " + "Long explanation. " * 10,
+            source=DecisionSource.GIT_COMMIT,
+            source_ref=f"ref{i}",
+            author="test@example.com",
+            timestamp=datetime(2024, 1, i + 1),
+            confidence=0.7,
+            tool=DataTool.DBT,
+        )
+        for i in range(10)
+    )
+
+    retriever = ContextRetriever(temp_db, TokenBudgets(tier1_immediate=200, tier2_related=100, tier3_global=100))
+    response = asyncio.run(retriever.get_context("Change `fct_orders`"))
+
+    tier1 = response["tiers"]["tier1_immediate"]
+    assert 0 < tier1.tokens <= 200
+    assert tier1.sources == [d.id for d in response["immediate_decisions"]]
+    # Newest first, cut by budget rather than count
+    assert [d.id for d in response["immediate_decisions"]] == [f"dec_orders_{i}" for i in (9, 8, 7)]
+    assert response["total_tokens"] == sum(t.tokens for t in response["tiers"].values())
+
+    # A smaller max_tokens scales every tier down
+    small = asyncio.run(retriever.get_context("Change `fct_orders`", max_tokens=200))
+    assert small["total_tokens"] <= 200
+    assert len(small["immediate_decisions"]) < 3
+
+    # Items too big for what is left are skipped in favour of smaller ones
+    big, tiny = response["immediate_decisions"][0], response["immediate_decisions"][0].model_copy(
+        update={"id": "dec_tiny", "why": "Short", "context": ""}
+    )
+    packed, lines, used = pack([big, tiny], estimate_tokens(render_decision(tiny)) + 1, render_decision)
+    assert [d.id for d in packed] == ["dec_tiny"]
+
+
+def test_get_context_cache_invalidated_by_index_generation(temp_db):
+    """Test that cached context is reused until the index generation changes."""
+    from lattice_context.mcp.retrieval import ContextRetriever
+
+    retriever = ContextRetriever(temp_db)
+
+    async def ask(task):
+        return await retriever.get_context(task)
+
+    first = asyncio.run(ask("Change `fct_orders`"))
+    assert first["metadata"]["cached"] is False
+
+    # Same task up to whitespace is a hit
+    second = asyncio.run(ask("  Change   `fct_orders` "))
+    assert second["metadata"]["cached"] is True
+    assert retriever.cache_stats()["hits"] == 1
+    assert retriever.cache_stats()["misses"] == 1
+
+    temp_db.add_correction(Correction(
+        id="corr_cache",
+        entity="fct_orders",
+        correction="Orders exclude test accounts",
+        added_by="test@example.com",
+        added_at=datetime.now(),
+        scope=CorrectionScope.ENTITY,
+    ))
+    third = asyncio.run(ask("Change `fct_orders`"))
+    assert third["metadata"]["cached"] is False
+    assert [c.id for c in third["corrections"]] == ["corr_cache"]
+
+    temp_db.set_last_indexed_at(datetime.now())
+    assert asyncio.run(ask("Change `fct_orders`"))["metadata"]["cached"] is False
+
+    # A negative TTL expires entries immediately
+    retriever.cache_ttl = -1
+    assert asyncio.run(ask("Change `fct_orders`"))["metadata"]["cached"] is False
+    assert retriever.cache_stats()["misses"] == 4
+
+
+def test_vector_index_appends_and_compacts(tmp_path):
+    """Test that the vector index embeds only changed decisions and finds similar wording."""
+    np = pytest.importorskip("numpy")
+    from lattice_context.storage.vectors import VectorIndex
+
+    documents = {
+        "dec_discount": "Add discount amount to orders",
+        "dec_refunds": "Exclude refunded payments from revenue",
+        "dec_sessions": "Deduplicate session events",
+    }
+    index = VectorIndex.open(tmp_path)
+    assert index.sync(documents) == (3, 0)
+    assert index.sync(documents) == (0, 0)
+
+    [discounts, nothing] = index.search(["discounted orders", "zzz"], k=2, min_similarity=0.1)
+    assert discounts[0][0] == "dec_discount"
+    assert nothing == []
+
+    # Changes are appended to a new file; a reader's memory map of the old
+    # one is left intact, and a fresh instance reads them back from disk
+    mapped = np.load(tmp_path / "vectors.npy", mmap_mode="r")
+    snapshot = np.array(mapped)
+    documents["dec_sessions"] = "Sessions time out after 30 minutes"
+    documents["dec_rebate"] = "Rebate on invoices"
+    assert index.sync(documents) == (2, 0)
+    assert np.load(tmp_path / "vectors.npy", mmap_mode="r").shape[0] == 5
+    assert mapped.shape[0] == 3 and np.array_equal(mapped, snapshot)
+    reopened = VectorIndex.open(tmp_path)
+    assert len(reopened) == 4
+    assert reopened.search(["session timeout"], k=1)[0][0][0] == "dec_sessions"
+
+    # Updates touch only the given ids; unknown removals are ignored
+    assert index.update({"dec_rebate": "Rebate on invoices"}, removed=["dec_refunds", "dec_gone"]) == (0, 1)
+    assert len(index) == 3
+    documents.pop("dec_refunds")
+
+    # Once stale rows outnumber live ones, the matrix is rewritten
+    assert index.sync({"dec_rebate": "Rebates on invoices"}) == (1, 2)
+    assert np.load(tmp_path / "vectors.npy", mmap_mode="r").shape[0] == 1
+    assert [hit[0] for hit in reopened.search(["invoices"], k=5)[0]] == ["dec_rebate"]
+
+
+def test_get_context_related_by_similarity(temp_db, tmp_path):
+    """Test that tier 2 includes decisions worded like the task when there is a vector index."""
+    pytest.importorskip("numpy")
+    from lattice_context.mcp.retrieval import ContextRetriever
+    from lattice_context.storage.vectors import VectorIndex, decision_text
+
+    temp_db.add_decisions(
+        Decision(
+            id=f"dec_{i}",
+            entity=entity,
+            entity_type=EntityType.MODEL,
+            change_type=ChangeType.MODIFIED,
+            why=why,
+            source=DecisionSource.GIT_COMMIT,
+            source_ref=f"ref{i}",
+            author="test@example.com",
+            timestamp=datetime.now(),
+            confidence=0.7,
+            tool=DataTool.DBT,
+        )
+        for i, (entity, why) in enumerate([
+            ("fct_orders", "Discounts are applied before tax"),
+            ("dim_customer", "Customers are deduplicated by email"),
+        ])
+    )
+    now = datetime.now()
+    temp_db.add_entities([
+        {"id": f"ent_{name}", "name": name, "type": "model", "tool": "dbt",
+         "created_at": now, "updated_at": now, "parent": None}
+        for name in ("fct_orders", "dim_customer")
+    ])
+    temp_db.set_last_indexed_at(now)
+    vectors = VectorIndex.open(tmp_path)
+    vectors.sync({d.id: decision_text(d) for d in temp_db.list_decisions()})
+
+    # No indexed entity is named, so there is nothing to search for by name
+    task = "Add a discounted total"
+    lexical = asyncio.run(ContextRetriever(temp_db).get_context(task))
+    semantic = asyncio.run(ContextRetriever(temp_db, vectors=vectors).get_context(task))
+
+    assert lexical["related_decisions"] == []
+    assert [d.id for d in semantic["related_decisions"]] == ["dec_0"]
+
+    # A named entity without decisions falls back to searching for it by
+    # name; decisions that are only worded alike stay in tier 2
+    semantic = asyncio.run(
+        ContextRetriever(temp_db, vectors=vectors).get_context(f"{task} to `orders_daily`")
+    )
+    assert semantic["immediate_decisions"] == []
+    assert [d.id for d in semantic["related_decisions"]] == ["dec_0"]
@@ -170,6 +170,38 @@ def test_status_command(temp_dbt_project):
         os.chdir(original_dir)
 
 
+def test_check_and_rebuild_fts(temp_dbt_project):
+    """Test lattice check and index --rebuild-fts."""
+    from lattice_context.storage.database import Database
+
+    original_dir = os.getcwd()
+    os.chdir(temp_dbt_project)
+
+    try:
+        runner.invoke(app, ["init"])
+        runner.invoke(app, ["index"])
+
+        result = runner.invoke(app, ["check"])
+        assert result.exit_code == 0
+        assert "matches" in result.output
+
+        # An entry for a row that no longer exists
+        db = Database(temp_dbt_project / ".lattice" / "index.db")
+        conn = db.connect()
+        conn.execute("INSERT INTO decisions_fts (rowid, entity, why) VALUES (999999, 'ghost', 'stale')")
+        conn.commit()
+        db.close()
+
+        result = runner.invoke(app, ["check"])
+        assert result.exit_code == 1
+        assert "--rebuild-fts" in result.output
+
+        runner.invoke(app, ["index", "--rebuild-fts"])
+        assert runner.invoke(app, ["check"]).exit_code == 0
+    finally:
+        os.chdir(original_dir)
+
+
 def test_context_command(temp_dbt_project):
     """Test lattice context command."""
     original_dir = os.getcwd()
@@ -211,3 +243,109 @@ def test_init_no_dbt_project():
     with tempfile.TemporaryDirectory() as temp_dir:
         result = runner.invoke(app, ["init"], cwd=temp_dir)
         assert result.exit_code != 0 or "Could not auto-detect" in result.output
+
+
+def test_index_incremental(temp_dbt_project, monkeypatch):
+    """Test that incremental indexing only processes manifest changes."""
+    from lattice_context.core.config import LatticeConfig
+    from lattice_context.storage.database import Database
+
+    original_dir = os.getcwd()
+    os.chdir(temp_dbt_project)
+
+    try:
+        manifest_path = temp_dbt_project / "target" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["nodes"]["model.test_project.orders"] = {
+            "resource_type": "model",
+            "name": "orders",
+            "original_file_path": "models/orders.sql",
+            "description": "One row per order placed through the storefront",
+            "columns": {},
+        }
+        manifest_path.write_text(json.dumps(manifest))
+
+        runner.invoke(app, ["init"])
+        # Vectors are only written with numpy installed
+        config = LatticeConfig.load(temp_dbt_project)
+        config.retrieval.semantic_search = True
+        config.save(temp_dbt_project)
+        runner.invoke(app, ["index"])
+
+        db = Database(temp_dbt_project / ".lattice" / "index.db")
+        assert db.get_decisions_for_entity("orders")
+        assert db.get_metadata("manifest_hash")
+        assert db.count_entities() == 4
+
+        vectors_path = temp_dbt_project / ".lattice" / "vectors.json"
+        vectors_mtime = vectors_path.stat().st_mtime_ns if vectors_path.exists() else None
+
+        graph_rebuilds = []
+        rebuild_entity_graph = Database.rebuild_entity_graph
+        monkeypatch.setattr(
+            Database, "rebuild_entity_graph",
+            lambda self: graph_rebuilds.append(1) or rebuild_entity_graph(self),
+        )
+
+        # Unchanged manifest: nothing is re-extracted or rebuilt
+        result = runner.invoke(app, ["index", "--incremental"])
+        assert result.exit_code == 0
+        assert "Entities:    0" in result.output
+        assert graph_rebuilds == []
+        if vectors_mtime is not None:
+            assert vectors_path.stat().st_mtime_ns == vectors_mtime
+
+        # Removed node: its decisions are deleted
+        del manifest["nodes"]["model.test_project.orders"]
+        manifest_path.write_text(json.dumps(manifest))
+        result = runner.invoke(app, ["index", "--incremental"])
+        assert result.exit_code == 0
+        assert db.get_decisions_for_entity("orders") == []
+        assert db.get_decisions_for_entity("customers")
+        assert db.count_entities() == 3
+        assert graph_rebuilds == [1]
+        if vectors_mtime is not None:
+            assert len(json.loads(vectors_path.read_text())["rows"]) == db.count_decisions()
+        db.close()
+    finally:
+        os.chdir(original_dir)
+
+
+def test_index_incremental_versioned_models(temp_dbt_project):
+    """Test that changing one version of a model leaves the others indexed."""
+    from lattice_context.storage.database import Database
+
+    original_dir = os.getcwd()
+    os.chdir(temp_dbt_project)
+
+    try:
+        manifest_path = temp_dbt_project / "target" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        for version in ("v1", "v2"):
+            manifest["nodes"][f"model.test_project.orders.{version}"] = {
+                "resource_type": "model",
+                "name": "orders",
+                "version": version[1:],
+                "original_file_path": f"models/orders_{version}.sql",
+                "description": f"Orders, contract {version}",
+                "columns": {"order_id": {"name": "order_id", "description": "Order key"}},
+            }
+        manifest_path.write_text(json.dumps(manifest))
+
+        runner.invoke(app, ["init"])
+        runner.invoke(app, ["index"])
+
+        db = Database(temp_dbt_project / ".lattice" / "index.db")
+        assert db.count_entities() == 7
+
+        # Only v2 changes; v1's model and column rows share its name but stay
+        manifest["nodes"]["model.test_project.orders.v2"]["description"] = "Orders, contract v2 with refunds"
+        manifest_path.write_text(json.dumps(manifest))
+        result = runner.invoke(app, ["index", "--incremental"])
+        assert result.exit_code == 0
+        assert db.count_entities() == 7
+        node_ids = {e["node_id"] for e in db.get_entities() if e["name"] in ("orders", "order_id")}
+        assert node_ids == {"model.test_project.orders.v1", "model.test_project.orders.v2"}
+        db.close()
+    finally:
+        os.chdir(original_dir)
@@ -0,0 +1,296 @@
+"""Tests for extractors."""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from lattice_context.extractors.dbt_extractor import DbtExtractor
+from lattice_context.extractors.manifest_stream import iter_manifest_nodes
+
+
+@pytest.fixture
+def manifest_path():
+    """Create a manifest with models, non-model nodes and noisy sections."""
+    temp_dir = Path(tempfile.mkdtemp())
+    nodes = {}
+    for i, prefix in enumerate(["dim_", "dim_", "dim_", "fct_", "stg_"]):
+        name = f"{prefix}thing_{i}"
+        nodes[f"model.proj.{name}"] = {
+            "resource_type": "model",
+            "name": name,
+            "original_file_path": f"models/{name}.sql",
+            "description": f"Model {i} with \"quotes\", braces {{}} and brackets [] in it",
+            "columns": {
+                f"thing_{i}_id": {"description": "key", "data_type": "int"},
+                f"created_{i}_at": {"description": "", "data_type": "timestamp"},
+                "order_id": {"description": "fk", "data_type": "int"},
+            },
+        }
+    nodes["test.proj.unique_thing"] = {"resource_type": "test", "name": "unique_thing"}
+    manifest = {
+        "metadata": {"dbt_version": "1.7.0", "note": "tricky \\\" ]} string"},
+        "macros": {"macro.x": {"macro_sql": "{% if x %}[{{ y }}]{% endif %}"}},
+        "nodes": nodes,
+        "parent_map": {"model.proj.dim_thing_0": []},
+        "count": 12345,
+    }
+    path = temp_dir / "manifest.json"
+    path.write_text(json.dumps(manifest, indent=2))
+    yield path
+    shutil.rmtree(temp_dir)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_stream_matches_json_load(manifest_path, chunk_size):
+    """Test that streaming yields exactly the manifest's nodes."""
+    expected = json.loads(manifest_path.read_text())["nodes"]
+    streamed = dict(iter_manifest_nodes(manifest_path, chunk_size=chunk_size))
+    assert streamed == expected
+
+
+def test_streaming_scan_matches_in_memory(manifest_path):
+    """Test that a streaming scan extracts the same data as an in-memory one."""
+    in_memory = DbtExtractor(manifest_path)
+    in_memory.load_manifest()
+    streaming = DbtExtractor(manifest_path, streaming=True)
+    streaming.load_manifest()
+
+    expected = in_memory.scan()
+    result = streaming.scan()
+
+    assert result.node_hashes == expected.node_hashes
+    assert [e["id"] for e in result.entities] == [e["id"] for e in expected.entities]
+    assert [d.id for d in result.yaml_decisions] == [d.id for d in expected.yaml_decisions]
+    assert [c.pattern for c in result.conventions] == ["dim_", "_id", "_at"]
+
+
+def test_scan_only_extracts_changed_nodes(manifest_path):
+    """Test that unchanged nodes are skipped when previous hashes are given."""
+    extractor = DbtExtractor(manifest_path)
+    extractor.load_manifest()
+    first = extractor.scan()
+
+    previous = {node_id: node_hash for node_id, (_, node_hash) in first.node_hashes.items()}
+    previous.pop("model.proj.fct_thing_3")
+    second = extractor.scan(previous_hashes=previous)
+
+    assert second.changed_nodes == {"model.proj.fct_thing_3"}
+    assert {d.entity for d in second.yaml_decisions} == {"fct_thing_3"}
+    # Conventions still cover every model
+    assert len(second.conventions) == len(first.conventions)
+
+
+@pytest.fixture
+def git_repo():
+    """Create a git repository with a few decision-bearing commits."""
+    from git import Actor, Repo
+
+    temp_dir = Path(tempfile.mkdtemp())
+    repo = Repo.init(temp_dir)
+    author = Actor("Dev", "dev@example.com")
+    messages = [
+        "Initial commit with project skeleton",
+        "Added column discount_amount to orders for promotions",
+        "Create fct_revenue model for finance reporting",
+        "Tweak orders logic so that cancelled orders no longer count towards revenue totals",
+        "Renamed customer_key to customer_id across marts",
+        "Fixed dim_customer duplicate rows JIRA-42",
+    ]
+    for i, message in enumerate(messages):
+        model = temp_dir / "models" / f"model_{i}.sql"
+        model.parent.mkdir(exist_ok=True)
+        model.write_text(f"select {i}")
+        repo.index.add([str(model)])
+        repo.index.commit(message, author=author, committer=author)
+    repo.close()
+
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def test_parallel_git_extraction_matches_serial(git_repo):
+    """Test that parallel extraction returns the same decisions in the same order."""
+    from lattice_context.extractors.git_extractor import GitExtractor
+
+    serial = GitExtractor(git_repo, backend="gitpython").extract_decisions(branch="HEAD")
+    parallel = GitExtractor(git_repo, workers=3, backend="gitpython").extract_decisions(branch="HEAD")
+
+    assert serial
+    assert [d.model_dump() for d in parallel] == [d.model_dump() for d in serial]
+    assert {d.entity for d in serial} >= {"discount_amount", "fct_revenue", "model_3"}
+
+
+def test_parallel_log_backend_shards_commits(git_repo, monkeypatch):
+    """Test that workers split the default log backend across several git log reads."""
+    from lattice_context.extractors.git_extractor import GitExtractor
+
+    serial = GitExtractor(git_repo).extract_decisions(branch="HEAD")
+
+    reads = []
+    iter_log_records = GitExtractor.iter_log_records
+
+    def counting_iter_log_records(self, rev=None, shas=None):
+        reads.append(shas)
+        return iter_log_records(self, rev, shas)
+
+    monkeypatch.setattr(GitExtractor, "iter_log_records", counting_iter_log_records)
+    parallel = GitExtractor(git_repo, workers=3).extract_decisions(branch="HEAD")
+
+    assert [d.model_dump() for d in parallel] == [d.model_dump() for d in serial]
+    assert len(reads) > 1
+    assert all(shas for shas in reads)
+
+
+def test_log_backend_matches_gitpython(git_repo):
+    """Test that the `git log` reader produces the same decisions as GitPython."""
+    from lattice_context.extractors.git_extractor import GitExtractor
+
+    expected = GitExtractor(git_repo, backend="gitpython").extract_decisions(branch="HEAD")
+    extractor = GitExtractor(git_repo, backend="log")
+    decisions = extractor.extract_decisions(branch="HEAD")
+
+    assert [d.model_dump() for d in decisions] == [d.model_dump() for d in expected]
+
+    records = list(extractor.iter_log_records("HEAD"))
+    assert len(records) == 6
+    assert records[0].paths == ("models/model_5.sql",)
+    assert records[0].author_email == "dev@example.com"
+    assert records[-1].parents == ()
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Added column discount_amount to orders JIRA-12",
+        "fix: Prefix column names; refactor fct_orders (#31)",
+        "REMOVED FIELD legacy_flag, breaking for docs consumers",
+        "Update logic for dim_customer and add model fct_sessions",
+        "Tidy whitespace only",
+        "feature test of the teſt harness",
+        "FİX customer_orders totals here",
+        "BREAKING: rename fct_orders to fct_sales",
+    ],
+)
+def test_message_matcher_matches_every_pattern(message):
+    """Test that prefiltering finds the same patterns and tags as running all of them."""
+    import re
+
+    from lattice_context.extractors.git_extractor import GitExtractor, MessageMatcher
+
+    matcher = MessageMatcher(GitExtractor.PATTERNS, GitExtractor.PATTERN_KEYWORDS, GitExtractor.TAG_PATTERNS)
+    patterns, tags = matcher.scan(message)
+
+    expected_matches = [
+        (match.group(1), change_type)
+        for pattern, change_type, _ in GitExtractor.PATTERNS
+        for match in re.finditer(pattern, message, re.IGNORECASE)
+    ]
+    matches = [
+        (match.group(1), change_type)
+        for pattern, change_type, _ in patterns
+        for match in pattern.finditer(message)
+    ]
+    expected_tags = [
+        tag for pattern, _, tag in GitExtractor.TAG_PATTERNS
+        if re.search(pattern, message, re.IGNORECASE)
+    ]
+
+    assert matches == expected_matches
+    assert tags == expected_tags
+
+
+def test_git_extraction_reuses_cached_commits(git_repo, monkeypatch):
+    """Test that cached commits are not read from git again."""
+    from git import Actor, Repo
+
+    from lattice_context.extractors.git_extractor import GitExtractor
+    from lattice_context.storage.database import Database
+
+    db = Database(git_repo / "cache.db")
+    db.initialize()
+
+    extractor = GitExtractor(git_repo)
+    expected = extractor.extract_decisions(branch="HEAD")
+    assert [d.model_dump() for d in extractor.extract_decisions(branch="HEAD", cache=db)] == [
+        d.model_dump() for d in expected
+    ]
+
+    repo = Repo(git_repo)
+    author = Actor("Dev", "dev@example.com")
+    repo.index.commit("Added column margin_pct to fct_revenue", author=author, committer=author)
+    repo.close()
+
+    read = []
+    original = GitExtractor.iter_log_records
+
+    def recording(self, rev=None, shas=None):
+        read.append(shas)
+        return original(self, rev, shas)
+
+    monkeypatch.setattr(GitExtractor, "iter_log_records", recording)
+    decisions = extractor.extract_decisions(branch="HEAD", cache=db)
+
+    # Only the new commit was read
+    assert len(read) == 1 and len(read[0]) == 1
+    assert {d.entity for d in decisions} == {d.entity for d in expected} | {"margin_pct"}
+
+    # A different extractor version ignores the cache
+    monkeypatch.setattr(GitExtractor, "EXTRACTOR_VERSION", GitExtractor.EXTRACTOR_VERSION + 1)
+    read.clear()
+    extractor.extract_decisions(branch="HEAD", cache=db)
+    assert len(read[0]) == 7
+    db.close()
+
+
+def test_mine_affixes_discovers_conventions():
+    """Test that prefixes and suffixes are discovered, and the config thresholds apply."""
+    from lattice_context.core.config import ConventionConfig
+    from lattice_context.core.types import ConventionType, EntityType
+    from lattice_context.extractors.conventions import count_words, mine_affixes
+
+    columns = [
+        "is_active", "is_deleted", "order_id", "customer_id", "product_id", "store_id",
+        "amount_usd", "tax_usd", "total_usd", "created_at", "part_2", "_loaded", "id",
+    ]
+    suffixes = mine_affixes(columns, ConventionType.SUFFIX, EntityType.COLUMN)
+    assert [(c.pattern, c.frequency) for c in suffixes] == [("_id", 4), ("_usd", 3)]
+    assert suffixes[0].examples == ["order_id", "customer_id", "product_id", "store_id"]
+
+    models = ["mart_orders", "mart_customers", "base_orders", "orders"]
+    strict = ConventionConfig(min_frequency=2, min_confidence=0.8)
+    assert [c.pattern for c in mine_affixes(models, ConventionType.PREFIX, EntityType.MODEL, strict)] == ["mart_"]
+    loose = ConventionConfig(min_frequency=1, min_confidence=0.0)
+    assert [c.pattern for c in mine_affixes(models, ConventionType.PREFIX, EntityType.MODEL, loose)] == [
+        "mart_", "base_",
+    ]
+    assert mine_affixes(columns, ConventionType.SUFFIX, EntityType.COLUMN, ConventionConfig(min_confidence=0.95)) == []
+
+    # A prefix whose word mostly names an entity elsewhere is not a convention
+    models = ["customer_orders", "customer_payments", "customer_ltv", "dim_customer", "fct_customer_orders",
+              "stg_refunds", "stg_payments", "stg_orders"]
+    columns = ["customer_id", "customer_name", "order_id"]
+    loose = ConventionConfig(min_frequency=2, min_confidence=0.0)
+    assert [c.pattern for c in mine_affixes(models, ConventionType.PREFIX, EntityType.MODEL, loose)] == [
+        "customer_", "stg_",
+    ]
+    word_counts = count_words(models, columns)
+    assert [
+        c.pattern
+        for c in mine_affixes(models, ConventionType.PREFIX, EntityType.MODEL, loose, word_counts=word_counts)
+    ] == ["stg_"]
+
+
+def test_scan_honours_convention_config(manifest_path):
+    """Test that the extractor uses the convention thresholds it is given."""
+    from lattice_context.core.config import ConventionConfig
+
+    extractor = DbtExtractor(manifest_path, conventions=ConventionConfig(min_frequency=1))
+    extractor.load_manifest()
+    assert [c.pattern for c in extractor.scan().conventions] == ["dim_", "fct_", "stg_", "_id", "_at"]
+
+    disabled = DbtExtractor(manifest_path, conventions=ConventionConfig(enabled=False))
+    disabled.load_manifest()
+    assert disabled.scan().conventions == []